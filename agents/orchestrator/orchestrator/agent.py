@@ -11,18 +11,23 @@ from langgraph.store.postgres.aio import AsyncPostgresStore
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_openai import ChatOpenAI
 
-from nodes.classify_topic import classify_topic
-from nodes.select_agent import select_agent
+from nodes.classify_topic import classify_topic, route_topic
+from nodes.pre_router import PreRouter
+from nodes.route_memo import RouteMemo
+from nodes.select_agent import remember_route, select_agent, touch_routed_agent
 from nodes.generate_user_prompt import generate_user_prompt
-from nodes.tool_node import get_tools_function
+from nodes.tool_node import get_catalog_mirror, get_session_pool, get_tools_function
 from state import AgentState
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 # OpenTelemetry imports
-from opentelemetry import trace
+from opentelemetry import metrics, trace
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.openai import OpenAIInstrumentor
 from openinference.instrumentation.langchain import LangChainInstrumentor
@@ -93,8 +98,11 @@ async def create_graph(pool):
         provider.add_span_processor(BatchSpanProcessor(exporter))
         trace.set_tracer_provider(provider)
 
+        metric_reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=endpoint, insecure=True))
+        metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[metric_reader]))
 
-        logger.info("TracerProvider initialized and OTLP exporter attached.")
+
+        logger.info("TracerProvider and MeterProvider initialized and OTLP exporters attached.")
 
         # Instrumenting libraries
         logger.info("Instrumenting OpenAI and LangChain...")
@@ -115,6 +123,13 @@ async def create_graph(pool):
         tools = await get_tools_function()
         execute_tools = ToolNode(tools)
         logger.info(f"Loaded {len(tools)} tools for ToolNode")
+        catalog = await get_catalog_mirror()
+        router = PreRouter(
+            match_threshold=float(os.getenv("ROUTER_MATCH_THRESHOLD", "0.6")),
+            min_margin=float(os.getenv("ROUTER_MIN_MARGIN", "0.15")),
+            top_k=int(os.getenv("ROUTER_TOP_K", "5")),
+        )
+        memo = RouteMemo(store, max_entries=int(os.getenv("ROUTE_MEMO_SIZE", "1024")))
 
         async def classify_topic_node(state: AgentState):
             logger.info("Node: classify_topic - Processing")
@@ -126,14 +141,23 @@ async def create_graph(pool):
 
         async def select_agent_node(state: AgentState):
             logger.info("Node: select_agent - Processing")
-            return await select_agent(state, model)
+            return await select_agent(state, model, catalog, router, memo)
+
+        async def remember_route_node(state: AgentState):
+            logger.info("Node: remember_route - Processing")
+            return await remember_route(state, memo)
+
+        async def touch_agent_node(state: AgentState):
+            logger.info("Node: touch_agent - Processing")
+            return await touch_routed_agent(state, get_session_pool())
 
         graph_builder = StateGraph(AgentState)
 
         logger.debug("Adding nodes to the graph...")
         graph_builder.add_node("classify_topic", classify_topic_node)
-        graph_builder.add_node("execute_list_tool", execute_tools)
         graph_builder.add_node("execute_tools", execute_tools)
+        graph_builder.add_node("remember_route", remember_route_node)
+        graph_builder.add_node("touch_agent", touch_agent_node)
         graph_builder.add_node("select_agent", select_agent_node)
         graph_builder.add_node("generate_user_prompt", generate_prompt_node)
 
@@ -141,15 +165,13 @@ async def create_graph(pool):
 
         graph_builder.add_conditional_edges(
             "classify_topic",
-            tools_condition,
+            route_topic,
             {
-                "tools": "execute_list_tool",
-                "__end__": "generate_user_prompt"
+                "select_agent": "select_agent",
+                "generate_user_prompt": "generate_user_prompt"
             }
         )
 
-        graph_builder.add_edge("execute_list_tool", "select_agent")
-
         graph_builder.add_conditional_edges(
             "select_agent",
             tools_condition,
@@ -158,6 +180,9 @@ async def create_graph(pool):
                 "__end__": END
             }
         )
+        graph_builder.add_edge("execute_tools", "remember_route")
+        graph_builder.add_edge("remember_route", "touch_agent")
+        graph_builder.add_edge("touch_agent", END)
 
         compiled_graph = graph_builder.compile(checkpointer=checkpointer, store=store)
         logger.info("Graph compiled successfully.")
@@ -8,6 +8,7 @@ from kagent.core import KAgentConfig
 from kagent.langgraph import KAgentApp
 from agent import create_graph
 from agent import get_db_resources
+from nodes.tool_node import close_tools
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -42,7 +43,10 @@ async def main():
         logger.info(f"Starting server on {host}:{port}")
 
 
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            await close_tools()
 
 if __name__ == "__main__":
     try:
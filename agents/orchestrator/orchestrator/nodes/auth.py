@@ -1,43 +1,150 @@
+import asyncio
+import logging
 import os
 import time
 import httpx
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
+
+from opentelemetry import metrics
+
+
+logger = logging.getLogger("Orchestrator.Auth")
+
+meter = metrics.get_meter("orchestrator.auth")
+refresh_duration = meter.create_histogram(
+    "orchestrator.auth.token_refresh.duration",
+    unit="s",
+    description="Latency of token endpoint requests, by grant type and outcome.",
+)
+
+# Seconds subtracted from the token lifetime so a token is never sent just as it expires
+EXPIRY_SKEW = 10.0
+# Delay before retrying a failed background refresh while the current token is still valid
+RETRY_DELAY = 5.0
 
 
 class Auth(httpx.Auth):
-    def __init__(self):
+    """
+    Async bearer-token auth for the MCP client.
+
+    Tokens are fetched with one shared AsyncClient and refreshed in the background once
+    refresh_ratio of their lifetime has passed, so requests normally find a valid token.
+    Concurrent refreshes share a single token request, and the refresh token Keycloak
+    returns is used before falling back to the password grant.
+    """
+
+    def __init__(self, refresh_ratio: float = 0.8):
         self.token_endpoint = os.getenv("TOKEN_ENDPOINT", None)
         self.client_id = os.getenv("CLIENT_ID", None)
         self.username = os.getenv("AGENT_USERNAME", None)
         self.password = os.getenv("AGENT_PASSWORD", None)
+        self.refresh_ratio = refresh_ratio
 
         self.access_token = None
         self.token_expires_at = 0
+        self.refresh_token = None
+        self.refresh_expires_at = 0
 
-    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
-        if not all([self.client_id, self.username, self.password, self.token_endpoint]):
-            raise ValueError(f"Missing environment variables: CLIENT_ID, AGENT_USERNAME, AGENT_PASSWORD, or TOKEN_ENDPOINT. Values: {self.client_id, self.username, self.password, self.token_endpoint}")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        # The one pending background refresh; replaced whenever a new token arrives
+        self._refresh_task: Optional[asyncio.Task] = None
 
-        if not self.access_token or time.time() >= self.token_expires_at:
-            self.access_token = self.get_token()
+    def sync_auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        raise RuntimeError("Auth only supports async clients; use httpx.AsyncClient.")
 
-        request.headers['Authorization'] = self.access_token
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        request.headers['Authorization'] = await self.get_token()
         request.headers['user-agent'] = "Agent-auth"
 
         yield request
 
-    def get_token(self) -> str:
-        payload = {
-            "client_id": self.client_id,
-            "username": self.username,
-            "password": self.password,
-            "grant_type": "password",
-        }
-        with httpx.Client() as client:
-            response = client.post(self.token_endpoint, data=payload)
+    async def get_token(self) -> str:
+        if self.access_token and time.time() < self.token_expires_at:
+            return self.access_token
+        return await self.refresh()
+
+    async def refresh(self) -> str:
+        """Fetches a new token, joining the refresh already in flight if there is one."""
+        if not all([self.client_id, self.username, self.password, self.token_endpoint]):
+            raise ValueError(f"Missing environment variables: CLIENT_ID, AGENT_USERNAME, AGENT_PASSWORD, or TOKEN_ENDPOINT. Values: {self.client_id, self.username, self.password, self.token_endpoint}")
+
+        if self._refreshing is None:
+            self._refreshing = asyncio.create_task(self._refresh())
+            self._refreshing.add_done_callback(self._refresh_done)
+        # Shielded so a cancelled caller does not cancel the refresh the others are waiting on
+        return await asyncio.shield(self._refreshing)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshing = None
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh(self) -> str:
+        if self.refresh_token and time.time() < self.refresh_expires_at:
+            try:
+                data = await self._request("refresh_token", {"refresh_token": self.refresh_token})
+            except httpx.HTTPStatusError as e:
+                # The refresh token was revoked or its session ended; log in again
+                logger.warning(f"Refresh token rejected ({e.response.status_code}), using the password grant")
+                self.refresh_token = None
+                data = await self._request("password", {"username": self.username, "password": self.password})
+        else:
+            data = await self._request("password", {"username": self.username, "password": self.password})
+
+        now = time.time()
+        lifetime = float(data.get("expires_in", 3600))
+        self.access_token = f"Bearer {data['access_token']}"
+        self.token_expires_at = now + lifetime - EXPIRY_SKEW
+        self.refresh_token = data.get("refresh_token")
+        # Keycloak reports 0 for refresh tokens that do not expire on their own (offline tokens)
+        refresh_lifetime = float(data.get("refresh_expires_in") or 0)
+        self.refresh_expires_at = now + refresh_lifetime - EXPIRY_SKEW if refresh_lifetime else float("inf")
+
+        self._schedule(lifetime * self.refresh_ratio)
+        return self.access_token
+
+    async def _request(self, grant_type: str, fields: dict) -> dict:
+        payload = {"client_id": self.client_id, "grant_type": grant_type, **fields}
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._http().post(self.token_endpoint, data=payload)
             response.raise_for_status()
+            outcome = "success"
+            return response.json()
+        finally:
+            refresh_duration.record(time.perf_counter() - start, {"grant_type": grant_type, "outcome": outcome})
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        return self._client
+
+    def _schedule(self, delay: float) -> None:
+        """Replaces the pending background refresh with one after delay seconds."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        self._refresh_task = asyncio.create_task(self._refresh_later(delay))
 
-            data = response.json()
-            self.token_expires_at = time.time() + float(data.get("expires_in", 3600)) - 10
-            return f"Bearer {data['access_token']}"
+    async def _refresh_later(self, delay: float) -> None:
+        # Retries stay in this task; a successful refresh schedules the next one through _schedule
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+                return
+            except Exception as e:
+                logger.warning(f"Background token refresh failed: {e}")
+            if time.time() + RETRY_DELAY >= self.token_expires_at:
+                return
+            delay = RETRY_DELAY
 
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
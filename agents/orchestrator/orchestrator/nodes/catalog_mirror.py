@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from opentelemetry import metrics
+
+from .session_pool import MCPSessionPool
+
+
+logger = logging.getLogger("Orchestrator.CatalogMirror")
+
+meter = metrics.get_meter("orchestrator.catalog")
+catalog_refreshes = meter.create_counter(
+    "orchestrator.catalog.refreshes",
+    description="Agent listings fetched into the catalog mirror, by reason and outcome.",
+)
+truncated_agents = meter.create_counter(
+    "orchestrator.catalog.truncated_agents",
+    description="Agents missing from the catalog mirror because a listing page was truncated.",
+)
+
+LIST_ARGS = {"fields": ["name", "description", "labels"], "compact": True}
+PAGE_SIZE = 200
+
+
+def _text(result) -> str:
+    return "".join(getattr(block, "text", "") for block in result.content)
+
+
+class CatalogMirror:
+    """
+    A local copy of the control plane's agent list for routing.
+
+    A background task polls get_catalog_status every poll_interval seconds and lists the
+    agents again when the catalog's resourceVersion changes, or at the latest after ttl
+    seconds. select_agent reads the copy instead of calling list_available_agents each turn.
+
+    Agents are listed page_size at a time until the control plane returns no continue token,
+    so no page is cut off by the tool's response size limit. Without a namespace the control
+    plane's default namespace is listed; its version is only known when the control plane
+    manages a single namespace, otherwise the copy is renewed when the TTL expires.
+    """
+
+    def __init__(
+        self,
+        pool: MCPSessionPool,
+        ttl: float = 60.0,
+        poll_interval: float = 5.0,
+        namespace: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+    ):
+        self.pool = pool
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.namespace = namespace
+        self.page_size = page_size
+
+        self.agents: Optional[list[dict]] = None
+        self.revision = 0
+        self.resource_version: Optional[str] = None
+        self.fetched_at = 0.0
+
+        self._refreshing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        try:
+            await self.refresh("startup")
+        except Exception as e:
+            logger.warning(f"Initial agent listing failed, retrying in the background: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def get_agents(self) -> list[dict]:
+        """Returns the agent list, listing the agents first if there is no usable copy."""
+        # The background task renews the copy; only wait for a listing when it has fallen well behind
+        if self.agents is None or time.time() - self.fetched_at >= 2 * self.ttl:
+            await self.refresh("missing")
+        return self.agents
+
+    async def refresh(self, reason: str = "manual") -> None:
+        """Lists the agents again, joining the listing already in flight if there is one."""
+        if self._refreshing is None:
+            self._refreshing = asyncio.create_task(self._refresh(reason))
+            self._refreshing.add_done_callback(self._refresh_done)
+        await asyncio.shield(self._refreshing)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshing = None
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh(self, reason: str) -> None:
+        outcome = "error"
+        try:
+            # Read the version first so a change made during the listing is picked up next poll
+            version = await self._resource_version()
+            agents = await self._list_agents()
+
+            self.agents = agents
+            self.revision += 1
+            self.resource_version = version
+            self.fetched_at = time.time()
+            outcome = "success"
+            logger.info(f"Agent catalog mirror refreshed ({reason}): {len(self.agents)} agents")
+        finally:
+            catalog_refreshes.add(1, {"reason": reason, "outcome": outcome})
+
+    async def _list_agents(self) -> list[dict]:
+        agents: list[dict] = []
+        continue_token = None
+        while True:
+            args = {**LIST_ARGS, "limit": self.page_size}
+            if continue_token:
+                args["continue_token"] = continue_token
+            output = _text(await self.pool.call_tool("list_available_agents", self._args(args)))
+            try:
+                page = json.loads(output)
+            except json.JSONDecodeError:
+                raise RuntimeError(f"list_available_agents failed: {output}")
+
+            agents.extend(page["items"])
+            if page.get("truncated"):
+                # Pages are shrunk to fit the size limit, so this only happens with older control planes
+                logger.warning(f"Agent listing page truncated, {page['omitted']} agents are missing")
+                truncated_agents.add(page["omitted"])
+            continue_token = page.get("continue")
+            if not continue_token:
+                return agents
+
+    async def _resource_version(self) -> Optional[str]:
+        output = _text(await self.pool.call_tool("get_catalog_status", self._args({})))
+        try:
+            status = json.loads(output)
+        except json.JSONDecodeError:
+            return None
+        if self.namespace is None:
+            # The status is keyed by namespace; only one of them can be the listed default
+            if len(status) != 1:
+                return None
+            status = next(iter(status.values()))
+        return status.get("resource_version")
+
+    def _args(self, args: dict) -> dict:
+        if self.namespace is None:
+            return args
+        return {**args, "namespace": self.namespace}
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if self.agents is None or time.time() - self.fetched_at >= self.ttl:
+                    await self.refresh("expired")
+                else:
+                    # Without a version the copy is only renewed when the TTL expires
+                    version = await self._resource_version()
+                    if version is not None and version != self.resource_version:
+                        await self.refresh("changed")
+            except Exception as e:
+                logger.warning(f"Agent catalog mirror refresh failed: {e}")
@@ -1,8 +1,7 @@
-import uuid
 from typing import Optional, Literal
 import langdetect
 from pydantic import BaseModel, Field
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 import fuzzywuzzy.fuzz as fuzz
 
 
@@ -80,22 +79,16 @@ async def classify_topic(state: dict, model):
     eval_message = AIMessage(content=f"Eval: {response.content}")
     messages_out = [eval_message]
 
-    if response.topic_found:
-        tool_call_id = f"call_{uuid.uuid4().hex[:12]}"
-        tool_call_message = AIMessage(
-            content="",
-            tool_calls=[{
-                "name": "list_available_agents",
-                "args": {},
-                "id": tool_call_id,
-                "type": "tool_call",
-            }],
-        )
-        messages_out.append(tool_call_message)
-
     return {
         "messages": messages_out,
         "topic_eval": response,
         "stimulus_count": 0 if response.topic_found else state.get("stimulus_count", 0) + 1,
         "user_lang": user_lang
-    }
\ No newline at end of file
+    }
+
+
+def route_topic(state: dict) -> str:
+    topic_eval = state.get("topic_eval")
+    if topic_eval and topic_eval.topic_found:
+        return "select_agent"
+    return "generate_user_prompt"
@@ -0,0 +1,129 @@
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from opentelemetry import metrics
+
+
+meter = metrics.get_meter("orchestrator.routing")
+route_decisions = meter.create_counter(
+    "orchestrator.routing.decisions",
+    description="select_agent decisions, by source: memo or pre_router (LLM skipped), or llm.",
+)
+
+# Agents that must never be chosen as the target of an update
+PROTECTED_AGENTS = {"orchestrator-agent"}
+
+NGRAM_SIZES = (3, 4, 5)
+HASH_BITS = 18
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def agent_skills(agent: dict) -> list[str]:
+    """The agent's skills as the control plane stored them: the values of its skill-* labels."""
+    labels = agent.get("labels") or {}
+    return [value for key, value in labels.items() if key.startswith("skill-")]
+
+
+def _grams(text: str) -> np.ndarray:
+    """Hashed character n-grams of each word, padded with spaces so word edges count."""
+    hashes = []
+    for word in _NON_WORD.sub(" ", text.lower()).split():
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(max(1, len(padded) - n + 1)):
+                hashes.append(zlib.crc32(padded[i:i + n].encode()))
+    return np.asarray(hashes, dtype=np.int64) & ((1 << HASH_BITS) - 1)
+
+
+def _weights(grams: np.ndarray, idf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unique gram ids with L2-normalized sublinear TF-IDF weights."""
+    ids, counts = np.unique(grams, return_counts=True)
+    weights = (1.0 + np.log(counts)) * idf[ids]
+    norm = np.linalg.norm(weights)
+    return ids, weights / norm if norm else weights
+
+
+@dataclass
+class Route:
+    agent: Optional[dict]
+    candidates: list[dict] = field(default_factory=list)
+    scores: list[float] = field(default_factory=list)
+
+
+class PreRouter:
+    """
+    Cosine similarity between a topic and each agent's name, skills and description.
+
+    Texts are vectorized as TF-IDF over hashed character n-grams, so inflections and small
+    spelling differences still match. Agent vectors are kept sparse and rebuilt only when
+    the catalog mirror's revision changes. A topic whose best agent scores at least
+    match_threshold, and leads the runner-up by min_margin, is routed to that agent without
+    asking the LLM; otherwise the LLM gets the top_k agents as candidates.
+    """
+
+    def __init__(self, match_threshold: float = 0.6, min_margin: float = 0.15, top_k: int = 5):
+        self.match_threshold = match_threshold
+        self.min_margin = min_margin
+        self.top_k = top_k
+
+        self._revision = None
+        self._agents: list[dict] = []
+        self._idf = np.ones(1 << HASH_BITS)
+        self._doc_ids = np.empty(0, dtype=np.int64)
+        self._gram_ids = np.empty(0, dtype=np.int64)
+        self._gram_weights = np.empty(0)
+
+    def index(self, agents: list[dict], revision=None) -> None:
+        if revision is not None and revision == self._revision:
+            return
+        agents = [agent for agent in agents if agent.get("name") not in PROTECTED_AGENTS]
+        docs = [self._document(agent) for agent in agents]
+
+        df = np.zeros(1 << HASH_BITS)
+        for grams in docs:
+            df[np.unique(grams)] += 1
+        self._idf = np.log((1.0 + len(docs)) / (1.0 + df)) + 1.0
+
+        vectors = [_weights(grams, self._idf) for grams in docs]
+        self._agents = agents
+        self._doc_ids = np.repeat(np.arange(len(docs)), [len(ids) for ids, _ in vectors])
+        self._gram_ids = np.concatenate([ids for ids, _ in vectors]) if vectors else np.empty(0, dtype=np.int64)
+        self._gram_weights = np.concatenate([w for _, w in vectors]) if vectors else np.empty(0)
+        self._revision = revision
+
+    def scores(self, topic: str) -> np.ndarray:
+        """Cosine similarity of the topic to every indexed agent."""
+        ids, weights = _weights(_grams(topic), self._idf)
+        if not len(ids):
+            return np.zeros(len(self._agents))
+        # Look up each agent gram in the topic's sorted gram ids
+        pos = np.minimum(np.searchsorted(ids, self._gram_ids), len(ids) - 1)
+        shared = np.where(ids[pos] == self._gram_ids, weights[pos], 0.0)
+        return np.bincount(self._doc_ids, weights=shared * self._gram_weights, minlength=len(self._agents))
+
+    def route(self, topic: str, agents: list[dict], revision=None) -> Route:
+        self.index(agents, revision)
+        if not self._agents:
+            return Route(agent=None)
+
+        scores = self.scores(topic)
+        order = np.argsort(-scores, kind="stable")[:max(self.top_k, 2)]
+        best = scores[order[0]]
+        runner_up = scores[order[1]] if len(order) > 1 else 0.0
+
+        top = order[:self.top_k]
+        candidates = [self._agents[i] for i in top]
+        top_scores = [round(float(scores[i]), 4) for i in top]
+        if best >= self.match_threshold and best - runner_up >= self.min_margin:
+            return Route(agent=self._agents[order[0]], candidates=candidates, scores=top_scores)
+        return Route(agent=None, candidates=candidates, scores=top_scores)
+
+    @staticmethod
+    def _document(agent: dict) -> np.ndarray:
+        # The name and skills describe an agent's domain most directly, so they count twice
+        name = agent.get("name") or ""
+        skills = " ".join(agent_skills(agent))
+        return _grams(f"{name} {skills} {name} {skills} {agent.get('description') or ''}")
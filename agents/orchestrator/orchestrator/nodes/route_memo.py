@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from langchain_core.messages import ToolMessage
+from langgraph.store.base import BaseStore
+from opentelemetry import metrics
+
+
+logger = logging.getLogger("Orchestrator.RouteMemo")
+
+meter = metrics.get_meter("orchestrator.routing")
+memo_lookups = meter.create_counter(
+    "orchestrator.routing.memo.lookups",
+    description="Routing memo lookups, by result: lru, store, stale or miss.",
+)
+
+# Bumped when stored decisions can no longer be trusted, such as after a routing fix
+NAMESPACE = ("routing_memo", "v2")
+# The control plane's tools report failures as ordinary results starting with one of these
+TOOL_ERROR_PREFIXES = (
+    "Error",
+    "K8s API Error",
+    "General error",
+    "Deployment failed",
+    "Unexpected error",
+    "Resource already exists",
+)
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_topic(topic: str) -> str:
+    text = unicodedata.normalize("NFKC", topic).casefold()
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def tool_succeeded(message: ToolMessage) -> bool:
+    return message.status != "error" and not message.text.lstrip().startswith(TOOL_ERROR_PREFIXES)
+
+
+def catalog_fingerprint(agents: list[dict]) -> str:
+    """Hash of the agent names, descriptions and labels that routing decisions are based on."""
+    canonical = json.dumps(sorted(agents, key=lambda agent: agent.get("name") or ""), sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+class RouteMemo:
+    """
+    Remembers the routing decision made for a topic in a language.
+
+    Decisions are kept in the graph's store, so every orchestrator replica shares them, behind
+    an in-process LRU of max_entries. Each entry records the fingerprint of the agent catalog
+    it was decided against; once the catalog's agents, descriptions or skills change, older
+    entries are treated as missing and the topic is routed again. Decisions are only put once
+    the tool call carrying them succeeded, with the fingerprint sync returned when they were
+    made.
+    """
+
+    def __init__(self, store: BaseStore, max_entries: int = 1024):
+        self.store = store
+        self.max_entries = max_entries
+        self.fingerprint: Optional[str] = None
+
+        self._revision = None
+        self._lru: OrderedDict[str, dict] = OrderedDict()
+
+    def sync(self, agents: list[dict], revision=None) -> str:
+        """
+        Follows the catalog mirror, dropping the LRU when the catalog content changed.
+
+        Returns the catalog fingerprint, to be passed to put with decisions made on these agents.
+        """
+        if revision is not None and revision == self._revision:
+            return self.fingerprint
+        fingerprint = catalog_fingerprint(agents)
+        if fingerprint != self.fingerprint:
+            self._lru.clear()
+            self.fingerprint = fingerprint
+        self._revision = revision
+        return fingerprint
+
+    async def get(self, topic: str, language: str) -> Optional[dict]:
+        key = self._key(topic, language)
+        decision = self._lru.get(key)
+        if decision is not None:
+            self._lru.move_to_end(key)
+            memo_lookups.add(1, {"result": "lru"})
+            return decision
+
+        try:
+            item = await self.store.aget(NAMESPACE, key)
+        except Exception as e:
+            logger.warning(f"Routing memo lookup failed: {e}")
+            item = None
+        if item is None:
+            memo_lookups.add(1, {"result": "miss"})
+            return None
+        if item.value.get("catalog") != self.fingerprint:
+            memo_lookups.add(1, {"result": "stale"})
+            return None
+
+        decision = item.value["decision"]
+        self._remember(key, decision)
+        memo_lookups.add(1, {"result": "store"})
+        return decision
+
+    async def put(self, topic: str, language: str, decision: dict, fingerprint: str) -> None:
+        key = self._key(topic, language)
+        # Only the LRU of the current catalog may hold it; the store entry is checked on read
+        if fingerprint == self.fingerprint:
+            self._remember(key, decision)
+        try:
+            await self.store.aput(NAMESPACE, key, {"decision": decision, "catalog": fingerprint})
+        except Exception as e:
+            logger.warning(f"Routing memo write failed: {e}")
+
+    def _remember(self, key: str, decision: dict) -> None:
+        self._lru[key] = decision
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _key(topic: str, language: str) -> str:
+        return f"{language}:{normalize_topic(topic)}"
@@ -1,11 +1,15 @@
+import json
 import logging
 import uuid
 from typing import Literal
 
 from pydantic import BaseModel, Field
-from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.messages import SystemMessage, AIMessage, ToolMessage
 from langgraph.types import Command
 
+from .pre_router import agent_skills, route_decisions
+from .route_memo import TOOL_ERROR_PREFIXES, tool_succeeded
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,6 +18,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Orchestrator.SelectAgent")
 
+TOUCH_TOOL = "touch_agent"
+
 
 class AgentEval(BaseModel):
     there_is_agent: bool = Field(
@@ -37,12 +43,101 @@ class AgentEval(BaseModel):
         description="Decision: 'deploy_new_agent' is preferred for new specific domains."
     )
 
-async def select_agent(state, model):
+def _action_message(decision: dict) -> AIMessage:
+    tool_call_id = f"call_{uuid.uuid4().hex[:12]}"
+
+    tool_call_message = AIMessage(
+        content="",
+        tool_calls=[{
+            "name": decision["action_type"],
+            "args": {
+                "name": decision["name"],
+                "description": decision["description"],
+                "skills": decision["skills"]
+            },
+            "id": tool_call_id,
+            "type": "tool_call",
+        }],
+    )
+
+    logger.info(f"Tool call generated: {decision['action_type']} with ID {tool_call_id}")
+    return tool_call_message
+
+
+def _decided(decision: dict, topic: str, language: str, fingerprint: str) -> dict:
+    # remember_route memoizes the decision once the tool call carrying it has succeeded
+    message = _action_message(decision)
+    return {
+        "messages": [message],
+        "pending_route": {
+            "tool_call_id": message.tool_calls[0]["id"],
+            "topic": topic,
+            "language": language,
+            "decision": decision,
+            "fingerprint": fingerprint,
+        },
+    }
+
+
+async def remember_route(state, memo):
+    pending = state.get("pending_route")
+    if not pending:
+        return {"pending_route": None}
+
+    result = _tool_result(state["messages"], pending["tool_call_id"])
+    if result is not None and tool_succeeded(result):
+        await memo.put(pending["topic"], pending["language"], pending["decision"], pending["fingerprint"])
+    else:
+        logger.info(f"Not memoizing the route for '{pending['topic']}': {pending['decision']['action_type']} failed")
+    return {"pending_route": None}
+
+
+def _tool_result(messages: list, tool_call_id: str) -> ToolMessage | None:
+    return next(
+        (
+            message for message in reversed(messages)
+            if isinstance(message, ToolMessage) and message.tool_call_id == tool_call_id
+        ),
+        None,
+    )
+
+
+async def touch_routed_agent(state, pool):
+    # The control plane scales agents nobody used for a while to zero. Being routed to
+    # counts as a use, and starts the agent again if it had been scaled down.
+    call = next(
+        (
+            message for message in reversed(state["messages"])
+            if isinstance(message, AIMessage) and message.tool_calls
+        ),
+        None,
+    )
+    if call is None:
+        return {}
+    tool_call = call.tool_calls[0]
+    result = _tool_result(state["messages"], tool_call["id"])
+    if result is None or not tool_succeeded(result):
+        return {}
+
+    name = tool_call["args"]["name"]
+    try:
+        response = await pool.call_tool(TOUCH_TOOL, {"name": name})
+    except Exception as e:
+        logger.warning(f"Could not mark agent '{name}' as used: {e}")
+        return {}
+    output = "".join(getattr(block, "text", "") for block in response.content)
+    if response.isError or output.lstrip().startswith(TOOL_ERROR_PREFIXES):
+        logger.warning(f"Could not mark agent '{name}' as used: {output}")
+    elif json.loads(output).get("woke"):
+        logger.info(f"Agent '{name}' was scaled to zero and is starting again")
+    return {}
+
+
+async def select_agent(state, model, catalog, router, memo):
     logger.info("Starting select_agent nodes execution.")
 
-    available_agents_output = state["messages"][-1].content
     topic_info = state.get("topic_eval", None)
-    user_lang = state.get("language", "en")
+    user_lang = state.get("user_lang", "en")
 
 
     if not topic_info or not topic_info.topic_found:
@@ -51,6 +146,34 @@ async def select_agent(state, model):
 
     logger.info(f"Analyzing topic: '{topic_info.topic_name}' (Language: {user_lang})")
 
+    agents = await catalog.get_agents()
+    fingerprint = memo.sync(agents, catalog.revision)
+    decision = await memo.get(topic_info.topic_name, user_lang)
+    if decision is not None:
+        logger.info(f"Routing memo hit for '{topic_info.topic_name}': {decision['action_type']} {decision['name']}")
+        route_decisions.add(1, {"source": "memo"})
+        return {
+            "messages": [_action_message(decision)],
+            "pending_route": None,
+        }
+
+    route = router.route(topic_info.topic_name, agents, catalog.revision)
+    if route.agent is not None:
+        # A clear match: keep the existing agent as it is and skip the LLM
+        logger.info(f"Pre-router matched '{route.agent['name']}' (scores: {route.scores})")
+        route_decisions.add(1, {"source": "pre_router"})
+        decision = {
+            "action_type": "update_agent_config",
+            "name": route.agent["name"],
+            "description": route.agent.get("description", ""),
+            "skills": agent_skills(route.agent),
+        }
+        return _decided(decision, topic_info.topic_name, user_lang, fingerprint)
+
+    logger.info(f"Pre-router found no clear match (scores: {route.scores}), asking the LLM")
+    route_decisions.add(1, {"source": "llm"})
+    available_agents_output = json.dumps(route.candidates, separators=(",", ":"))
+
     system_prompt = f"""
     ### ROLE
     You are a High-Precision System Architect Orchestrator. Your goal is to maintain an efficient agent fleet by avoiding redundancy.
@@ -101,24 +224,10 @@ async def select_agent(state, model):
         logger.error(f"Error during LLM invocation: {str(e)}", exc_info=True)
         raise
 
-    tool_call_id = f"call_{uuid.uuid4().hex[:12]}"
-
-    tool_call_message = AIMessage(
-        content="",
-        tool_calls=[{
-            "name": analysis.action_type,
-            "args": {
-                "name": analysis.agent_name,
-                "description": analysis.agent_description,
-                "skills": analysis.agent_skills
-            },
-            "id": tool_call_id,
-            "type": "tool_call",
-        }],
-    )
-
-    logger.info(f"Tool call generated: {analysis.action_type} with ID {tool_call_id}")
-
-    return {
-        "messages": [tool_call_message],
-    }
\ No newline at end of file
+    decision = {
+        "action_type": analysis.action_type,
+        "name": analysis.agent_name,
+        "description": analysis.agent_description,
+        "skills": analysis.agent_skills,
+    }
+    return _decided(decision, topic_info.topic_name, user_lang, fingerprint)
\ No newline at end of file
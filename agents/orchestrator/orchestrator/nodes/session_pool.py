@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import anyio
+import httpx
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+from opentelemetry import metrics
+
+
+logger = logging.getLogger("Orchestrator.SessionPool")
+
+meter = metrics.get_meter("orchestrator.mcp")
+open_sessions = meter.create_up_down_counter(
+    "orchestrator.mcp.pool.sessions",
+    description="Initialized MCP sessions in the pool.",
+)
+in_flight_calls = meter.create_up_down_counter(
+    "orchestrator.mcp.pool.in_flight",
+    description="MCP requests currently running on pooled sessions.",
+)
+session_rebuilds = meter.create_counter(
+    "orchestrator.mcp.pool.rebuilds",
+    description="Pooled MCP sessions that failed and were opened again.",
+)
+acquire_duration = meter.create_histogram(
+    "orchestrator.mcp.pool.acquire.duration",
+    unit="s",
+    description="Time spent waiting for a healthy pooled session.",
+)
+call_duration = meter.create_histogram(
+    "orchestrator.mcp.tool_call.duration",
+    unit="s",
+    description="Latency of MCP tool calls, by tool and outcome.",
+)
+
+PING_TIMEOUT = 10.0
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+# How long a failed session keeps serving the calls already running on it before it is closed
+DRAIN_TIMEOUT = 30.0
+
+# Failures of the connection under a session. Other errors, such as an McpError returned by
+# the server or a validation error, leave the session usable.
+TRANSPORT_ERRORS = (
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    if isinstance(error, BaseExceptionGroup):
+        # anyio task groups wrap the errors of the streams they run
+        return error.subgroup(TRANSPORT_ERRORS) is not None
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+class _Slot:
+    def __init__(self):
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.broken = asyncio.Event()
+
+    @property
+    def healthy(self) -> bool:
+        return self.session is not None and not self.broken.is_set()
+
+
+class MCPSessionPool:
+    """
+    A fixed number of initialized MCP sessions to one server, shared by all tool calls.
+
+    Each session is opened once by its own task, which pings it every ping_interval seconds
+    and opens it again if a ping fails or a call on it hits a transport error. Calls go to the healthy session with
+    the fewest requests in flight. The pool has the list_tools/call_tool interface of
+    ClientSession, so it can be passed to load_mcp_tools in place of a single session.
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        size: int = 2,
+        ping_interval: float = 30.0,
+        acquire_timeout: float = 30.0,
+    ):
+        self.client = client
+        self.server_name = server_name
+        self.size = max(1, size)
+        self.ping_interval = ping_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._slots = [_Slot() for _ in range(self.size)]
+        self._tasks: list[asyncio.Task] = []
+        self._changed = asyncio.Event()
+
+    async def start(self) -> None:
+        """Opens the sessions and waits until at least one of them is ready."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run(slot)) for slot in self._slots]
+        await asyncio.wait_for(self._ready_slot(), self.acquire_timeout)
+        logger.info(f"MCP session pool for '{self.server_name}' started with {self.size} sessions")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClientSession]:
+        start = time.perf_counter()
+        slot = await asyncio.wait_for(self._ready_slot(), self.acquire_timeout)
+        acquire_duration.record(time.perf_counter() - start)
+
+        slot.in_flight += 1
+        in_flight_calls.add(1)
+        try:
+            yield slot.session
+        except Exception as e:
+            if is_transport_error(e):
+                # The session lost its connection; have it opened again
+                slot.broken.set()
+            raise
+        finally:
+            slot.in_flight -= 1
+            in_flight_calls.add(-1)
+
+    async def list_tools(self, *args, **kwargs):
+        async with self.acquire() as session:
+            return await session.list_tools(*args, **kwargs)
+
+    async def call_tool(self, name: str, *args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async with self.acquire() as session:
+                result = await session.call_tool(name, *args, **kwargs)
+            outcome = "tool_error" if result.isError else "success"
+            return result
+        finally:
+            call_duration.record(time.perf_counter() - start, {"tool": name, "outcome": outcome})
+
+    async def _ready_slot(self) -> _Slot:
+        while True:
+            healthy = [slot for slot in self._slots if slot.healthy]
+            if healthy:
+                return min(healthy, key=lambda slot: slot.in_flight)
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def _run(self, slot: _Slot) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                async with self.client.session(self.server_name) as session:
+                    slot.session = session
+                    slot.broken.clear()
+                    open_sessions.add(1)
+                    self._changed.set()
+                    delay = RECONNECT_DELAY
+                    try:
+                        await self._keep_alive(slot)
+                    finally:
+                        slot.session = None
+                        open_sessions.add(-1)
+            except Exception as e:
+                logger.warning(f"MCP session to '{self.server_name}' failed: {e}")
+
+            session_rebuilds.add(1)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _keep_alive(self, slot: _Slot) -> None:
+        while not slot.broken.is_set():
+            try:
+                await asyncio.wait_for(slot.broken.wait(), self.ping_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(slot.session.send_ping(), PING_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"MCP session ping failed: {e}")
+                slot.broken.set()
+
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        while slot.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
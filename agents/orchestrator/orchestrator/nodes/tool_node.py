@@ -1,20 +1,64 @@
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
 import os
 from .auth import Auth
+from .catalog_mirror import CatalogMirror
+from .session_pool import MCPSessionPool
 import asyncio
 
+SERVER_NAME = "my-server"
+
+_auth = None
+_pool = None
+_catalog = None
+
+
 async def get_tools_function():
+    global _auth, _pool
     mcp_server_url = os.getenv("MCP_SERVER_URL")
-    auth = Auth()
+    _auth = Auth()
     client = MultiServerMCPClient({
-        "my-server": {
+        SERVER_NAME: {
             "transport": "http",
             "url": mcp_server_url,
-            "auth": auth
+            "auth": _auth
         }
 
     })
 
-    tools = await client.get_tools()
+    _pool = MCPSessionPool(
+        client,
+        SERVER_NAME,
+        size=int(os.getenv("MCP_POOL_SIZE", "2")),
+        ping_interval=float(os.getenv("MCP_PING_INTERVAL", "30")),
+    )
+    await _pool.start()
+
+    tools = await load_mcp_tools(_pool, server_name=SERVER_NAME)
     return tools
 
+
+def get_session_pool():
+    return _pool
+
+
+async def get_catalog_mirror():
+    global _catalog
+    if _catalog is None:
+        _catalog = CatalogMirror(
+            _pool,
+            ttl=float(os.getenv("CATALOG_TTL", "60")),
+            poll_interval=float(os.getenv("CATALOG_POLL_INTERVAL", "5")),
+            namespace=os.getenv("CATALOG_NAMESPACE") or None,
+        )
+        await _catalog.start()
+    return _catalog
+
+
+async def close_tools():
+    if _catalog is not None:
+        await _catalog.stop()
+    if _pool is not None:
+        await _pool.stop()
+    if _auth is not None:
+        await _auth.aclose()
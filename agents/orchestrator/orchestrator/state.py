@@ -7,4 +7,6 @@ class AgentState(TypedDict):
     messages: Annotated[list, add_messages]
     topic_eval: Optional[TopicEval]
     user_lang: str
-    stimulus_count: int
\ No newline at end of file
+    stimulus_count: int
+    # Routing decision of select_agent awaiting its tool result, see remember_route
+    pending_route: Optional[dict]
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Tests for routing topics to agents without the LLM."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the orchestrator package to Python path, where agent.py imports nodes from
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+
+from nodes.pre_router import PreRouter, agent_skills  # noqa: E402
+
+MANIFESTS_PATH = (
+    Path(__file__).parents[3] / "mcp-agent-control-plane" / "src" / "core" / "manifests.py"
+)
+
+AGENTS = [
+    {
+        "name": "python-tutor",
+        "description": "Teaches Python programming: functions, classes and debugging.",
+        "labels": {"skill-python": "Python", "skill-debugging": "Debugging"},
+    },
+    {
+        "name": "calculus-tutor",
+        "description": "Explains derivatives, integrals and limits step by step.",
+        "labels": {"skill-calculus": "Calculus"},
+    },
+    {
+        "name": "spanish-tutor",
+        "description": "Spanish grammar, vocabulary and conversation practice.",
+        "labels": {"skill-spanish": "Spanish"},
+    },
+    {
+        "name": "orchestrator-agent",
+        "description": "Routes python, calculus and spanish questions to tutors.",
+        "labels": {},
+    },
+]
+
+
+def load_skill_labels():
+    """The control plane's skill_labels, loaded without importing its server."""
+    pytest.importorskip("jinja2")
+    spec = importlib.util.spec_from_file_location("control_plane_manifests", MANIFESTS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.skill_labels
+
+
+class TestAgentSkills:
+    """Test reading skills back from the labels the control plane writes."""
+
+    def test_returns_label_values(self) -> None:
+        """Test that skills keep the case of the label values, not the lowercased keys."""
+        agent = {"labels": {"skill-machine-learning": "Machine-Learning", "team": "math"}}
+
+        assert agent_skills(agent) == ["Machine-Learning"]
+        assert agent_skills({"labels": None}) == []
+
+    def test_round_trips_skill_labels(self) -> None:
+        """Test that redeploying an agent with its own skills writes the same labels."""
+        skill_labels = load_skill_labels()
+        labels = skill_labels(["Machine Learning", "SQL", "c++ / rust", "ai-ethics"])
+
+        assert skill_labels(agent_skills({"labels": labels})) == labels
+
+
+class TestPreRouter:
+    """Test indexing, scoring and the routing thresholds."""
+
+    def test_index_skips_protected_agents_and_same_revision(self) -> None:
+        """Test that the orchestrator is never indexed and a known revision is not rebuilt."""
+        router = PreRouter()
+        router.index(AGENTS, revision=1)
+        indexed = router._agents
+        router.index(AGENTS[:1], revision=1)
+
+        assert [agent["name"] for agent in indexed] == [
+            "python-tutor",
+            "calculus-tutor",
+            "spanish-tutor",
+        ]
+        assert router._agents is indexed
+
+    def test_scores_rank_the_matching_agent_first(self) -> None:
+        """Test cosine similarities of a topic to every agent."""
+        router = PreRouter()
+        router.index(AGENTS)
+
+        scores = router.scores("calculus derivatives")
+
+        assert scores.shape == (3,)
+        assert int(np.argmax(scores)) == 1
+        assert np.all((scores >= 0) & (scores <= 1 + 1e-9))
+        assert not router.scores("").any()
+
+    def test_confident_match_skips_the_llm(self) -> None:
+        """Test that a clear best match is routed with the candidates ranked after it."""
+        route = PreRouter().route("debugging python classes", AGENTS)
+
+        assert route.agent["name"] == "python-tutor"
+        assert route.candidates[0] is route.agent
+        assert route.scores == sorted(route.scores, reverse=True)
+
+    def test_weak_match_goes_to_the_llm(self) -> None:
+        """Test that topics below the threshold or margin return candidates only."""
+        unrelated = PreRouter().route("cooking recipes", AGENTS)
+        strict = PreRouter(match_threshold=0.95).route("debugging python classes", AGENTS)
+        close = PreRouter(min_margin=0.9).route("debugging python classes", AGENTS)
+
+        assert unrelated.agent is None
+        assert len(unrelated.candidates) == 3
+        assert strict.agent is None
+        assert close.agent is None
+        assert close.candidates[0]["name"] == "python-tutor"
+
+    def test_top_k_limits_candidates(self) -> None:
+        """Test that only the top_k agents are offered to the LLM."""
+        route = PreRouter(top_k=2).route("cooking recipes", AGENTS)
+
+        assert len(route.candidates) == len(route.scores) == 2
+
+    def test_protected_agent_is_never_routed(self) -> None:
+        """Test that a topic naming the orchestrator does not select it."""
+        route = PreRouter().route("orchestrator agent routes questions", AGENTS)
+        only = PreRouter().route("orchestrator agent", AGENTS[3:])
+
+        assert all(agent["name"] != "orchestrator-agent" for agent in route.candidates)
+        assert only.agent is None
+        assert only.candidates == []
+
+    def test_single_agent_catalog(self) -> None:
+        """Test that one agent is routed on its own score, with no runner-up."""
+        router = PreRouter()
+
+        matched = router.route("debugging python classes", AGENTS[:1])
+        unmatched = router.route("spanish", AGENTS[:1])
+
+        assert matched.agent["name"] == "python-tutor"
+        assert len(matched.candidates) == len(matched.scores) == 1
+        assert unmatched.agent is None
+        assert unmatched.scores == [0.0]
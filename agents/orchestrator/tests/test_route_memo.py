@@ -0,0 +1,209 @@
+"""Tests for memoizing routing decisions and touching the routed agent once their tool call succeeded."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import ToolMessage
+from langgraph.store.memory import InMemoryStore
+
+# Add the orchestrator package to Python path, where agent.py imports nodes from
+sys.path.insert(0, str(Path(__file__).parent.parent / "orchestrator"))
+
+from nodes.pre_router import PreRouter  # noqa: E402
+from nodes.route_memo import NAMESPACE, RouteMemo, tool_succeeded  # noqa: E402
+from nodes.select_agent import remember_route, select_agent, touch_routed_agent  # noqa: E402
+
+AGENTS = [
+    {
+        "name": "python-tutor",
+        "description": "Teaches Python programming: functions, classes and debugging.",
+        "labels": {"skill-python": "Python", "skill-debugging": "Debugging"},
+    },
+    {
+        "name": "spanish-tutor",
+        "description": "Spanish grammar, vocabulary and conversation practice.",
+        "labels": {"skill-spanish": "Spanish"},
+    },
+]
+
+
+class Catalog:
+    revision = 1
+
+    async def get_agents(self) -> list[dict]:
+        return AGENTS
+
+
+def topic_state(topic: str, language: str = "en") -> dict:
+    return {
+        "messages": [],
+        "topic_eval": SimpleNamespace(topic_found=True, topic_name=topic),
+        "user_lang": language,
+    }
+
+
+async def routed(memo: RouteMemo, topic: str, language: str = "en") -> dict:
+    """Runs select_agent on a topic the pre-router matches, as the graph would."""
+    state = topic_state(topic, language)
+    update = await select_agent(state, None, Catalog(), PreRouter(), memo)
+    state["messages"] = update["messages"]
+    state["pending_route"] = update["pending_route"]
+    return state
+
+
+def tool_result(state: dict, content: str, status: str = "success") -> ToolMessage:
+    tool_call_id = state["messages"][-1].tool_calls[0]["id"]
+    return ToolMessage(content=content, tool_call_id=tool_call_id, status=status)
+
+
+class Pool:
+    """Records tool calls and answers them like the control plane's touch_agent."""
+
+    def __init__(self, output: str = '{"name": "python-tutor", "woke": true}', error: Exception | None = None):
+        self.output = output
+        self.error = error
+        self.calls = []
+
+    async def call_tool(self, name: str, arguments: dict):
+        self.calls.append((name, arguments))
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(content=[SimpleNamespace(text=self.output)], isError=False)
+
+
+class TestToolSucceeded:
+    """Test recognizing failures reported as tool results."""
+
+    def test_error_texts_and_status(self) -> None:
+        """Test that error strings and error statuses count as failures."""
+        assert tool_succeeded(ToolMessage(content="Resource 'a' updated successfully via Patch.", tool_call_id="1"))
+        assert not tool_succeeded(ToolMessage(content="Error: agent-template.yaml not found.", tool_call_id="1"))
+        assert not tool_succeeded(ToolMessage(content="K8s API Error: Conflict", tool_call_id="1"))
+        assert not tool_succeeded(ToolMessage(content="boom", tool_call_id="1", status="error"))
+
+
+class TestRouteMemo:
+    """Test the memo against an in-memory store."""
+
+    @pytest.mark.asyncio
+    async def test_put_records_the_given_fingerprint(self) -> None:
+        """Test that a decision keeps the fingerprint of the catalog it was made on."""
+        store = InMemoryStore()
+        memo = RouteMemo(store)
+        decided_on = memo.sync(AGENTS, revision=1)
+        memo.sync(AGENTS[:1], revision=2)
+
+        await memo.put("Python", "en", {"name": "python-tutor"}, decided_on)
+
+        item = await store.aget(NAMESPACE, "en:python")
+        assert item.value["catalog"] == decided_on
+        # Decided on an older catalog, so it is neither in the LRU nor valid now
+        assert await memo.get("Python", "en") is None
+
+
+class TestRememberRoute:
+    """Test that select_agent decisions are memoized only after their tool succeeded."""
+
+    @pytest.mark.asyncio
+    async def test_select_agent_does_not_memoize_before_the_tool_runs(self) -> None:
+        """Test that a pre-routed decision is left pending."""
+        memo = RouteMemo(InMemoryStore())
+
+        state = await routed(memo, "debugging python classes")
+
+        assert state["pending_route"]["decision"]["skills"] == ["Python", "Debugging"]
+        assert await memo.get("debugging python classes", "en") is None
+
+    @pytest.mark.asyncio
+    async def test_successful_tool_result_is_memoized(self) -> None:
+        """Test that the decision is stored once the tool reports success."""
+        memo = RouteMemo(InMemoryStore())
+        state = await routed(memo, "debugging python classes")
+        state["messages"].append(tool_result(state, "Resource 'python-tutor' is already up to date."))
+
+        update = await remember_route(state, memo)
+
+        assert update == {"pending_route": None}
+        decision = await memo.get("debugging python classes", "en")
+        assert decision["name"] == "python-tutor"
+
+    @pytest.mark.asyncio
+    async def test_failed_tool_result_is_not_memoized(self) -> None:
+        """Test that error results and results of other calls leave the memo empty."""
+        memo = RouteMemo(InMemoryStore())
+        state = await routed(memo, "debugging python classes")
+        state["messages"].append(tool_result(state, "Error: Agent CRD is not installed."))
+        state["messages"].append(ToolMessage(content="Successfully deployed", tool_call_id="other"))
+
+        update = await remember_route(state, memo)
+
+        assert update == {"pending_route": None}
+        assert await memo.get("debugging python classes", "en") is None
+
+    @pytest.mark.asyncio
+    async def test_languages_are_memoized_separately(self) -> None:
+        """Test that the same topic asked in two languages gets one entry per language."""
+        store = InMemoryStore()
+        memo = RouteMemo(store)
+        for language in ("en", "es"):
+            state = await routed(memo, "debugging python classes", language)
+            assert state["pending_route"]["language"] == language
+            state["messages"].append(tool_result(state, "Resource 'python-tutor' is already up to date."))
+            await remember_route(state, memo)
+
+        assert await store.aget(NAMESPACE, "en:debugging python classes") is not None
+        assert await store.aget(NAMESPACE, "es:debugging python classes") is not None
+        assert await memo.get("debugging python classes", "fr") is None
+
+    @pytest.mark.asyncio
+    async def test_without_pending_route(self) -> None:
+        """Test that a turn answered from the memo has nothing to remember."""
+        memo = RouteMemo(InMemoryStore())
+
+        assert await remember_route({"messages": [], "pending_route": None}, memo) == {"pending_route": None}
+
+
+class TestTouchRoutedAgent:
+    """Test that the agent a turn was routed to is reported as used."""
+
+    @pytest.mark.asyncio
+    async def test_routed_agent_is_touched(self) -> None:
+        """Test that a successful routing call touches its agent, also on memo hits."""
+        memo = RouteMemo(InMemoryStore())
+        state = await routed(memo, "debugging python classes")
+        state["messages"].append(tool_result(state, "Resource 'python-tutor' is already up to date."))
+        await remember_route(state, memo)
+        hit = await routed(memo, "debugging python classes")
+        assert hit["pending_route"] is None
+        hit["messages"].append(tool_result(hit, "Resource 'python-tutor' is already up to date."))
+        pool = Pool()
+
+        assert await touch_routed_agent(state, pool) == {}
+        assert await touch_routed_agent(hit, pool) == {}
+
+        assert pool.calls == [("touch_agent", {"name": "python-tutor"})] * 2
+
+    @pytest.mark.asyncio
+    async def test_failed_or_missing_routing_call_is_not_touched(self) -> None:
+        """Test that nothing is touched without a successful routing call."""
+        memo = RouteMemo(InMemoryStore())
+        state = await routed(memo, "debugging python classes")
+        state["messages"].append(tool_result(state, "Error: Agent CRD is not installed."))
+        pool = Pool()
+
+        await touch_routed_agent(state, pool)
+        await touch_routed_agent({"messages": []}, pool)
+
+        assert pool.calls == []
+
+    @pytest.mark.asyncio
+    async def test_touch_failures_do_not_fail_the_turn(self) -> None:
+        """Test that an unreachable control plane or an error result is only logged."""
+        memo = RouteMemo(InMemoryStore())
+        state = await routed(memo, "debugging python classes")
+        state["messages"].append(tool_result(state, "Resource 'python-tutor' is already up to date."))
+
+        assert await touch_routed_agent(state, Pool(error=ConnectionError("down"))) == {}
+        assert await touch_routed_agent(state, Pool(output="Error: agent 'python-tutor' not found.")) == {}
@@ -6,6 +6,22 @@ from state import AgentState
 
 logger = logging.getLogger(__name__)
 
+SERVICE_ACCOUNT_NAMESPACE = "/var/run/secrets/kubernetes.io/serviceaccount/namespace"
+
+
+def agent_namespace() -> str:
+    """
+    Namespace of this agent's CRD: AGENT_NAMESPACE, else the pod's own namespace.
+    """
+    namespace = os.getenv("AGENT_NAMESPACE")
+    if namespace:
+        return namespace
+    try:
+        with open(SERVICE_ACCOUNT_NAMESPACE) as f:
+            return f.read().strip()
+    except OSError:
+        return "kagent"
+
 
 async def get_config(state: AgentState):
     """
@@ -15,7 +31,7 @@ async def get_config(state: AgentState):
         config.load_incluster_config()
         custom_api = client.CustomObjectsApi()
 
-        namespace = "kagent"
+        namespace = agent_namespace()
         resource_name = os.getenv("AGENT_NAME")
 
         group = "kagent.dev"
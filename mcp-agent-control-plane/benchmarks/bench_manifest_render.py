@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: cached manifest renderer vs. Jinja-then-YAML per call.
+
+The legacy path reproduces what the write tools used to do on every request:
+read the template, build a new jinja2.Template, render a YAML string and parse
+it back with yaml.safe_load.
+
+Usage:
+  python benchmarks/bench_manifest_render.py [--iterations 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import yaml
+from jinja2 import Template
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.manifests import ManifestRenderer, skill_labels  # noqa: E402
+
+TEMPLATE_PATH = Path(__file__).parent.parent / "agent-template.yaml"
+
+LEGACY_TEMPLATE = """apiVersion: kagent.dev/v1alpha2
+kind: Agent
+metadata:
+  name: "{{ name }}"
+  labels:
+    {%- for key, value in skills.items() %}
+    {{ key }}: "{{ value }}"
+    {%- endfor %}
+spec:
+  serviceAccountName: "{{ name }}"
+  description: "{{ description }}"
+  type: BYO
+  byo:
+    deployment:
+      image: agent/custom/template-agent:0.1.0
+      env:
+        - name: AGENT_HOST
+          value: "0.0.0.0"
+        - name: AGENT_PORT
+          value: "8080"
+        - name: AGENT_NAME
+          value: "{{ name }}"
+"""
+
+NAME = "ethics-specialist"
+DESCRIPTION = "Teaches algorithmic bias, fairness metrics and responsible AI."
+SKILLS = ["ai-ethics", "risk-management", "fairness-metrics", "bias-auditing"]
+
+
+def legacy_render(path: str) -> dict:
+    populated_skills = {f"skill-{s.lower().replace(' ', '-')}": s for s in SKILLS}
+    with open(path) as f:
+        template = Template(f.read())
+    return yaml.safe_load(
+        template.render(name=NAME, description=DESCRIPTION, skills=populated_skills)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as f:
+        f.write(LEGACY_TEMPLATE)
+        legacy_path = f.name
+
+    renderer = ManifestRenderer(str(TEMPLATE_PATH))
+
+    def cached_render() -> dict:
+        return renderer.render(
+            name=NAME, description=DESCRIPTION, skills=skill_labels(SKILLS)
+        )
+
+    results = {}
+    for label, fn in (
+        ("jinja+yaml per call", lambda: legacy_render(legacy_path)),
+        ("cached renderer", cached_render),
+    ):
+        fn()
+        seconds = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        results[label] = seconds / args.iterations * 1e6
+
+    for label, micros in results.items():
+        print(f"{label:<22} {micros:10.1f} us/render")
+    legacy, cached = results.values()
+    print(f"{'speedup':<22} {legacy / cached:10.1f}x")
+
+    Path(legacy_path).unlink()
+
+
+if __name__ == "__main__":
+    main()
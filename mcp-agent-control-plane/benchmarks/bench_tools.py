@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Benchmark: every MCP tool against a fake API server at several catalog sizes.
+
+The server runs in this process with its real tools, Kubernetes client and
+agent catalog, pointed at benchmarks/fake_kube.py through a generated
+kubeconfig, so no cluster is needed. Tools are called through a real MCP
+client, either in memory or over streamable HTTP.
+
+For each number of Agents, every scenario is called --requests times with
+--concurrency calls in flight. The report gives p50/p99/mean latency,
+throughput, error count, process RSS and the API requests the calls caused.
+Results are written as JSON; --compare exits 1 if any scenario's p99 is
+slower than in a previous result by more than --tolerance.
+
+Usage:
+  python benchmarks/bench_tools.py [--agents 10,1000,10000] [--requests 200]
+      [--concurrency 8] [--latency-ms 2] [--ready-ms 50] [--transport memory|http]
+      [--output FILE] [--compare BASELINE.json] [--tolerance 0.2]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fake_kube import FakeKubeAPI  # noqa: E402
+
+PROJECT_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Scenario name -> (tool, function of the call index returning the arguments)
+Scenario = tuple[str, Callable[[int], dict[str, Any]]]
+
+# Untimed step run before each call: (client, fake, call index) -> arguments
+# added to the scenario's own
+Prepare = Callable[[Any, FakeKubeAPI, int], Awaitable[dict[str, Any]]]
+
+
+def _skills(i: int) -> list[str]:
+    return ["python", "statistics", f"topic-{i % 7}"]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_available_agents": ("list_available_agents", lambda i: {}),
+    "list_available_agents[compact]": (
+        "list_available_agents",
+        lambda i: {"compact": True},
+    ),
+    "list_available_agents[limit=50]": (
+        "list_available_agents",
+        lambda i: {"limit": 50},
+    ),
+    "get_catalog_status": ("get_catalog_status", lambda i: {}),
+    "search_agents": (
+        "search_agents",
+        lambda i: {
+            "query": f"worked examples for {_skills(i)[2]} and statistics",
+            "top_k": 5,
+        },
+    ),
+    "find_agents_by_skill": (
+        "find_agents_by_skill",
+        lambda i: {"skills": ["python", "statistics"], "match": "all"},
+    ),
+    "update_agent_config": (
+        "update_agent_config",
+        lambda i: {
+            "name": f"agent-{i % 10:05d}",
+            "description": f"Revision {i}",
+            "skills": _skills(i),
+        },
+    ),
+    "deploy_new_agent": (
+        "deploy_new_agent",
+        lambda i: {
+            "name": f"bench-agent-{i}",
+            "description": "Benchmark agent",
+            "skills": _skills(i),
+        },
+    ),
+    "deploy_new_agent[background]": (
+        "deploy_new_agent",
+        lambda i: {
+            "name": f"bench-job-{i}",
+            "description": "Benchmark agent",
+            "skills": _skills(i),
+            "background": True,
+        },
+    ),
+    "get_deploy_status": ("get_deploy_status", lambda i: {}),
+    "wait_for_agent_ready": ("wait_for_agent_ready", lambda i: {}),
+    "touch_agent": ("touch_agent", lambda i: {"name": f"agent-{i % 10:05d}"}),
+    "touch_agent[cold]": ("touch_agent", lambda i: {}),
+    "deploy_agents_batch[10]": (
+        "deploy_agents_batch",
+        lambda i: {
+            "agents": [
+                {
+                    "name": f"bench-batch-{i}-{j}",
+                    "description": "Benchmark agent",
+                    "skills": _skills(j),
+                }
+                for j in range(10)
+            ]
+        },
+    ),
+}
+
+# Scenarios that create agents run a tenth as often, so the catalog size
+# stays close to the one being measured.
+WRITE_SCENARIOS = {
+    "deploy_new_agent",
+    "deploy_new_agent[background]",
+    "get_deploy_status",
+    "deploy_agents_batch[10]",
+}
+
+
+async def _catalog_has(obj: dict[str, Any]) -> None:
+    """Wait until the agent catalog has seen a write made to the fake."""
+    from core.catalog import get_agent_catalog
+
+    metadata = obj["metadata"]
+    version = int(metadata["resourceVersion"])
+    await get_agent_catalog(metadata["namespace"]).wait_for(
+        metadata["namespace"],
+        metadata["name"],
+        lambda item: (
+            item is not None and int(item["metadata"]["resourceVersion"]) >= version
+        ),
+        timeout=10.0,
+    )
+
+
+async def _submit_deploy(client: Any, fake: FakeKubeAPI, i: int) -> dict[str, Any]:
+    """Start a background deploy for get_deploy_status to poll."""
+    result = await client.call_tool(
+        "deploy_new_agent",
+        {
+            "name": f"bench-poll-{i}",
+            "description": "Benchmark agent",
+            "skills": _skills(i),
+            "background": True,
+        },
+    )
+    return {"job_id": json.loads(result.content[0].text)["job_id"]}
+
+
+async def _roll_out(client: Any, fake: FakeKubeAPI, i: int) -> dict[str, Any]:
+    """Change an agent's spec, so it is Ready again only after --ready-ms."""
+    name = f"agent-{i % 10:05d}"
+    await _catalog_has(fake.patch_agent(name, {"spec": {"description": f"Rev {i}"}}))
+    return {"name": name}
+
+
+async def _scale_to_zero(client: Any, fake: FakeKubeAPI, i: int) -> dict[str, Any]:
+    """Make an agent cold, as the idle reconciler would, for touch_agent to wake."""
+    name = f"agent-{i % 10:05d}"
+    cold = {"spec": {"byo": {"deployment": {"replicas": 0}}}}
+    await _catalog_has(fake.patch_agent(name, cold))
+    return {"name": name}
+
+
+# Scenarios whose calls need state set up first. Throughput includes that
+# setup; the latencies do not.
+PREPARE: dict[str, Prepare] = {
+    "get_deploy_status": _submit_deploy,
+    "wait_for_agent_ready": _roll_out,
+    "touch_agent[cold]": _scale_to_zero,
+}
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _run_scenario(
+    client: Any,
+    tool: str,
+    arguments: Callable[[int], dict[str, Any]],
+    requests: int,
+    concurrency: int,
+    prepare: Callable[[int], Awaitable[dict[str, Any]]] | None = None,
+) -> dict[str, Any]:
+    from fastmcp.tools.tool import ToolResult
+
+    from core.metrics import classify_response
+
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            call_arguments = arguments(index)
+            if prepare is not None:
+                call_arguments.update(await prepare(index))
+            started = time.perf_counter()
+            try:
+                result = await client.call_tool(
+                    tool, call_arguments, raise_on_error=False
+                )
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            else:
+                error = classify_response(
+                    ToolResult(
+                        content=result.content,
+                        structured_content=result.structured_content,
+                    )
+                )
+                if result.is_error or error:
+                    errors[error or "ToolError"] += 1
+            latencies.append(time.perf_counter() - started)
+
+    # One untimed call, so first-call imports and connections are not measured
+    call_arguments = arguments(requests)
+    if prepare is not None:
+        call_arguments.update(await prepare(requests))
+    await client.call_tool(tool, call_arguments, raise_on_error=False)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": sum(errors.values()),
+        "error_classes": dict(errors),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+    }
+
+
+async def _wait_for_catalog(size: int, timeout: float = 60.0) -> None:
+    from core.catalog import get_agent_catalog
+
+    catalog = get_agent_catalog()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not catalog.is_stale() and len(catalog) >= size:
+            return
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"agent catalog did not reach {size} agents within {timeout}s")
+
+
+async def _drain_jobs(timeout: float = 60.0) -> None:
+    """Let background deploys finish so they do not load the next scenario."""
+    from core.jobs import get_deploy_jobs
+
+    jobs = get_deploy_jobs()
+    deadline = time.monotonic() + timeout
+    while jobs.running and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    fake = FakeKubeAPI(latency=args.latency_ms / 1000, ready_after=args.ready_ms / 1000)
+    await fake.start()
+
+    # Point the real client at the fake, whatever the surrounding shell says
+    workdir = Path(tempfile.mkdtemp(prefix="bench-tools-"))
+    os.environ["KUBECONFIG"] = str(fake.write_kubeconfig(workdir / "kubeconfig"))
+    os.environ.pop("KUBERNETES_SERVICE_HOST", None)
+    os.environ.setdefault("NAMESPACE", "kagent")
+    os.chdir(PROJECT_DIR)
+
+    from fastmcp import Client
+
+    from core.registry import rss_bytes
+    from core.server import DynamicMCPServer
+
+    server = DynamicMCPServer(
+        name="bench", tools_dir=str(PROJECT_DIR / "src" / "tools")
+    )
+    server.load_tools()
+
+    http_server = None
+    http_task = None
+    if args.transport == "http":
+        import uvicorn
+
+        port = _free_port()
+        http_server = uvicorn.Server(
+            uvicorn.Config(
+                server.mcp.http_app(path="/mcp"),
+                host="127.0.0.1",
+                port=port,
+                log_level="warning",
+            )
+        )
+        http_task = asyncio.create_task(http_server.serve())
+        while not http_server.started:
+            await asyncio.sleep(0.05)
+        target: Any = f"http://127.0.0.1:{port}/mcp"
+    else:
+        target = server.mcp
+
+    scenarios = [name for name in SCENARIOS if not args.only or name in args.only]
+    sizes: list[dict[str, Any]] = []
+    try:
+        async with Client(target, timeout=120) as client:
+            for size in args.agents:
+                fake.seed_agents(size)
+                await _wait_for_catalog(size)
+                print(f"\n{size} agents")
+                print(
+                    f"  {'scenario':<34}{'p50 ms':>10}{'p99 ms':>10}"
+                    f"{'req/s':>10}{'errors':>8}"
+                )
+
+                results: dict[str, Any] = {}
+                for name in scenarios:
+                    tool, arguments = SCENARIOS[name]
+                    requests = args.requests
+                    if name in WRITE_SCENARIOS:
+                        requests = max(1, requests // 10)
+                    prepare = PREPARE.get(name)
+                    if prepare is not None:
+                        prepare = functools.partial(prepare, client, fake)
+                    before = Counter(fake.requests)
+                    # Some tools print their result; keep the table readable
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = await _run_scenario(
+                            client, tool, arguments, requests, args.concurrency, prepare
+                        )
+                    await _drain_jobs()
+                    result["api_requests"] = dict(Counter(fake.requests) - before)
+                    result["rss_mib"] = rss_bytes() / 2**20
+                    results[name] = result
+                    print(
+                        f"  {name:<34}{result['p50_ms']:>10.2f}"
+                        f"{result['p99_ms']:>10.2f}"
+                        f"{result['throughput_rps']:>10.1f}{result['errors']:>8}"
+                    )
+                sizes.append({"agents": size, "scenarios": results})
+    finally:
+        if http_server is not None and http_task is not None:
+            http_server.should_exit = True
+            await http_task
+        await fake.stop()
+
+    return {
+        "benchmark": "bench_tools",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "agents": args.agents,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "ready_ms": args.ready_ms,
+            "transport": args.transport,
+        },
+        "sizes": sizes,
+    }
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Scenarios whose p99 regressed by more than ``tolerance`` against ``baseline``."""
+    previous = {
+        (size["agents"], name): result
+        for size in baseline.get("sizes", [])
+        for name, result in size["scenarios"].items()
+    }
+    regressions = []
+    for size in current["sizes"]:
+        for name, result in size["scenarios"].items():
+            before = previous.get((size["agents"], name))
+            if before is None or before["p99_ms"] <= 0:
+                continue
+            change = result["p99_ms"] / before["p99_ms"] - 1
+            if change > tolerance:
+                regressions.append(
+                    f"{name} @ {size['agents']} agents: "
+                    f"p99 {before['p99_ms']:.2f} ms -> "
+                    f"{result['p99_ms']:.2f} ms (+{change:.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--agents",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=[10, 1000, 10000],
+        help="Comma-separated catalog sizes (default: 10,1000,10000)",
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight")
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=2.0,
+        help="Latency added to every API request",
+    )
+    parser.add_argument(
+        "--ready-ms",
+        type=float,
+        default=50.0,
+        help="Delay before the fake controller reports a written Agent Ready",
+    )
+    parser.add_argument("--transport", choices=["memory", "http"], default="memory")
+    parser.add_argument(
+        "--only",
+        type=lambda value: value.split(","),
+        help="Comma-separated scenarios to run",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Result file (default: benchmarks/results/)"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Previous result file to compare p99 against"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed p99 slowdown, 0.2 = 20%%"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+
+    output = (
+        args.output
+        or RESULTS_DIR / f"bench_tools-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("config") != report["config"]:
+            print(f"\nWarning: {args.compare} was run with {baseline.get('config')}")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\np99 regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(
+            f"\nNo p99 regressions beyond {args.tolerance:.0%} against {args.compare}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,655 @@
+"""In-process stand-in for the Kubernetes API server.
+
+FakeKubeAPI serves just enough of the API for the control plane's tools to
+run unmodified against it with the real ``kubernetes_asyncio`` client:
+
+- discovery (``/version``, ``/apis`` and the resource lists the dynamic
+  client reads)
+- get, list with ``limit``/``continue`` and equality or existence
+  ``labelSelector`` terms, create, merge patch, server-side apply and
+  delete for ``kagent.dev/v1alpha2`` Agents, ServiceAccounts, Roles and
+  RoleBindings
+- watches with bookmarks, ``timeoutSeconds`` and 410 Gone for versions that
+  fell out of the event window
+- a fixed or jittered latency injected into every request
+- optionally, a controller that marks each written Agent Ready after a delay
+
+It runs an aiohttp server on the current event loop, so benchmarks and tests
+need no cluster:
+
+    fake = FakeKubeAPI(latency=0.005)
+    await fake.start()
+    fake.seed_agents(1000)
+    kubeconfig = fake.write_kubeconfig(tmp_dir / "kubeconfig")
+"""
+
+import asyncio
+import base64
+import copy
+import json
+import random
+import time
+import uuid
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+AGENT_GROUP = "kagent.dev"
+AGENT_VERSION = "v1alpha2"
+
+# (group, version, plural) -> discovery entry
+RESOURCES: dict[tuple[str, str, str], dict[str, Any]] = {
+    ("", "v1", "serviceaccounts"): {
+        "kind": "ServiceAccount",
+        "singularName": "serviceaccount",
+    },
+    ("rbac.authorization.k8s.io", "v1", "roles"): {
+        "kind": "Role",
+        "singularName": "role",
+    },
+    ("rbac.authorization.k8s.io", "v1", "rolebindings"): {
+        "kind": "RoleBinding",
+        "singularName": "rolebinding",
+    },
+    (AGENT_GROUP, AGENT_VERSION, "agents"): {"kind": "Agent", "singularName": "agent"},
+}
+
+VERBS = ["create", "delete", "get", "list", "patch", "update", "watch"]
+
+SKILLS = [
+    "python",
+    "kubernetes",
+    "statistics",
+    "linear-algebra",
+    "cryptography",
+    "ethics",
+    "databases",
+    "networking",
+    "compilers",
+    "music-theory",
+    "french",
+    "calculus",
+]
+
+
+def make_agent(index: int, namespace: str = "kagent") -> dict[str, Any]:
+    """Build a realistic Agent custom resource for seeding."""
+    skills = [SKILLS[(index + offset) % len(SKILLS)] for offset in range(3)]
+    return {
+        "apiVersion": f"{AGENT_GROUP}/{AGENT_VERSION}",
+        "kind": "Agent",
+        "metadata": {
+            "name": f"agent-{index:05d}",
+            "namespace": namespace,
+            "labels": {f"skill-{skill}": skill for skill in skills},
+        },
+        "spec": {
+            "description": (
+                f"Agent {index} teaches {', '.join(skills)} with worked examples, "
+                "exercises and step-by-step explanations."
+            ),
+            "type": "BYO",
+            "byo": {"deployment": {"image": "agent/custom/template-agent:0.1.0"}},
+        },
+    }
+
+
+def _merge(target: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """Apply a JSON merge patch (RFC 7386) in place."""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict):
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            _merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+    return target
+
+
+def _parse_selector(selector: str) -> list[tuple[str, str | None]]:
+    """Parse the equality and existence terms of a label selector."""
+    terms = []
+    for term in filter(None, (part.strip() for part in selector.split(","))):
+        key, _, value = term.partition("=")
+        terms.append((key.rstrip("="), value.lstrip("=") if value else None))
+    return terms
+
+
+def _selected(obj: dict[str, Any], terms: list[tuple[str, str | None]]) -> bool:
+    labels = obj.get("metadata", {}).get("labels") or {}
+    return all(
+        key in labels and (value is None or labels[key] == value)
+        for key, value in terms
+    )
+
+
+def _status(code: int, reason: str, message: str) -> web.Response:
+    return web.json_response(
+        {
+            "kind": "Status",
+            "apiVersion": "v1",
+            "metadata": {},
+            "status": "Failure",
+            "message": message,
+            "reason": reason,
+            "code": code,
+        },
+        status=code,
+    )
+
+
+class FakeKubeAPI:
+    """Minimal, in-memory Kubernetes API server."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        event_window: int = 100000,
+        bookmark_interval: float = 1.0,
+        ready_after: float | None = None,
+    ):
+        """Initialize an empty API server.
+
+        Args:
+            latency: Seconds added to every request
+            jitter: Up to this many extra seconds, drawn uniformly per request
+            event_window: Watch events retained; older versions get 410 Gone
+            bookmark_interval: Seconds between BOOKMARK events on idle watches
+            ready_after: Seconds after which a created or changed Agent gets a
+                Ready condition, None to leave Agent status alone
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.bookmark_interval = bookmark_interval
+        self.ready_after = ready_after
+        self.objects: dict[
+            tuple[str, str, str], dict[tuple[str, str], dict[str, Any]]
+        ] = {key: {} for key in RESOURCES}
+        self.events: deque[tuple[int, tuple[str, str, str], str, dict[str, Any]]] = (
+            deque(maxlen=event_window)
+        )
+        self.requests: Counter[str] = Counter()
+        self._resource_version = 0
+        self._changed = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    # -- state ----------------------------------------------------------------
+
+    @property
+    def resource_version(self) -> int:
+        """Version of the most recent write."""
+        return self._resource_version
+
+    def _record(
+        self, key: tuple[str, str, str], event_type: str, obj: dict[str, Any]
+    ) -> None:
+        self.events.append(
+            (self._resource_version, key, event_type, copy.deepcopy(obj))
+        )
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _events_since(
+        self, resource_version: int
+    ) -> list[tuple[int, tuple[str, str, str], str, dict[str, Any]]]:
+        # Events are ordered by version, so only the tail needs scanning
+        newer = []
+        for event in reversed(self.events):
+            if event[0] <= resource_version:
+                break
+            newer.append(event)
+        newer.reverse()
+        return newer
+
+    def put(self, key: tuple[str, str, str], obj: dict[str, Any]) -> dict[str, Any]:
+        """Create or replace an object, bumping its resourceVersion."""
+        metadata = obj.setdefault("metadata", {})
+        store = self.objects[key]
+        name = (metadata.get("namespace", ""), metadata["name"])
+        existing = store.get(name)
+        self._resource_version += 1
+        metadata["resourceVersion"] = str(self._resource_version)
+        metadata.setdefault(
+            "uid", existing["metadata"]["uid"] if existing else str(uuid.uuid4())
+        )
+        metadata.setdefault("generation", 1)
+        metadata.setdefault(
+            "creationTimestamp",
+            existing["metadata"]["creationTimestamp"]
+            if existing
+            else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        )
+        store[name] = obj
+        self._record(key, "MODIFIED" if existing else "ADDED", obj)
+        return obj
+
+    def delete(
+        self, key: tuple[str, str, str], namespace: str, name: str
+    ) -> dict[str, Any] | None:
+        """Delete an object, returning it if it existed."""
+        obj = self.objects[key].pop((namespace, name), None)
+        if obj is not None:
+            self._resource_version += 1
+            obj["metadata"]["resourceVersion"] = str(self._resource_version)
+            self._record(key, "DELETED", obj)
+        return obj
+
+    def seed_agents(self, count: int, namespace: str = "kagent") -> int:
+        """Add generated Agents until ``count`` seeded agents exist.
+
+        Returns:
+            Number of agents added
+        """
+        key = (AGENT_GROUP, AGENT_VERSION, "agents")
+        added = 0
+        for index in range(count):
+            if (namespace, f"agent-{index:05d}") not in self.objects[key]:
+                self.put(key, make_agent(index, namespace))
+                added += 1
+        return added
+
+    def agents(self) -> list[dict[str, Any]]:
+        """Every stored Agent."""
+        return list(self.objects[(AGENT_GROUP, AGENT_VERSION, "agents")].values())
+
+    def patch_agent(
+        self, name: str, patch: dict[str, Any], namespace: str = "kagent"
+    ) -> dict[str, Any]:
+        """Merge-patch a stored Agent, as a client other than the tools would.
+
+        As with a PATCH request, spec changes bump the generation and, with
+        ``ready_after`` set, the new generation is reported Ready later. Must
+        be called from the event loop the server runs on.
+
+        Raises:
+            KeyError: If the Agent does not exist
+        """
+        key = (AGENT_GROUP, AGENT_VERSION, "agents")
+        existing = self.objects[key][(namespace, name)]
+        obj = copy.deepcopy(existing)
+        _merge(obj, patch)
+        return self._write(key, existing, obj)
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; port 0 picks a free port.
+
+        Returns:
+            Base URL of the server
+        """
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_route("*", "/{path:.*}", self._dispatch)
+        self._runner = web.AppRunner(app, handle_signals=False, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving and end open watches."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def write_kubeconfig(self, path: Path) -> Path:
+        """Write a kubeconfig that points at this server."""
+        config = {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake"}}],
+            "contexts": [
+                {"name": "fake", "context": {"cluster": "fake", "user": "fake"}}
+            ],
+            "current-context": "fake",
+        }
+        path.write_text(json.dumps(config))
+        return path
+
+    # -- HTTP -----------------------------------------------------------------
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            return await handler(request)
+        except ConnectionResetError:
+            # The client went away mid-request, e.g. a cancelled call
+            return web.Response(status=499)
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        parts = [part for part in request.path.split("/") if part]
+        discovery = self._discovery(parts)
+        if discovery is not None:
+            self.requests["discovery"] += 1
+            return web.json_response(discovery)
+
+        # /api/v1/... or /apis/{group}/{version}/...
+        if parts[:2] == ["api", "v1"]:
+            group, version, rest = "", "v1", parts[2:]
+        elif len(parts) >= 3 and parts[0] == "apis":
+            group, version, rest = parts[1], parts[2], parts[3:]
+        else:
+            return _status(404, "NotFound", f"the server could not find {request.path}")
+
+        namespace = None
+        if len(rest) >= 2 and rest[0] == "namespaces":
+            namespace, rest = rest[1], rest[2:]
+        if not rest or (group, version, rest[0]) not in RESOURCES:
+            return _status(404, "NotFound", f"the server could not find {request.path}")
+        key = (group, version, rest[0])
+        name = rest[1] if len(rest) > 1 else None
+
+        verb = self._verb(request, name)
+        self.requests[f"{verb} {key[2]}"] += 1
+        if verb == "watch":
+            return await self._watch(request, key, namespace)
+        if verb == "list":
+            return self._list(request, key, namespace)
+        if verb == "create":
+            return await self._create(request, key, namespace)
+        assert name is not None
+        if verb == "get":
+            obj = self.objects[key].get((namespace or "", name))
+            if obj is None:
+                return _status(404, "NotFound", f'{key[2]} "{name}" not found')
+            return web.json_response(obj)
+        if verb == "patch":
+            return await self._patch(request, key, namespace or "", name)
+        if verb == "delete":
+            obj = self.delete(key, namespace or "", name)
+            if obj is None:
+                return _status(404, "NotFound", f'{key[2]} "{name}" not found')
+            return web.json_response(obj)
+        return _status(405, "MethodNotAllowed", f"{request.method} is not supported")
+
+    @staticmethod
+    def _verb(request: web.Request, name: str | None) -> str:
+        if request.method == "GET":
+            if name is not None:
+                return "get"
+            return (
+                "watch"
+                if request.query.get("watch") in ("true", "1", "True")
+                else "list"
+            )
+        return {
+            "POST": "create",
+            "PATCH": "patch",
+            "PUT": "patch",
+            "DELETE": "delete",
+        }.get(request.method, request.method.lower())
+
+    def _discovery(self, parts: list[str]) -> dict[str, Any] | None:
+        if parts == ["version"]:
+            return {
+                "major": "1",
+                "minor": "30",
+                "gitVersion": "v1.30.0-fake",
+                "platform": "fake",
+            }
+        if parts == ["api"]:
+            return {"kind": "APIVersions", "versions": ["v1"]}
+        if parts == ["apis"]:
+            groups: dict[str, str] = {}
+            for group, version, _ in RESOURCES:
+                if group:
+                    groups[group] = version
+            return {
+                "kind": "APIGroupList",
+                "apiVersion": "v1",
+                "groups": [
+                    {
+                        "name": group,
+                        "versions": [
+                            {"groupVersion": f"{group}/{version}", "version": version}
+                        ],
+                        "preferredVersion": {
+                            "groupVersion": f"{group}/{version}",
+                            "version": version,
+                        },
+                    }
+                    for group, version in groups.items()
+                ],
+            }
+        if parts == ["api", "v1"]:
+            group_version: tuple[str, str] | None = ("", "v1")
+        elif len(parts) == 3 and parts[0] == "apis":
+            group_version = (parts[1], parts[2])
+        else:
+            group_version = None
+        if group_version is None:
+            return None
+        return {
+            "kind": "APIResourceList",
+            "apiVersion": "v1",
+            "groupVersion": "/".join(filter(None, group_version)),
+            "resources": [
+                {
+                    "name": plural,
+                    "singularName": entry["singularName"],
+                    "namespaced": True,
+                    "kind": entry["kind"],
+                    "verbs": VERBS,
+                }
+                for (group, version, plural), entry in RESOURCES.items()
+                if (group, version) == group_version
+            ],
+        }
+
+    def _list(
+        self, request: web.Request, key: tuple[str, str, str], namespace: str | None
+    ) -> web.Response:
+        selector = _parse_selector(request.query.get("labelSelector", ""))
+        items = sorted(
+            (
+                obj
+                for (ns, _), obj in self.objects[key].items()
+                if (namespace is None or ns == namespace) and _selected(obj, selector)
+            ),
+            key=lambda obj: (
+                obj["metadata"].get("namespace", ""),
+                obj["metadata"]["name"],
+            ),
+        )
+
+        start = 0
+        token = request.query.get("continue")
+        if token:
+            try:
+                start = int(base64.urlsafe_b64decode(token.encode()).decode())
+            except ValueError:
+                return _status(400, "BadRequest", "invalid continue token")
+        limit = int(request.query.get("limit") or 0)
+        end = start + limit if limit else len(items)
+        metadata: dict[str, Any] = {"resourceVersion": str(self._resource_version)}
+        if end < len(items):
+            metadata["continue"] = base64.urlsafe_b64encode(str(end).encode()).decode()
+
+        group, version, _ = key
+        return web.json_response(
+            {
+                "apiVersion": "/".join(filter(None, (group, version))),
+                "kind": f"{RESOURCES[key]['kind']}List",
+                "metadata": metadata,
+                "items": items[start:end],
+            }
+        )
+
+    async def _create(
+        self, request: web.Request, key: tuple[str, str, str], namespace: str | None
+    ) -> web.Response:
+        body = await request.json()
+        body.setdefault("metadata", {})["namespace"] = namespace or ""
+        if (namespace or "", body["metadata"]["name"]) in self.objects[key]:
+            return _status(
+                409,
+                "AlreadyExists",
+                f'{key[2]} "{body["metadata"]["name"]}" already exists',
+            )
+        created = self.put(key, body)
+        self._reconcile(key, created)
+        return web.json_response(created, status=201)
+
+    async def _patch(
+        self, request: web.Request, key: tuple[str, str, str], namespace: str, name: str
+    ) -> web.Response:
+        body = json.loads(await request.text() or "{}")
+        content_type = request.headers.get("Content-Type", "")
+        existing = self.objects[key].get((namespace, name))
+
+        if content_type.startswith("application/apply-patch"):
+            # Server-side apply creates missing objects; fields are merged
+            obj = copy.deepcopy(existing) if existing else {}
+        elif existing is None:
+            return _status(404, "NotFound", f'{key[2]} "{name}" not found')
+        else:
+            obj = copy.deepcopy(existing)
+
+        _merge(obj, body)
+        obj.setdefault("metadata", {}).update(name=name, namespace=namespace)
+        return web.json_response(self._write(key, existing, obj))
+
+    def _write(
+        self,
+        key: tuple[str, str, str],
+        existing: dict[str, Any] | None,
+        obj: dict[str, Any],
+    ) -> dict[str, Any]:
+        if existing is not None and obj == existing:
+            # No-op writes keep their resourceVersion, as on a real server
+            return existing
+        if existing is not None and obj.get("spec") != existing.get("spec"):
+            # Like the real server, only spec changes bump the generation
+            generation = existing["metadata"].get("generation", 1) + 1
+            obj["metadata"]["generation"] = generation
+        written = self.put(key, obj)
+        self._reconcile(key, written)
+        return written
+
+    def _reconcile(self, key: tuple[str, str, str], obj: dict[str, Any]) -> None:
+        """Play the agent controller: report the new generation Ready later."""
+        if key != (AGENT_GROUP, AGENT_VERSION, "agents") or self.ready_after is None:
+            return
+        metadata = obj["metadata"]
+        asyncio.get_running_loop().call_later(
+            self.ready_after,
+            self._mark_ready,
+            metadata["namespace"],
+            metadata["name"],
+            metadata["generation"],
+        )
+
+    def _mark_ready(self, namespace: str, name: str, generation: int) -> None:
+        key = (AGENT_GROUP, AGENT_VERSION, "agents")
+        current = self.objects[key].get((namespace, name))
+        if current is None or current["metadata"]["generation"] != generation:
+            return
+        obj = copy.deepcopy(current)
+        obj["status"] = {
+            "observedGeneration": generation,
+            "conditions": [
+                {
+                    "type": "Ready",
+                    "status": "True",
+                    "reason": "DeploymentReady",
+                    "message": "Deployment is ready",
+                    "observedGeneration": generation,
+                }
+            ],
+        }
+        self.put(key, obj)
+
+    async def _watch(
+        self, request: web.Request, key: tuple[str, str, str], namespace: str | None
+    ) -> web.StreamResponse:
+        since = int(request.query.get("resourceVersion") or self._resource_version)
+        timeout = float(request.query.get("timeoutSeconds") or 1800)
+        bookmarks = request.query.get("allowWatchBookmarks") in ("true", "True", "1")
+        deadline = time.monotonic() + timeout
+
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+
+        async def send(event_type: str, obj: dict[str, Any]) -> None:
+            line = json.dumps({"type": event_type, "object": obj}) + "\n"
+            await response.write(line.encode())
+
+        oldest = self.events[0][0] if self.events else self._resource_version + 1
+        if self.events and since < oldest - 1:
+            await send(
+                "ERROR",
+                {
+                    "kind": "Status",
+                    "apiVersion": "v1",
+                    "status": "Failure",
+                    "message": f"too old resource version: {since} ({oldest - 1})",
+                    "reason": "Expired",
+                    "code": 410,
+                },
+            )
+            return response
+
+        try:
+            await self._stream_events(key, namespace, since, deadline, bookmarks, send)
+        except ConnectionResetError:
+            pass  # The client closed the watch
+        return response
+
+    async def _stream_events(
+        self,
+        key: tuple[str, str, str],
+        namespace: str | None,
+        since: int,
+        deadline: float,
+        bookmarks: bool,
+        send: Any,
+    ) -> None:
+        while True:
+            # Taken before sending, so writes made while sending wake us again
+            changed = self._changed
+            for resource_version, event_key, event_type, obj in self._events_since(
+                since
+            ):
+                if event_key != key:
+                    continue
+                if (
+                    namespace is not None
+                    and obj["metadata"].get("namespace") != namespace
+                ):
+                    continue
+                await send(event_type, obj)
+                since = resource_version
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(
+                    changed.wait(), min(remaining, self.bookmark_interval)
+                )
+            except asyncio.TimeoutError:
+                if bookmarks:
+                    since = max(since, self._resource_version)
+                    group, version, _ = key
+                    await send(
+                        "BOOKMARK",
+                        {
+                            "kind": RESOURCES[key]["kind"],
+                            "apiVersion": "/".join(filter(None, (group, version))),
+                            "metadata": {"resourceVersion": str(since)},
+                        },
+                    )
@@ -0,0 +1,198 @@
+"""TTL result cache with single-flight for read-only tools.
+
+Read-only tools opt in with the ``cached`` decorator, re-exported by
+``core.server``, placed below ``@mcp.tool()``:
+
+    @mcp.tool()
+    @cached(ttl=5.0, tags=("agents",))
+    async def list_available_agents(...) -> str:
+
+Results are keyed by the tool's bound arguments and kept for ``ttl`` seconds,
+with the least recently used entry evicted once ``maxsize`` is reached.
+Identical calls that arrive while one is already running await that call
+instead of repeating it. Tools that change state call ``invalidate(tag)`` so
+that readers never serve a result older than the change, and the agent
+catalog invalidates ``"agents"`` on every change it sees, including those
+made outside this process.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .metrics import get_tool_metrics
+from .utils import get_tool_config
+
+logger = logging.getLogger(__name__)
+
+_caches: dict[str, "ResultCache"] = {}
+
+
+class ResultCache:
+    """Bounded TTL cache with in-flight call coalescing for one tool."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int, tags: tuple[str, ...] = ()):
+        """Initialize an empty cache.
+
+        Args:
+            name: Tool name, used for metrics and ``cache_ttl`` config lookups
+            ttl: Default seconds a result stays valid
+            maxsize: Maximum number of cached results
+            tags: Invalidation tags this cache belongs to
+        """
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tags = tags
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, result: str) -> None:
+        get_tool_metrics().cache_requests.labels(self.name, result).inc()
+
+    async def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        cache_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached result for ``key``, computing it at most once.
+
+        Args:
+            key: Normalized call arguments
+            call: Produces the result on a miss
+            cache_if: Only results for which this returns True are stored
+
+        Returns:
+            The cached, shared or freshly computed result
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if time.monotonic() < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count("hit")
+                return value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            self._count("coalesced")
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        self._count("miss")
+        generation = self._generation
+        # A task, so waiters still get the result if the first caller is cancelled
+        task = asyncio.ensure_future(call())
+        self._inflight[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+        if generation == self._generation and (cache_if is None or cache_if(value)):
+            ttl = get_tool_config(self.name).get("cache_ttl", self.ttl)
+            if ttl > 0:
+                self._entries[key] = (time.monotonic() + ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry; calls already running will not be stored."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and size of the cache."""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+
+def _cache_key(
+    signature: inspect.Signature, args: tuple, kwargs: dict[str, Any]
+) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return json.dumps(bound.arguments, sort_keys=True, default=str)
+
+
+def cached(
+    ttl: float = 5.0,
+    maxsize: int = 256,
+    tags: tuple[str, ...] = (),
+    cache_if: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Cache the results of an async, read-only tool.
+
+    The TTL can be overridden per tool with ``cache_ttl`` in kmcp.yaml; 0
+    disables caching while still coalescing concurrent calls.
+
+    Args:
+        ttl: Seconds a result stays valid
+        maxsize: Maximum number of distinct argument sets kept
+        tags: Names under which invalidate() clears this cache
+        cache_if: Only results for which this returns True are stored, so
+            error responses are not served to later callers
+
+    Returns:
+        Decorator that keeps the tool's signature for schema generation
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        if not inspect.iscoroutinefunction(fn):
+            raise TypeError(f"cached() requires an async function, got {fn.__name__}")
+
+        cache = ResultCache(fn.__name__, ttl, maxsize, tags)
+        _caches[fn.__name__] = cache
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _cache_key(signature, args, kwargs)
+            return await cache.get_or_call(key, lambda: fn(*args, **kwargs), cache_if)
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*tags: str) -> None:
+    """Clear the caches of every tool registered under any of ``tags``."""
+    for cache in _caches.values():
+        if any(tag in cache.tags for tag in tags):
+            cache.clear()
+            logger.debug(f"Invalidated cached results of {cache.name}")
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Counters of every tool cache, keyed by tool name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,543 @@
+"""Watch-backed in-memory catalog of kagent Agent custom resources.
+
+The catalog follows the Kubernetes informer pattern: a single LIST seeds the
+cache and records the collection's resourceVersion, then a WATCH started from
+that version applies incremental ADDED/MODIFIED/DELETED events. BOOKMARK
+events only advance the resourceVersion. When the API server reports that the
+version is too old (410 Gone) the catalog relists from scratch.
+
+Tools read the cached agents from memory instead of issuing a cluster-wide
+LIST on every call. The catalog also keeps a BM25 search index over the
+agents (see core.search) and an inverted index of their label keys, both
+updated with every event.
+
+Agents are sharded by namespace. The control plane manages the namespaces
+listed in AGENT_NAMESPACES, or only NAMESPACE when that is not set, and runs
+one catalog per namespace with a namespaced LIST/WATCH. A lookup touches only
+the caller's shard, and the control plane needs RBAC rights only in the
+namespaces it manages.
+"""
+
+import asyncio
+import base64
+import bisect
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+from kubernetes_asyncio import client, watch
+from kubernetes_asyncio.client.rest import ApiException
+
+from .cache import invalidate
+from .search import AgentSearchIndex
+
+AGENT_GROUP = "kagent.dev"
+AGENT_VERSION = "v1alpha2"
+AGENT_PLURAL = "agents"
+DEFAULT_NAMESPACE = "kagent"
+
+_TOKEN_PREFIX = "catalog:"
+
+logger = logging.getLogger(__name__)
+
+
+def is_catalog_token(token: str | None) -> bool:
+    """Whether a continue token was issued by ``AgentCatalog.page``."""
+    if not token:
+        return False
+    try:
+        decoded = base64.urlsafe_b64decode(token.encode()).decode()
+        return decoded.startswith(_TOKEN_PREFIX)
+    except ValueError:
+        return False
+
+
+class AgentCatalog:
+    """In-memory, watch-maintained view of all Agent custom resources."""
+
+    def __init__(
+        self,
+        watch_timeout: int = 300,
+        max_staleness: float = 600.0,
+        retry_delay: float = 5.0,
+        namespace: str | None = None,
+    ):
+        """Initialize an empty catalog.
+
+        Args:
+            namespace: Namespace to watch, every namespace if None
+            watch_timeout: Server-side timeout for each WATCH request in seconds
+            max_staleness: Seconds without contact with the API server after
+                which the cached data is considered stale
+            retry_delay: Seconds to wait before retrying a failed LIST/WATCH
+        """
+        self.watch_timeout = watch_timeout
+        self.max_staleness = max_staleness
+        self.retry_delay = retry_delay
+        self.namespace = namespace
+
+        self._agents: dict[str, dict[str, Any]] = {}
+        self.index = AgentSearchIndex()
+        self._label_index: dict[str, set[str]] = {}
+        self._changed = asyncio.Event()
+        self._resource_version: str | None = None
+        self._synced = False
+        self._last_sync: float | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._api_client: client.ApiClient | None = None
+
+        self.relist_count = 0
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    @staticmethod
+    def _key(item: dict[str, Any]) -> str:
+        metadata = item.get("metadata", {})
+        return f"{metadata.get('namespace', '')}/{metadata.get('name', '')}"
+
+    @property
+    def resource_version(self) -> str | None:
+        """The last resourceVersion observed from the API server."""
+        return self._resource_version
+
+    @property
+    def synced(self) -> bool:
+        """Whether the initial LIST has completed."""
+        return self._synced
+
+    def age(self) -> float | None:
+        """Seconds since the catalog last heard from the API server."""
+        if self._last_sync is None:
+            return None
+        return time.monotonic() - self._last_sync
+
+    def is_stale(self) -> bool:
+        """Whether the cached data should not be trusted for reads."""
+        age = self.age()
+        return not self._synced or age is None or age > self.max_staleness
+
+    def status(self) -> dict[str, Any]:
+        """Summarize the catalog state for diagnostics."""
+        age = self.age()
+        return {
+            "namespace": self.namespace,
+            "running": self.running,
+            "synced": self._synced,
+            "stale": self.is_stale(),
+            "age_seconds": round(age, 3) if age is not None else None,
+            "resource_version": self._resource_version,
+            "agent_count": len(self._agents),
+            "relist_count": self.relist_count,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the background LIST/WATCH loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def list_agents(self) -> list[dict[str, Any]]:
+        """Return the cached Agent objects."""
+        return list(self._agents.values())
+
+    def get(self, namespace: str, name: str) -> dict[str, Any] | None:
+        """Return one cached agent, or None if it is not in the catalog."""
+        return self._agents.get(f"{namespace}/{name}")
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[dict[str, Any], float]]:
+        """Rank the cached agents against a free-text query.
+
+        Args:
+            query: Topic or task description
+            top_k: Maximum number of results
+
+        Returns:
+            (agent, BM25 score) pairs, best first
+        """
+        return [
+            (self._agents[key], score) for key, score in self.index.search(query, top_k)
+        ]
+
+    def select(
+        self, label_keys: list[str], match_all: bool = False
+    ) -> list[dict[str, Any]]:
+        """Return the cached agents carrying the given label keys.
+
+        Args:
+            label_keys: Label keys to look for, whatever their values
+            match_all: Require every key instead of any of them
+
+        Returns:
+            Matching agents in stable key order
+        """
+        sets = [self._label_index.get(label, set()) for label in label_keys]
+        if not sets:
+            return []
+        keys = set.intersection(*sets) if match_all else set.union(*sets)
+        return [self._agents[key] for key in sorted(keys)]
+
+    def page(
+        self, limit: int, continue_token: str | None = None
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of cached agents in stable key order.
+
+        Args:
+            limit: Maximum number of agents to return
+            continue_token: Token returned with the previous page
+
+        Returns:
+            The agents on this page and the token for the next one, or None
+            when this is the last page
+
+        Raises:
+            ValueError: If the continue token was not issued by the catalog
+        """
+        keys = sorted(self._agents)
+        start = 0
+        if continue_token:
+            try:
+                after = base64.urlsafe_b64decode(continue_token.encode()).decode()
+            except ValueError as e:
+                raise ValueError(f"Invalid continue token: {continue_token}") from e
+            if not after.startswith(_TOKEN_PREFIX):
+                raise ValueError(f"Invalid continue token: {continue_token}")
+            start = bisect.bisect_right(keys, after[len(_TOKEN_PREFIX):])
+
+        chunk = keys[start : start + limit]
+        next_token = None
+        if chunk and start + limit < len(keys):
+            next_token = base64.urlsafe_b64encode(
+                f"{_TOKEN_PREFIX}{chunk[-1]}".encode()
+            ).decode()
+        return [self._agents[key] for key in chunk], next_token
+
+    def replace(
+        self, items: list[dict[str, Any]], resource_version: str | None
+    ) -> None:
+        """Replace the cache contents with the result of a LIST.
+
+        Args:
+            items: Agent objects returned by the LIST
+            resource_version: The list's metadata.resourceVersion
+        """
+        self._agents = {self._key(item): item for item in items}
+        self.index.rebuild(self._agents)
+        self._label_index = {}
+        for key, item in self._agents.items():
+            self._index_labels(key, item)
+        self._resource_version = resource_version
+        self._synced = True
+        self._touch()
+        self._notify()
+
+    def apply_event(self, event_type: str, obj: dict[str, Any]) -> None:
+        """Apply a single WATCH event to the cache.
+
+        Args:
+            event_type: ADDED, MODIFIED, DELETED or BOOKMARK
+            obj: The raw object carried by the event
+        """
+        resource_version = obj.get("metadata", {}).get("resourceVersion")
+
+        if event_type in ("ADDED", "MODIFIED"):
+            key = self._key(obj)
+            previous = self._agents.get(key)
+            if previous is not None:
+                self._unindex_labels(key, previous)
+            self._agents[key] = obj
+            self.index.add(key, obj)
+            self._index_labels(key, obj)
+        elif event_type == "DELETED":
+            key = self._key(obj)
+            previous = self._agents.pop(key, None)
+            if previous is not None:
+                self._unindex_labels(key, previous)
+            self.index.remove(key)
+        elif event_type != "BOOKMARK":
+            logger.warning(f"Ignoring unknown agent watch event type: {event_type}")
+            return
+
+        if resource_version:
+            self._resource_version = resource_version
+        self._touch()
+        if event_type != "BOOKMARK":
+            self._notify()
+
+    def _index_labels(self, key: str, item: dict[str, Any]) -> None:
+        for label in item.get("metadata", {}).get("labels") or {}:
+            self._label_index.setdefault(label, set()).add(key)
+
+    def _unindex_labels(self, key: str, item: dict[str, Any]) -> None:
+        for label in item.get("metadata", {}).get("labels") or {}:
+            keys = self._label_index.get(label)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._label_index[label]
+
+    def _notify(self) -> None:
+        # Cached listings predate this change, whoever made it
+        invalidate("agents")
+        # Wake everything blocked in wait_for(); later waiters get a new event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _touch(self) -> None:
+        self._last_sync = time.monotonic()
+
+    async def start(self, api_client: client.ApiClient) -> None:
+        """Start the background LIST/WATCH loop.
+
+        Args:
+            api_client: Shared API client used for the LIST and WATCH requests
+        """
+        if self.running:
+            return
+
+        self._api_client = api_client
+        self._task = asyncio.create_task(self._run(), name="agent-catalog")
+        logger.info("Agent catalog started")
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._api_client = None
+
+    async def wait_synced(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the initial LIST to complete."""
+        deadline = time.monotonic() + timeout
+        while not self._synced and self.running and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self._synced
+
+    async def wait_for(
+        self,
+        namespace: str,
+        name: str,
+        predicate: Callable[[dict[str, Any] | None], bool],
+        timeout: float,
+        on_change: Callable[[dict[str, Any] | None], Awaitable[None]] | None = None,
+    ) -> dict[str, Any] | None:
+        """Wait until an agent's cached state satisfies ``predicate``.
+
+        The catalog is driven by WATCH events, so this waits on those events
+        rather than polling the API server.
+
+        Args:
+            namespace: Agent namespace
+            name: Agent name
+            predicate: Called with the agent, or None while it does not exist
+            timeout: Maximum seconds to wait
+            on_change: Awaited with every new version of the agent, including
+                the current one
+
+        Returns:
+            The agent as last seen, whether or not the predicate was met
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        last: dict[str, Any] | None = None
+        first = True
+        while True:
+            changed = self._changed
+            item = self.get(namespace, name)
+            if first or item is not last:
+                first = False
+                last = item
+                if on_change is not None:
+                    await on_change(item)
+            if predicate(item):
+                return item
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return item
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self) -> None:
+        custom_api = client.CustomObjectsApi(self._api_client)
+
+        while True:
+            try:
+                if self._resource_version is None:
+                    await self._relist(custom_api)
+                await self._watch(custom_api)
+            except asyncio.CancelledError:
+                raise
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info("Agent watch expired (410 Gone), relisting")
+                    self._resource_version = None
+                    continue
+                logger.warning(f"Agent catalog API error: {e.status} {e.reason}")
+                await asyncio.sleep(self.retry_delay)
+            except Exception as e:
+                logger.warning(f"Agent catalog watch failed: {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    def _list_call(
+        self, custom_api: client.CustomObjectsApi
+    ) -> tuple[Callable[..., Awaitable[Any]], dict[str, Any]]:
+        """The LIST method and arguments for the watched namespace or the cluster."""
+        kwargs: dict[str, Any] = {
+            "group": AGENT_GROUP,
+            "version": AGENT_VERSION,
+            "plural": AGENT_PLURAL,
+        }
+        if self.namespace is None:
+            return custom_api.list_cluster_custom_object, kwargs
+        return custom_api.list_namespaced_custom_object, {
+            **kwargs,
+            "namespace": self.namespace,
+        }
+
+    async def _relist(self, custom_api: client.CustomObjectsApi) -> None:
+        list_method, kwargs = self._list_call(custom_api)
+        response = await list_method(**kwargs)
+        resource_version = response.get("metadata", {}).get("resourceVersion")
+        self.replace(response.get("items", []), resource_version)
+        self.relist_count += 1
+        logger.info(
+            f"Agent catalog listed {len(self._agents)} agents in "
+            f"{self.namespace or 'all namespaces'} "
+            f"at resourceVersion {resource_version}"
+        )
+
+    async def _watch(self, custom_api: client.CustomObjectsApi) -> None:
+        stream = watch.Watch()
+        list_method, kwargs = self._list_call(custom_api)
+        try:
+            async for event in stream.stream(
+                list_method,
+                **kwargs,
+                resource_version=self._resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=self.watch_timeout,
+            ):
+                self.apply_event(event["type"], event["raw_object"])
+        finally:
+            await stream.close()
+
+        # A watch that ends on its server-side timeout was in sync until now.
+        self._touch()
+
+
+def default_namespace() -> str:
+    """Namespace used when a caller does not name one."""
+    return os.getenv("NAMESPACE", DEFAULT_NAMESPACE)
+
+
+def managed_namespaces() -> list[str]:
+    """Namespaces this control plane manages agents in, from AGENT_NAMESPACES."""
+    configured = os.getenv("AGENT_NAMESPACES", "")
+    namespaces = [ns.strip() for ns in configured.split(",") if ns.strip()]
+    return list(dict.fromkeys(namespaces)) or [default_namespace()]
+
+
+def resolve_namespace(namespace: str | None = None) -> str:
+    """Validate a caller's namespace, defaulting to default_namespace().
+
+    Raises:
+        ValueError: If the namespace is not managed by this control plane
+    """
+    namespaces = managed_namespaces()
+    if namespace is None or not namespace.strip():
+        default = default_namespace()
+        return default if default in namespaces else namespaces[0]
+    if namespace not in namespaces:
+        raise ValueError(
+            f"namespace '{namespace}' is not managed by this control plane; "
+            f"expected one of {namespaces}"
+        )
+    return namespace
+
+
+class CatalogShards:
+    """One AgentCatalog per managed namespace."""
+
+    def __init__(self, namespaces: list[str], **catalog_options: Any):
+        """Create an empty shard for every namespace.
+
+        Args:
+            namespaces: Namespaces to watch
+            catalog_options: Passed on to every AgentCatalog
+        """
+        self._shards = {
+            namespace: AgentCatalog(namespace=namespace, **catalog_options)
+            for namespace in namespaces
+        }
+
+    def __iter__(self) -> Iterator[AgentCatalog]:
+        return iter(self._shards.values())
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self)
+
+    @property
+    def namespaces(self) -> list[str]:
+        """The watched namespaces."""
+        return list(self._shards)
+
+    @property
+    def running(self) -> bool:
+        """Whether any shard's LIST/WATCH loop is active."""
+        return any(shard.running for shard in self)
+
+    def shard(self, namespace: str) -> AgentCatalog:
+        """The catalog of one namespace.
+
+        Raises:
+            ValueError: If the namespace is not watched
+        """
+        shard = self._shards.get(namespace)
+        if shard is None:
+            raise ValueError(
+                f"namespace '{namespace}' is not managed by this control plane"
+            )
+        return shard
+
+    def status(self) -> dict[str, Any]:
+        """Summarize every shard for diagnostics."""
+        return {namespace: shard.status() for namespace, shard in self._shards.items()}
+
+    async def start(self, api_client: client.ApiClient) -> None:
+        """Start the LIST/WATCH loop of every shard."""
+        for shard in self:
+            await shard.start(api_client)
+
+    async def stop(self) -> None:
+        """Stop every shard."""
+        await asyncio.gather(*(shard.stop() for shard in self))
+
+
+_shards: CatalogShards | None = None
+
+
+def get_catalog_shards() -> CatalogShards:
+    """Get the process-wide catalog shards, one per managed namespace."""
+    global _shards
+    if _shards is None:
+        _shards = CatalogShards(managed_namespaces())
+    return _shards
+
+
+def get_agent_catalog(namespace: str | None = None) -> AgentCatalog:
+    """Get the process-wide agent catalog of a namespace.
+
+    Args:
+        namespace: Managed namespace, default_namespace() if None
+
+    Raises:
+        ValueError: If the namespace is not managed by this control plane
+    """
+    return get_catalog_shards().shard(resolve_namespace(namespace))
@@ -0,0 +1,354 @@
+"""Scale-to-zero of idle agents.
+
+Every deployed agent keeps its template-agent deployment running whether or
+not anyone talks to it. The idle reconciler records when each agent was last
+used and, on every pass over the catalog, scales agents unused for longer
+than ``idle_after`` seconds to zero replicas by setting
+``spec.byo.deployment.replicas`` on the Agent. The kagent controller then
+removes the pods. touch_agent marks an agent as used and brings a cold agent
+back with the replica count it had before.
+
+Only agents deployed by the control plane, which carry its
+``app.kubernetes.io/managed-by`` label, are scaled down, unless they are
+annotated ``agent-control-plane/idle-scaling: disabled``. Other agents, such
+as the orchestrator, are left alone unless annotated
+``agent-control-plane/idle-scaling: enabled``. Deploying or updating an agent
+counts as a use, and the orchestrator calls touch_agent for every agent it
+routes a conversation to.
+
+Usage is kept in memory and written to the ``agent-control-plane/last-used``
+annotation at most once per pass, so a restarted control plane does not take
+busy agents for idle ones. Metadata-only patches do not change an agent's
+generation and do not restart it. Agents without a recorded use count as used
+when the reconciler started, which gives existing fleets one full idle period
+before the first scale-down.
+
+Uses are only seen by the process that records them, so the reconciler does
+not run when the server has several workers; touch_agent still wakes cold
+agents there.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from .cache import invalidate
+from .catalog import (
+    AGENT_GROUP,
+    AGENT_PLURAL,
+    AGENT_VERSION,
+    get_agent_catalog,
+    managed_namespaces,
+)
+from .deploy import FIELD_MANAGER, MANAGED_BY_LABEL
+from .metrics import get_tool_metrics
+from .utils import get_kube_client, get_tool_config, worker_count
+from .views import agent_replicas, agent_state
+
+LAST_USED_ANNOTATION = "agent-control-plane/last-used"
+REPLICAS_ANNOTATION = "agent-control-plane/replicas"
+IDLE_SCALING_ANNOTATION = "agent-control-plane/idle-scaling"
+
+DEFAULT_IDLE_AFTER = 86400.0
+DEFAULT_INTERVAL = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def format_time(timestamp: float) -> str:
+    """Encode a Unix timestamp as an RFC 3339 UTC string."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+def parse_time(value: str | None) -> float | None:
+    """Decode an RFC 3339 string, None if it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def scales_when_idle(item: dict[str, Any]) -> bool:
+    """Whether an agent may be scaled to zero when idle.
+
+    BYO agents deployed by the control plane qualify unless they opt out
+    with the idle-scaling annotation; other BYO agents only if they opt in.
+    """
+    if "byo" not in (item.get("spec") or {}):
+        return False
+    metadata = item.get("metadata", {})
+    setting = (metadata.get("annotations") or {}).get(IDLE_SCALING_ANNOTATION)
+    if setting in ("enabled", "disabled"):
+        return setting == "enabled"
+    return (metadata.get("labels") or {}).get(MANAGED_BY_LABEL) == FIELD_MANAGER
+
+
+class IdleReconciler:
+    """Tracks agent usage and scales idle agents to zero."""
+
+    def __init__(
+        self,
+        idle_after: float = DEFAULT_IDLE_AFTER,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        """Initialize the reconciler.
+
+        Args:
+            idle_after: Default seconds without use before an agent is scaled
+                to zero, overridable with ``idle_after`` in kmcp.yaml; 0
+                disables scaling down
+            interval: Default seconds between passes, overridable with
+                ``reconcile_interval`` in kmcp.yaml
+        """
+        self.idle_after = idle_after
+        self.interval = interval
+        self.started_at = time.time()
+        self._last_used: dict[tuple[str, str], float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def _config(self) -> tuple[float, float]:
+        config = get_tool_config("touch_agent")
+        return (
+            float(config.get("idle_after", self.idle_after)),
+            float(config.get("reconcile_interval", self.interval)),
+        )
+
+    def touch(self, namespace: str, name: str, now: float | None = None) -> float:
+        """Record a use of an agent.
+
+        Returns:
+            The recorded time
+        """
+        now = time.time() if now is None else now
+        self._last_used[(namespace, name)] = now
+        return now
+
+    def last_used(self, item: dict[str, Any]) -> float:
+        """When an agent was last used, as far as this process knows."""
+        metadata = item.get("metadata", {})
+        annotations = metadata.get("annotations") or {}
+        return max(
+            self._last_used.get(
+                (metadata.get("namespace", ""), metadata.get("name", "")), 0.0
+            ),
+            parse_time(annotations.get(LAST_USED_ANNOTATION)) or 0.0,
+            parse_time(metadata.get("creationTimestamp")) or 0.0,
+            self.started_at,
+        )
+
+    async def wake(self, namespace: str, name: str) -> bool:
+        """Scale an agent back up if it is cold.
+
+        Returns:
+            True if the agent was cold and has been scaled up
+
+        Raises:
+            ApiException: If the patch is rejected
+        """
+        now = time.time()
+        catalog = get_agent_catalog(namespace)
+        item = None if catalog.is_stale() else catalog.get(namespace, name)
+        if item is None:
+            item = await self._read(namespace, name)
+        if agent_state(item) == "warm":
+            return False
+
+        annotations = item.get("metadata", {}).get("annotations") or {}
+        try:
+            replicas = max(1, int(annotations.get(REPLICAS_ANNOTATION, 1)))
+        except ValueError:
+            replicas = 1
+        await self._patch(
+            namespace,
+            name,
+            {
+                "metadata": {
+                    "annotations": {
+                        LAST_USED_ANNOTATION: format_time(now),
+                        REPLICAS_ANNOTATION: None,
+                    }
+                },
+                "spec": {"byo": {"deployment": {"replicas": replicas}}},
+            },
+        )
+        get_tool_metrics().agent_scaling.labels("up").inc()
+        logger.info(
+            f"Scaled idle agent {namespace}/{name} back to {replicas} replica(s)"
+        )
+        return True
+
+    async def reconcile(self, now: float | None = None) -> dict[str, int]:
+        """Make one pass over the catalog shards.
+
+        Warm agents idle for longer than ``idle_after`` are scaled to zero,
+        and uses recorded since the last pass are written to the agents'
+        annotations.
+
+        Returns:
+            Counts of agents ``scaled_down`` and ``recorded``
+        """
+        now = time.time() if now is None else now
+        idle_after, _ = self._config()
+        counts = {"scaled_down": 0, "recorded": 0}
+        seen = set()
+        for shard in managed_namespaces():
+            catalog = get_agent_catalog(shard)
+            if catalog.is_stale():
+                logger.warning(f"Agent catalog of {shard} is stale, skipping it")
+                seen.update(key for key in self._last_used if key[0] == shard)
+                continue
+            for item in catalog.list_agents():
+                metadata = item.get("metadata", {})
+                namespace, name = (
+                    metadata.get("namespace", ""),
+                    metadata.get("name", ""),
+                )
+                seen.add((namespace, name))
+                if not scales_when_idle(item):
+                    continue
+                try:
+                    if await self._reconcile_agent(item, now, idle_after):
+                        counts["scaled_down"] += 1
+                    elif await self._record_use(item):
+                        counts["recorded"] += 1
+                except Exception as e:
+                    logger.warning(
+                        f"Idle reconciliation of {namespace}/{name} failed: {e}"
+                    )
+        # Forget deleted agents
+        for key in self._last_used.keys() - seen:
+            del self._last_used[key]
+        return counts
+
+    async def _reconcile_agent(
+        self, item: dict[str, Any], now: float, idle_after: float
+    ) -> bool:
+        last_used = self.last_used(item)
+        if (
+            idle_after <= 0
+            or agent_state(item) == "cold"
+            or now - last_used <= idle_after
+        ):
+            return False
+        metadata = item["metadata"]
+        await self._scale_down(metadata["namespace"], metadata["name"], item, last_used)
+        return True
+
+    async def _record_use(self, item: dict[str, Any]) -> bool:
+        metadata = item["metadata"]
+        key = (metadata["namespace"], metadata["name"])
+        annotations = metadata.get("annotations") or {}
+        recorded = parse_time(annotations.get(LAST_USED_ANNOTATION))
+        last_used = self.last_used(item)
+        if key not in self._last_used or (
+            recorded is not None and int(last_used) <= int(recorded)
+        ):
+            return False
+        await self._patch(
+            *key,
+            {
+                "metadata": {
+                    "annotations": {LAST_USED_ANNOTATION: format_time(last_used)}
+                }
+            },
+        )
+        return True
+
+    async def _scale_down(
+        self, namespace: str, name: str, item: dict[str, Any], last_used: float
+    ) -> None:
+        replicas = agent_replicas(item) or 1
+        await self._patch(
+            namespace,
+            name,
+            {
+                "metadata": {
+                    "annotations": {
+                        LAST_USED_ANNOTATION: format_time(last_used),
+                        REPLICAS_ANNOTATION: str(replicas),
+                    }
+                },
+                "spec": {"byo": {"deployment": {"replicas": 0}}},
+            },
+        )
+        get_tool_metrics().agent_scaling.labels("down").inc()
+        since = format_time(last_used)
+        logger.info(f"Scaled agent {namespace}/{name} to zero, idle since {since}")
+
+    async def _read(self, namespace: str, name: str) -> dict[str, Any]:
+        custom_api = await get_kube_client().custom_objects()
+        return await custom_api.get_namespaced_custom_object(
+            group=AGENT_GROUP,
+            version=AGENT_VERSION,
+            namespace=namespace,
+            plural=AGENT_PLURAL,
+            name=name,
+        )
+
+    async def _patch(self, namespace: str, name: str, body: dict[str, Any]) -> None:
+        dynamic_client = await get_kube_client().dynamic()
+        api_resource = await dynamic_client.resources.get(
+            api_version=f"{AGENT_GROUP}/{AGENT_VERSION}", kind="Agent"
+        )
+        await dynamic_client.patch(
+            resource=api_resource,
+            body=body,
+            name=name,
+            namespace=namespace,
+            content_type="application/merge-patch+json",
+        )
+        invalidate("agents")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Idle reconciliation failed: {e}")
+            _, interval = self._config()
+            await asyncio.sleep(interval)
+
+    async def start(self) -> None:
+        """Start the background reconciliation loop."""
+        if self.running:
+            return
+        if worker_count() > 1:
+            logger.warning(
+                "Idle agent reconciler disabled: each of several workers would "
+                "only see its own agent uses"
+            )
+            return
+        self.started_at = time.time()
+        self._task = asyncio.create_task(self._run(), name="idle-reconciler")
+        logger.info("Idle agent reconciler started")
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_idle_reconciler = IdleReconciler()
+
+
+def get_idle_reconciler() -> IdleReconciler:
+    """Get the process-wide idle reconciler."""
+    return _idle_reconciler
@@ -0,0 +1,259 @@
+"""Background deploy jobs with readiness tracking.
+
+A synchronous deploy holds the caller's MCP request open until every API
+write returns, and still cannot say whether the agent's deployment came up.
+A deploy job returns an id at once. A background task applies the agent's
+objects and then follows the agent through the catalog's WATCH events until
+its Ready condition turns True or the readiness timeout passes:
+
+    pending -> applying -> waiting -> ready
+                  |           |
+                  v           v
+                failed     timed_out
+
+Every transition is recorded with a timestamp, so get_deploy_status can show
+how far a rollout got. Finished jobs are kept up to a bounded number for
+later lookups.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from kubernetes_asyncio.client.rest import ApiException
+from kubernetes_asyncio.dynamic.exceptions import ResourceNotFoundError
+
+from .cache import invalidate
+from .catalog import get_agent_catalog
+from .deploy import deploy_agent
+from .idle import get_idle_reconciler
+from .manifests import DEFAULT_TEMPLATE_PATH
+from .utils import get_kube_client, get_tool_config
+from .views import agent_readiness
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_READY_TIMEOUT = 300.0
+DEFAULT_RETENTION = 1000
+
+FINAL_STATES = ("ready", "failed", "timed_out")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeployJob:
+    """One background deploy of an agent."""
+
+    id: str
+    name: str
+    namespace: str
+    state: str = "pending"
+    error: str | None = None
+    resource_versions: dict[str, str] = field(default_factory=dict)
+    readiness: dict[str, Any] | None = None
+    history: list[dict[str, Any]] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job reached a final state."""
+        return self.state in FINAL_STATES
+
+    def transition(self, state: str, message: str) -> None:
+        """Move to ``state`` and record why."""
+        self.state = state
+        self.history.append({"time": time.time(), "state": state, "message": message})
+        if self.done:
+            self.finished_at = time.time()
+        logger.info(f"Deploy job {self.id} ({self.name}): {state} - {message}")
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable view of the job."""
+        return {
+            "job_id": self.id,
+            "name": self.name,
+            "namespace": self.namespace,
+            "state": self.state,
+            "done": self.done,
+            "error": self.error,
+            "resource_versions": self.resource_versions,
+            "readiness": self.readiness,
+            "history": self.history,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class DeployJobManager:
+    """Runs deploy jobs in the background and keeps their status."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ready_timeout: float = DEFAULT_READY_TIMEOUT,
+        retention: int = DEFAULT_RETENTION,
+    ):
+        """Initialize the manager.
+
+        Args:
+            max_concurrency: Jobs applying objects at the same time
+            ready_timeout: Default seconds to wait for an agent to become
+                ready, overridable with ``ready_timeout`` in kmcp.yaml
+            retention: Finished jobs kept for status lookups
+        """
+        self.max_concurrency = max_concurrency
+        self.ready_timeout = ready_timeout
+        self.retention = retention
+        self._jobs: OrderedDict[str, DeployJob] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def running(self) -> int:
+        """Number of jobs that have not finished yet."""
+        return len(self._tasks)
+
+    def get(self, job_id: str) -> DeployJob | None:
+        """Look up a job by id."""
+        return self._jobs.get(job_id)
+
+    def submit(
+        self, name: str, description: str, skills: list[str], namespace: str
+    ) -> DeployJob:
+        """Start deploying an agent in the background.
+
+        Returns:
+            The new job, still pending
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        job = DeployJob(id=uuid.uuid4().hex[:12], name=name, namespace=namespace)
+        job.transition("pending", "Queued")
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(
+            self._run(job, description, skills), name=f"deploy-job-{job.id}"
+        )
+        self._prune()
+        return job
+
+    async def _run(self, job: DeployJob, description: str, skills: list[str]) -> None:
+        try:
+            assert self._semaphore is not None
+            async with self._semaphore:
+                job.transition(
+                    "applying", "Applying ServiceAccount, Role, RoleBinding and Agent"
+                )
+                try:
+                    dynamic_client = await get_kube_client().dynamic()
+                    job.resource_versions = await deploy_agent(
+                        dynamic_client, job.name, description, skills, job.namespace
+                    )
+                except FileNotFoundError:
+                    self._fail(job, f"{DEFAULT_TEMPLATE_PATH} not found.")
+                    return
+                except ResourceNotFoundError:
+                    self._fail(job, "Agent CRD is not installed.")
+                    return
+                except ApiException as e:
+                    self._fail(job, f"K8s API Error: {e.reason}")
+                    return
+                invalidate("agents")
+                get_idle_reconciler().touch(job.namespace, job.name)
+
+            timeout = get_tool_config("deploy_new_agent").get(
+                "ready_timeout", self.ready_timeout
+            )
+            job.transition(
+                "waiting", "Objects applied, waiting for the agent to become ready"
+            )
+            readiness = await wait_until_ready(job.namespace, job.name, timeout)
+            job.readiness = readiness
+            if readiness["ready"]:
+                job.transition("ready", readiness["message"] or "Agent is ready")
+            else:
+                job.transition(
+                    "timed_out", f"Not ready after {timeout:g}s: {readiness['reason']}"
+                )
+        except asyncio.CancelledError:
+            self._fail(job, "Cancelled")
+            raise
+        except Exception as e:
+            logger.exception(f"Deploy job {job.id} for {job.name} failed")
+            self._fail(job, str(e))
+        finally:
+            self._tasks.pop(job.id, None)
+
+    @staticmethod
+    def _fail(job: DeployJob, error: str) -> None:
+        job.error = error
+        job.transition("failed", error)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.retention)]:
+            del self._jobs[job_id]
+
+    async def stop(self) -> None:
+        """Cancel the jobs that are still running."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def wait_until_ready(
+    namespace: str,
+    name: str,
+    timeout: float,
+    on_change: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+) -> dict[str, Any]:
+    """Wait for an agent's Ready condition through the catalog's WATCH events.
+
+    Args:
+        namespace: Agent namespace
+        name: Agent name
+        timeout: Maximum seconds to wait
+        on_change: Awaited with the readiness summary whenever it changes
+
+    Returns:
+        The last readiness summary, see core.views.agent_readiness()
+    """
+    catalog = get_agent_catalog(namespace)
+    if not catalog.running:
+        return {
+            "ready": False,
+            "reason": "CatalogUnavailable",
+            "message": "The agent catalog is not watching the cluster",
+        }
+
+    last: dict[str, Any] = {}
+
+    async def changed(item: dict[str, Any] | None) -> None:
+        readiness = agent_readiness(item)
+        if readiness != last:
+            last.clear()
+            last.update(readiness)
+            if on_change is not None:
+                await on_change(readiness)
+
+    item = await catalog.wait_for(
+        namespace, name, lambda item: agent_readiness(item)["ready"], timeout, changed
+    )
+    return agent_readiness(item)
+
+
+_deploy_jobs = DeployJobManager()
+
+
+def get_deploy_jobs() -> DeployJobManager:
+    """Get the process-wide deploy job manager."""
+    return _deploy_jobs
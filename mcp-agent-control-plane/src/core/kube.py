@@ -0,0 +1,110 @@
+"""Process-wide Kubernetes client shared by all tools.
+
+Loading cluster credentials, opening TLS connections and downloading API
+discovery are expensive, so the server does them once per process and every
+tool reuses the same pooled ``kubernetes_asyncio`` client. Tools obtain it
+through ``core.utils.get_kube_client()``.
+"""
+
+import asyncio
+import logging
+import os
+
+from kubernetes_asyncio import client, config
+from kubernetes_asyncio.dynamic import DynamicClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAXSIZE = 32
+
+
+class KubeClient:
+    """Lazily connected, pooled Kubernetes API client."""
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        """Initialize a disconnected client.
+
+        Args:
+            pool_maxsize: Maximum number of concurrent connections to the API
+                server kept in the aiohttp pool
+        """
+        self.pool_maxsize = pool_maxsize
+        self._api_client: client.ApiClient | None = None
+        self._dynamic: DynamicClient | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Whether cluster credentials have been loaded."""
+        return self._api_client is not None
+
+    async def connect(self) -> client.ApiClient:
+        """Load cluster credentials once and open the shared connection pool.
+
+        Returns:
+            The shared ApiClient
+
+        Raises:
+            kubernetes_asyncio.config.ConfigException: If neither in-cluster
+                nor kube-config credentials are available
+        """
+        if self._api_client is not None:
+            return self._api_client
+
+        async with self._lock:
+            if self._api_client is None:
+                configuration = client.Configuration()
+                try:
+                    config.load_incluster_config(client_configuration=configuration)
+                    logger.info("Loaded in-cluster Kubernetes configuration")
+                except config.ConfigException:
+                    # Read KUBECONFIG now: the library only reads it at import
+                    await config.load_kube_config(
+                        config_file=os.environ.get("KUBECONFIG"),
+                        client_configuration=configuration,
+                    )
+                    logger.info("Loaded local kube-config")
+
+                # A single aiohttp session keeps connections alive between tool
+                # calls; the pool bounds how many requests run in parallel.
+                configuration.connection_pool_maxsize = self.pool_maxsize
+                self._api_client = client.ApiClient(configuration)
+
+        return self._api_client
+
+    async def api_client(self) -> client.ApiClient:
+        """Get the shared ApiClient, connecting on first use."""
+        return await self.connect()
+
+    async def custom_objects(self) -> client.CustomObjectsApi:
+        """Get a CustomObjectsApi bound to the shared client."""
+        return client.CustomObjectsApi(await self.connect())
+
+    async def core_v1(self) -> client.CoreV1Api:
+        """Get a CoreV1Api bound to the shared client."""
+        return client.CoreV1Api(await self.connect())
+
+    async def rbac_v1(self) -> client.RbacAuthorizationV1Api:
+        """Get an RbacAuthorizationV1Api bound to the shared client."""
+        return client.RbacAuthorizationV1Api(await self.connect())
+
+    async def dynamic(self) -> DynamicClient:
+        """Get the shared DynamicClient.
+
+        API discovery runs lazily the first time a resource kind is resolved
+        and is cached for the rest of the process.
+        """
+        if self._dynamic is None:
+            api_client = await self.connect()
+            async with self._lock:
+                if self._dynamic is None:
+                    self._dynamic = await DynamicClient(api_client)
+        return self._dynamic
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._api_client is not None:
+            await self._api_client.close()
+            logger.info("Kubernetes API client session closed.")
+        self._api_client = None
+        self._dynamic = None
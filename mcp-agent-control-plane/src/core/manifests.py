@@ -0,0 +1,174 @@
+"""Compiled, cached renderer for the Agent custom resource template.
+
+``agent-template.yaml`` is plain YAML whose string values may contain Jinja
+expressions such as ``"{{ name }}"``. The file is parsed once, and again only
+when its mtime changes, and every templated string is compiled to a Jinja
+template. Rendering walks the parsed tree and fills in the values, producing
+the Agent manifest as a Python dict without generating or re-parsing YAML.
+
+Values are inserted into an already-parsed tree, so descriptions and skill
+labels never pass through the YAML parser and need no escaping. A string that
+consists of a single expression, such as ``"{{ skills }}"``, is replaced by the
+value itself, which lets mappings and lists be injected.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import yaml
+from jinja2 import Environment
+
+DEFAULT_TEMPLATE_PATH = "agent-template.yaml"
+
+_WHOLE_EXPRESSION = re.compile(r"^\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}$")
+_INVALID_LABEL_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+_LABEL_EDGE_CHARS = "-_."
+_MAX_LABEL_LENGTH = 63
+
+RenderFn = Callable[[dict[str, Any]], Any]
+
+logger = logging.getLogger(__name__)
+
+
+def _label_value(text: str) -> str:
+    """Coerce text into a valid Kubernetes label value."""
+    value = _INVALID_LABEL_CHARS.sub("-", text.strip())
+    return value[:_MAX_LABEL_LENGTH].strip(_LABEL_EDGE_CHARS)
+
+
+def skill_labels(skills: list[str]) -> dict[str, str]:
+    """Build the ``skill-<kebab>`` labels stored on an Agent.
+
+    Args:
+        skills: Skill names as produced by the orchestrator
+
+    Distinct skills that sanitize to the same key, such as "ML Ops" and
+    "ml-ops", would overwrite each other's label; the first one is kept and
+    the collision is logged.
+
+    Returns:
+        Mapping of label keys to label values, both valid Kubernetes labels
+    """
+    labels = {}
+    sources = {}
+    for skill in skills:
+        value = _label_value(skill)
+        if not value:
+            continue
+        key = _label_value(f"skill-{value.lower()}")
+        if key in labels:
+            if skill.strip() != sources[key]:
+                logger.warning(
+                    f"Skills {sources[key]!r} and {skill!r} both map to label {key}; "
+                    f"keeping {sources[key]!r}"
+                )
+            continue
+        labels[key] = value
+        sources[key] = skill.strip()
+    return labels
+
+
+class ManifestRenderer:
+    """Renders a YAML template with Jinja placeholders into Python objects."""
+
+    def __init__(self, template_path: str = DEFAULT_TEMPLATE_PATH):
+        """Initialize the renderer.
+
+        Args:
+            template_path: Path to the YAML template
+        """
+        self.template_path = template_path
+        self._env = Environment()
+        self._render: RenderFn | None = None
+        self._mtime_ns: int | None = None
+        self._lock = threading.Lock()
+        self.load_count = 0
+
+    def render(self, **context: Any) -> Any:
+        """Render the template with the given variables.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist
+        """
+        return self._compiled()(context)
+
+    def _compiled(self) -> RenderFn:
+        mtime_ns = os.stat(self.template_path).st_mtime_ns
+        if self._render is None or mtime_ns != self._mtime_ns:
+            with self._lock:
+                if self._render is None or mtime_ns != self._mtime_ns:
+                    with open(self.template_path) as f:
+                        tree = yaml.safe_load(f)
+                    self._render = self._compile(tree)
+                    self._mtime_ns = mtime_ns
+                    self.load_count += 1
+        return self._render
+
+    def _compile(self, node: Any) -> RenderFn:
+        if isinstance(node, dict):
+            items = [(key, self._compile(value)) for key, value in node.items()]
+            return lambda ctx: {key: render(ctx) for key, render in items}
+
+        if isinstance(node, list):
+            renders = [self._compile(value) for value in node]
+            return lambda ctx: [render(ctx) for render in renders]
+
+        if isinstance(node, str) and ("{{" in node or "{%" in node):
+            match = _WHOLE_EXPRESSION.match(node)
+            if match:
+                variable = match.group(1)
+                return lambda ctx: _copy(ctx.get(variable))
+            template = self._env.from_string(node)
+            return lambda ctx: template.render(ctx)
+
+        return lambda ctx: node
+
+
+def _copy(value: Any) -> Any:
+    """Shallow-copy containers so rendered manifests never alias caller data."""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+_renderers: dict[str, ManifestRenderer] = {}
+
+
+def get_manifest_renderer(
+    template_path: str = DEFAULT_TEMPLATE_PATH,
+) -> ManifestRenderer:
+    """Get the process-wide renderer for a template file."""
+    renderer = _renderers.get(template_path)
+    if renderer is None:
+        renderer = _renderers.setdefault(template_path, ManifestRenderer(template_path))
+    return renderer
+
+
+def render_agent_manifest(
+    name: str,
+    description: str,
+    skills: list[str],
+    template_path: str = DEFAULT_TEMPLATE_PATH,
+) -> dict[str, Any]:
+    """Render the Agent custom resource for an agent.
+
+    Args:
+        name: Agent name
+        description: Agent description, inserted verbatim
+        skills: Skill names, stored as ``skill-*`` labels
+
+    Returns:
+        The Agent manifest as a dict
+
+    Raises:
+        FileNotFoundError: If the template file does not exist
+    """
+    return get_manifest_renderer(template_path).render(
+        name=name, description=description, skills=skill_labels(skills)
+    )
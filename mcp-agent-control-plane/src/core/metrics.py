@@ -0,0 +1,307 @@
+"""Per-tool call metrics.
+
+ToolMetricsMiddleware wraps every tool call and records, per tool, the call
+count, a latency histogram, the class of any error and the size of the
+request arguments and the response. Tools report most failures as strings
+rather than exceptions, so well-known error prefixes are classified too.
+
+Metrics live in a Prometheus registry that the HTTP transport serves on
+``/metrics``. In stdio mode there is nothing to scrape, so the same
+measurements can be pushed to an OpenTelemetry collector over OTLP when the
+optional ``otlp`` extra is installed.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from typing import Any
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from mcp import types as mt
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+OTLP_EXPORT_INTERVAL_MS = 15000
+
+# Error strings returned by the tools, mapped to the exception they stand for.
+_ERROR_RESPONSES = [
+    (re.compile(r"^(K8s API Error|Error connecting to cluster)"), "ApiException"),
+    (re.compile(r"^Error: (The CRD|Agent CRD)"), "ResourceNotFoundError"),
+    (re.compile(r"^Error: .* not found"), "FileNotFoundError"),
+    (re.compile(r"^Error:"), "InvalidRequest"),
+    (
+        re.compile(r"^(Deployment failed|General error|Unexpected error)"),
+        "UnexpectedError",
+    ),
+]
+
+logger = logging.getLogger(__name__)
+
+
+def classify_response(result: ToolResult) -> str | None:
+    """Error class of a tool result that reports a failure as text."""
+    for block in result.content:
+        if isinstance(block, mt.TextContent):
+            for pattern, error in _ERROR_RESPONSES:
+                if pattern.match(block.text):
+                    return error
+            return None
+    return None
+
+
+def response_size(result: ToolResult) -> int:
+    """Encoded size of a tool result's text and structured content in bytes."""
+    size = sum(
+        len(block.text.encode())
+        for block in result.content
+        if isinstance(block, mt.TextContent)
+    )
+    if result.structured_content is not None:
+        size += len(json.dumps(result.structured_content, default=str).encode())
+    return size
+
+
+class ToolMetrics:
+    """Prometheus instruments for tool calls, optionally mirrored to OTLP."""
+
+    def __init__(self, registry: CollectorRegistry | None = None):
+        """Create the instruments.
+
+        Args:
+            registry: Registry to register with, a private one if None
+        """
+        self.registry = registry or CollectorRegistry()
+        self.calls = Counter(
+            "mcp_tool_calls_total",
+            "Tool calls by outcome",
+            ["tool", "outcome"],
+            registry=self.registry,
+        )
+        self.errors = Counter(
+            "mcp_tool_errors_total",
+            "Failed tool calls by error class",
+            ["tool", "error"],
+            registry=self.registry,
+        )
+        self.latency = Histogram(
+            "mcp_tool_duration_seconds",
+            "Tool call latency inside the server",
+            ["tool"],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.request_bytes = Histogram(
+            "mcp_tool_request_bytes",
+            "Size of the JSON-encoded tool arguments",
+            ["tool"],
+            buckets=SIZE_BUCKETS,
+            registry=self.registry,
+        )
+        self.response_bytes = Histogram(
+            "mcp_tool_response_bytes",
+            "Size of the tool response content",
+            ["tool"],
+            buckets=SIZE_BUCKETS,
+            registry=self.registry,
+        )
+        self.cache_requests = Counter(
+            "mcp_tool_cache_requests_total",
+            "Lookups in tool result caches by result: hit, miss or coalesced",
+            ["tool", "result"],
+            registry=self.registry,
+        )
+        self.update_requests = Counter(
+            "mcp_agent_update_requests_total",
+            "Agent updates by result: written, or coalesced into another write",
+            ["result"],
+            registry=self.registry,
+        )
+        self.agent_scaling = Counter(
+            "mcp_agent_scaling_total",
+            "Idle agents scaled down to zero or back up on use",
+            ["direction"],
+            registry=self.registry,
+        )
+        self._meter_provider: Any = None
+        self._otel: dict[str, Any] = {}
+
+    def record(
+        self,
+        tool: str,
+        duration: float,
+        error: str | None,
+        request_bytes: int,
+        response_bytes: int | None,
+    ) -> None:
+        """Record one finished tool call.
+
+        Args:
+            tool: Tool name
+            duration: Wall time spent in the server, in seconds
+            error: Error class if the call failed
+            request_bytes: Size of the encoded arguments
+            response_bytes: Size of the response, None if there was none
+        """
+        outcome = "ok" if error is None else "error"
+        self.calls.labels(tool, outcome).inc()
+        self.latency.labels(tool).observe(duration)
+        self.request_bytes.labels(tool).observe(request_bytes)
+        if error is not None:
+            self.errors.labels(tool, error).inc()
+        if response_bytes is not None:
+            self.response_bytes.labels(tool).observe(response_bytes)
+
+        if self._otel:
+            attributes = {"tool": tool, "outcome": outcome}
+            self._otel["calls"].add(1, attributes)
+            self._otel["latency"].record(duration, {"tool": tool})
+            self._otel["request_bytes"].record(request_bytes, {"tool": tool})
+            if error is not None:
+                self._otel["errors"].add(1, {"tool": tool, "error": error})
+            if response_bytes is not None:
+                self._otel["response_bytes"].record(response_bytes, {"tool": tool})
+
+    def render(self) -> bytes:
+        """Encode the metrics in the Prometheus text format.
+
+        With several HTTP workers, PROMETHEUS_MULTIPROC_DIR is set and every
+        worker writes its samples there, so the totals of all of them are
+        reported whichever worker serves the scrape.
+        """
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            MultiProcessCollector(registry)
+            return generate_latest(registry)
+        return generate_latest(self.registry)
+
+    def enable_otlp(self, reader: Any = None) -> bool:
+        """Also export the measurements through OpenTelemetry.
+
+        The exporter is configured with the standard OTEL_EXPORTER_OTLP_*
+        environment variables.
+
+        Args:
+            reader: Metric reader to use instead of a periodic OTLP exporter
+
+        Returns:
+            False if the OpenTelemetry SDK or exporter is not installed
+        """
+        if self._meter_provider is not None:
+            return True
+        try:
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+            from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+
+            if reader is None:
+                from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
+                    OTLPMetricExporter,
+                )
+
+                reader = PeriodicExportingMetricReader(
+                    OTLPMetricExporter(),
+                    export_interval_millis=int(
+                        os.getenv(
+                            "OTEL_METRIC_EXPORT_INTERVAL", OTLP_EXPORT_INTERVAL_MS
+                        )
+                    ),
+                )
+        except ImportError as e:
+            logger.warning(f"OTLP metrics disabled, install the 'otlp' extra: {e}")
+            return False
+
+        service = os.getenv("OTEL_SERVICE_NAME", "mcp-agent-control-plane")
+        self._meter_provider = MeterProvider(
+            resource=Resource.create({SERVICE_NAME: service}), metric_readers=[reader]
+        )
+        meter = self._meter_provider.get_meter(__name__)
+        self._otel = {
+            "calls": meter.create_counter(
+                "mcp.tool.calls", description="Tool calls by outcome"
+            ),
+            "errors": meter.create_counter(
+                "mcp.tool.errors", description="Failed tool calls by error class"
+            ),
+            "latency": meter.create_histogram(
+                "mcp.tool.duration",
+                unit="s",
+                description="Tool call latency inside the server",
+            ),
+            "request_bytes": meter.create_histogram(
+                "mcp.tool.request.size",
+                unit="By",
+                description="Size of the tool arguments",
+            ),
+            "response_bytes": meter.create_histogram(
+                "mcp.tool.response.size",
+                unit="By",
+                description="Size of the tool response",
+            ),
+        }
+        logger.info("Exporting tool metrics over OTLP")
+        return True
+
+    def shutdown(self) -> None:
+        """Flush and stop the OTLP exporter, if enabled."""
+        if self._meter_provider is not None:
+            self._meter_provider.shutdown()
+            self._meter_provider = None
+            self._otel = {}
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records ToolMetrics for every tool call."""
+
+    def __init__(self, metrics: ToolMetrics):
+        """Initialize the middleware.
+
+        Args:
+            metrics: Instruments to record into
+        """
+        self.metrics = metrics
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        """Time the call and record its outcome and payload sizes."""
+        tool = context.message.name
+        request_bytes = len(
+            json.dumps(context.message.arguments or {}, default=str).encode()
+        )
+        started = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception as e:
+            # Tool exceptions arrive wrapped in a ToolError; report the original.
+            error = type(e.__cause__ or e).__name__
+            self.metrics.record(
+                tool, time.perf_counter() - started, error, request_bytes, None
+            )
+            raise
+
+        self.metrics.record(
+            tool,
+            time.perf_counter() - started,
+            classify_response(result),
+            request_bytes,
+            response_size(result),
+        )
+        return result
+
+
+_tool_metrics: ToolMetrics | None = None
+
+
+def get_tool_metrics() -> ToolMetrics:
+    """Get the process-wide tool metrics."""
+    global _tool_metrics
+    if _tool_metrics is None:
+        _tool_metrics = ToolMetrics()
+    return _tool_metrics
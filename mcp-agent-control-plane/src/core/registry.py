@@ -0,0 +1,174 @@
+"""Lazy tool registration backed by a schema manifest.
+
+Importing a tool module pulls in everything it depends on (Kubernetes
+clients, Jinja, YAML, pydantic models), yet a listing client only needs each
+tool's name, description and JSON schemas. The manifest stores exactly that
+for every tool file, keyed by the SHA-256 of the file's source, so the server
+can advertise a tool without importing it. The module is imported the first
+time one of its tools is called, and the real tool then takes the place of
+its placeholder.
+
+A manifest entry is only trusted while the file's digest matches. Files that
+changed since the manifest was written are imported eagerly and their entry
+is refreshed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import Tool, ToolResult
+from pydantic import PrivateAttr
+
+MANIFEST_FILENAME = "tool-manifest.json"
+MANIFEST_VERSION = 1
+
+# Tool attributes stored in the manifest: everything tools/list returns.
+_MANIFEST_FIELDS = {
+    "name",
+    "title",
+    "description",
+    "tags",
+    "meta",
+    "parameters",
+    "output_schema",
+    "annotations",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process, 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current RSS, in KiB on Linux and bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class ToolModule:
+    """State of one tool file known to the server."""
+
+    name: str
+    path: Path
+    digest: str
+    tool_names: list[str] = field(default_factory=list)
+    imported: bool = False
+
+
+class LazyTool(Tool):
+    """Placeholder for a tool whose module has not been imported yet.
+
+    It advertises the schemas recorded in the manifest. Running it imports
+    the module and runs the real tool.
+    """
+
+    module: str
+    _load: Callable[[], Tool] = PrivateAttr()
+
+    @classmethod
+    def from_manifest(
+        cls, module: str, entry: dict[str, Any], load: Callable[[], Tool]
+    ) -> "LazyTool":
+        """Build a placeholder from a manifest entry.
+
+        Args:
+            module: Name of the tool module that defines the tool
+            entry: Tool attributes as stored by ToolManifest
+            load: Imports the module and returns the real tool
+        """
+        tool = cls(module=module, **entry)
+        tool._load = load
+        return tool
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        """Import the tool's module, then run the real tool."""
+        tool = self._load()
+        if isinstance(tool, LazyTool):
+            raise ToolError(f"Tool module {self.module} did not register {self.name}")
+        return await tool.run(arguments)
+
+
+class ToolManifest:
+    """Schemas of every tool in a tools directory, keyed by source digest."""
+
+    def __init__(self, path: Path):
+        """Load the manifest if it exists.
+
+        Args:
+            path: Manifest file location
+        """
+        self.path = path
+        self.modules: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tool manifest {path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.modules = data.get("modules", {})
+
+    def tools_for(self, module: str, digest: str) -> list[dict[str, Any]] | None:
+        """Manifest entries of a module's tools, None if missing or stale."""
+        entry = self.modules.get(module)
+        if entry is None or entry.get("sha256") != digest:
+            return None
+        return entry["tools"]
+
+    def record(self, module: str, digest: str, tools: list[Tool]) -> None:
+        """Store the schemas of the tools a module registered."""
+        entry = {
+            "sha256": digest,
+            "tools": [
+                tool.model_dump(mode="json", include=_MANIFEST_FIELDS) for tool in tools
+            ],
+        }
+        if self.modules.get(module) != entry:
+            self.modules[module] = entry
+            self.dirty = True
+
+    def forget(self, module: str) -> None:
+        """Drop a module that no longer exists."""
+        if self.modules.pop(module, None) is not None:
+            self.dirty = True
+
+    def save(self) -> bool:
+        """Write the manifest if it changed.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.dirty:
+            return False
+        payload = {"version": MANIFEST_VERSION, "modules": self.modules}
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, indent=2, sort_keys=True))
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write tool manifest {self.path}: {e}")
+            return False
+        self.dirty = False
+        return True
@@ -0,0 +1,147 @@
+"""BM25 full-text index over Agent names, descriptions and skill labels.
+
+Routing an LLM prompt through every agent in the fleet costs tokens linearly
+in the fleet size. The index lets callers ask for the handful of agents that
+best match a topic instead. It is updated one agent at a time as the catalog
+applies WATCH events, so queries never rebuild it.
+
+Document statistics are kept per term (postings of term frequencies) and per
+document (length), so BM25 idf and length normalization are computed at query
+time from the current contents.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any
+
+SKILL_LABEL_PREFIX = "skill-"
+
+# Term frequency multiplier per field: a skill or name match says more about
+# an agent than a word in its description.
+FIELD_WEIGHTS = {"name": 2, "skills": 2, "description": 1}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Words that occur in nearly every description: they add almost nothing to a
+# score but make a query walk the postings of every agent.
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or that the their "
+    "this to with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric terms; kebab-case splits too."""
+    return [term for term in _TOKEN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def agent_terms(item: dict[str, Any]) -> Counter[str]:
+    """Weighted term frequencies of an Agent custom resource."""
+    metadata = item.get("metadata", {})
+    skills = [
+        key[len(SKILL_LABEL_PREFIX):]
+        for key in (metadata.get("labels") or {})
+        if key.startswith(SKILL_LABEL_PREFIX)
+    ]
+    fields = {
+        "name": metadata.get("name", ""),
+        "skills": " ".join(skills),
+        "description": item.get("spec", {}).get("description", ""),
+    }
+    terms: Counter[str] = Counter()
+    for field, text in fields.items():
+        for term in tokenize(text):
+            terms[term] += FIELD_WEIGHTS[field]
+    return terms
+
+
+class AgentSearchIndex:
+    """Incrementally maintained BM25 inverted index keyed by catalog key."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Strength of document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._terms: dict[str, Counter[str]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._terms
+
+    def add(self, key: str, item: dict[str, Any]) -> None:
+        """Index an agent, replacing any previous version of it."""
+        terms = agent_terms(item)
+        if self._terms.get(key) == terms:
+            return
+        self.remove(key)
+        self._terms[key] = terms
+        length = sum(terms.values())
+        self._lengths[key] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[key] = frequency
+
+    def remove(self, key: str) -> None:
+        """Drop an agent from the index, if present."""
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(key)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def rebuild(self, items: dict[str, dict[str, Any]]) -> None:
+        """Replace the index contents with ``items``, keyed by catalog key."""
+        for key in list(self._terms):
+            if key not in items:
+                self.remove(key)
+        for key, item in items.items():
+            self.add(key, item)
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[str, float]]:
+        """Rank indexed agents against a free-text query.
+
+        Args:
+            query: Topic or task description
+            top_k: Maximum number of results
+
+        Returns:
+            (key, score) pairs, best first; agents sharing no term with the
+            query are left out
+        """
+        count = len(self._terms)
+        if not self._total_length:
+            return []
+        # norm(d) = k1 * (1 - b + b * len(d) / average length)
+        norm_base = self.k1 * (1 - self.b)
+        norm_per_length = self.k1 * self.b * count / self._total_length
+        lengths = self._lengths
+
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            weight = math.log(1 + (count - df + 0.5) / (df + 0.5)) * (self.k1 + 1)
+            for key, frequency in postings.items():
+                norm = norm_base + norm_per_length * lengths[key]
+                score = weight * frequency / (frequency + norm)
+                scores[key] = scores.get(key, 0.0) + score
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda entry: entry[1])
@@ -2,18 +2,45 @@
 
 This server automatically discovers and loads tools from the tools directory.
 Each tool file should contain a function decorated with @mcp.tool().
+
+With lazy loading enabled, tools whose schemas are recorded in the tool
+manifest are registered without importing their modules; see core.registry.
+With reloading enabled, edited tool files are re-imported while the server
+runs.
 """
 
+import asyncio
 import importlib.util
 import logging
+import os
 import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 from fastmcp import FastMCP
-
-from .utils import load_config
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import Tool
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .cache import cached, invalidate  # noqa: F401  (re-exported for tools)
+from .metrics import ToolMetricsMiddleware, get_tool_metrics
+from .registry import (
+    MANIFEST_FILENAME,
+    LazyTool,
+    ToolManifest,
+    ToolModule,
+    file_digest,
+    rss_bytes,
+)
+from .utils import get_config_service
 
 # Global FastMCP instance for tools to import
 mcp: FastMCP = FastMCP(name="Dynamic Server")
@@ -22,31 +49,93 @@ mcp: FastMCP = FastMCP(name="Dynamic Server")
 class DynamicMCPServer:
     """MCP server with dynamic tool loading capabilities."""
 
-    def __init__(self, name: str, tools_dir: str = "src/tools"):
+    def __init__(
+        self,
+        name: str,
+        tools_dir: str = "src/tools",
+        lazy: bool = False,
+        reload: bool = False,
+        reload_interval: float = 1.0,
+    ):
         """Initialize the dynamic MCP server.
 
         Args:
             name: Server name
             tools_dir: Directory containing tool files
+            lazy: Register tools from the tool manifest and import their
+                modules on first call
+            reload: Re-import tool files that change while the server runs
+            reload_interval: Seconds between checks for changed tool files
         """
         global mcp
         self.name = name
         self.tools_dir = Path(tools_dir)
+        self.lazy = lazy
+        self.reload = reload
+        self.reload_interval = reload_interval
+        self.manifest = ToolManifest(self.tools_dir / MANIFEST_FILENAME)
         self.config = self._load_config()
 
         # Load local environment variables if configured
         self._load_local_env()
 
         # Update global FastMCP instance
-        mcp = FastMCP(name=self.name)
+        mcp = FastMCP(name=self.name, lifespan=self._lifespan)
         self.mcp = mcp
 
+        # Record per-tool metrics, served on /metrics in HTTP mode
+        self.metrics = get_tool_metrics()
+        self.mcp.add_middleware(ToolMetricsMiddleware(self.metrics))
+        self.mcp.custom_route("/metrics", methods=["GET"])(self._metrics_endpoint)
+
         # Track loaded tools
         self.loaded_tools: list[str] = []
-
-    def _load_config(self) -> dict[str, Any]:
-        """Load configuration from kmcp.yaml."""
-        return load_config("kmcp.yaml")
+        self.modules: dict[str, ToolModule] = {}
+
+    def _load_config(self) -> Mapping[str, Any]:
+        """Load configuration from kmcp.yaml, shared with the tools."""
+        return get_config_service().snapshot.raw
+
+    async def _metrics_endpoint(self, request: Request) -> Response:
+        """Serve tool metrics in the Prometheus text format."""
+        return Response(self.metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+    @asynccontextmanager
+    async def _lifespan(self, server: FastMCP) -> AsyncIterator[None]:
+        """Start shared background services for the lifetime of the server."""
+        # Imported here so registering tools does not load the Kubernetes client.
+        from .catalog import get_catalog_shards
+        from .idle import get_idle_reconciler
+        from .jobs import get_deploy_jobs
+        from .utils import get_kube_client
+
+        config = get_config_service()
+        kube = get_kube_client()
+        catalog = get_catalog_shards()
+        idle = get_idle_reconciler()
+        await config.start()
+        try:
+            api_client = await kube.connect()
+        except Exception as e:
+            logging.warning(
+                f"Kubernetes client unavailable, agent catalog disabled: {e}"
+            )
+        else:
+            await catalog.start(api_client)
+            await idle.start()
+
+        watcher = asyncio.create_task(self._watch_tools()) if self.reload else None
+        try:
+            yield
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            await get_deploy_jobs().stop()
+            await idle.stop()
+            await catalog.stop()
+            await kube.close()
+            await config.stop()
+            self.metrics.shutdown()
 
     def _load_local_env(self) -> None:
         """Load environment variables from a .env file if it exists."""
@@ -55,6 +144,10 @@ class DynamicMCPServer:
         if load_dotenv(override=True):
             logging.info("Loaded environment variables from .env file")
 
+    def _tool_files(self) -> list[Path]:
+        """List the tool files in the tools directory."""
+        return sorted(f for f in self.tools_dir.glob("*.py") if f.name != "__init__.py")
+
     def load_tools(self) -> None:
         """Discover and load all tools from the tools directory."""
         if not self.tools_dir.exists():
@@ -62,39 +155,45 @@ class DynamicMCPServer:
             return
 
         # Find all Python files in tools directory
-        tool_files = list(self.tools_dir.glob("*.py"))
-        tool_files = [f for f in tool_files if f.name != "__init__.py"]
+        tool_files = self._tool_files()
 
         if not tool_files:
             logging.warning(f"No tool files found in {self.tools_dir}")
             return
 
+        started = time.perf_counter()
+        rss_before = rss_bytes()
         loaded_count = 0
+        deferred_count = 0
         has_errors = False
 
         for tool_file in tool_files:
             try:
-                # Get the number of tools before importing
-                tools_before = len(self.mcp._tool_manager._tools)
+                tool_name = tool_file.stem
+                module = self._scan(tool_file)
+
+                if self.lazy and self._register_lazy(module):
+                    self.loaded_tools.append(tool_name)
+                    loaded_count += 1
+                    deferred_count += 1
+                    logging.info(
+                        f"Registered tool module: {tool_name} (import deferred)"
+                    )
+                    continue
 
                 # Simply import the module - tools auto-register via @mcp.tool()
                 # decorator
-                tool_name = tool_file.stem
-                if self._import_tool_module(tool_file, tool_name):
-                    # Check if any tools were actually registered
-                    tools_after = len(self.mcp._tool_manager._tools)
-                    if tools_after > tools_before:
-                        self.loaded_tools.append(tool_name)
-                        loaded_count += 1
-                        logging.info(f"Loaded tool module: {tool_name}")
-                    else:
-                        logging.error(
-                            f"Tool file {tool_name} did not register any tools"
-                        )
-                        has_errors = True
-                else:
+                registered = self._load_module(module)
+                if registered:
+                    self.loaded_tools.append(tool_name)
+                    loaded_count += 1
+                    logging.info(f"Loaded tool module: {tool_name}")
+                elif registered is None:
                     logging.error(f"Failed to load tool module: {tool_name}")
                     has_errors = True
+                else:
+                    logging.error(f"Tool file {tool_name} did not register any tools")
+                    has_errors = True
 
             except Exception as e:
                 logging.error(f"Error loading tool {tool_file.name}: {e}")
@@ -104,11 +203,183 @@ class DynamicMCPServer:
         if has_errors:
             sys.exit(1)
 
-        logging.info(f"📦 Successfully loaded {loaded_count} tools")
+        if self.lazy:
+            self.manifest.save()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rss_mib = (rss_bytes() - rss_before) / 2**20
+        logging.info(
+            f"📦 Successfully loaded {loaded_count} tools ({deferred_count} deferred) "
+            f"in {elapsed_ms:.0f} ms, RSS +{rss_mib:.1f} MiB"
+        )
 
         if loaded_count == 0:
             logging.warning("No tools loaded. Server starting without tools.")
 
+    def _scan(self, tool_file: Path) -> ToolModule:
+        """Record the current state of a tool file."""
+        return ToolModule(
+            name=tool_file.stem,
+            path=tool_file,
+            digest=file_digest(tool_file),
+        )
+
+    def _register_lazy(self, module: ToolModule) -> bool:
+        """Register placeholders for a module's tools from the manifest.
+
+        Returns:
+            False if the manifest has no up-to-date entry for the module
+        """
+        entries = self.manifest.tools_for(module.name, module.digest)
+        if not entries:
+            return False
+
+        for entry in entries:
+            self.mcp.add_tool(
+                LazyTool.from_manifest(
+                    module.name,
+                    entry,
+                    lambda tool_name=entry["name"]: self._resolve_tool(
+                        module.name, tool_name
+                    ),
+                )
+            )
+        module.tool_names = [entry["name"] for entry in entries]
+        self.modules[module.name] = module
+        return True
+
+    def _load_module(self, module: ToolModule) -> list[str] | None:
+        """Import a tool module and record the tools it registered.
+
+        Returns:
+            Names of the registered tools, or None if the import failed
+        """
+        tools = self.mcp._tool_manager._tools
+        before = set(tools)
+        imported = self._import_tool_module(module.path, module.name)
+        registered = [name for name in tools if name not in before]
+        if not imported:
+            for name in registered:
+                tools.pop(name)
+            return None
+
+        module.tool_names = registered
+        module.imported = True
+        self.modules[module.name] = module
+        if registered:
+            self.manifest.record(
+                module.name, module.digest, [tools[name] for name in registered]
+            )
+        return registered
+
+    def _resolve_tool(self, module_name: str, tool_name: str) -> Tool:
+        """Import a lazily registered module and return one of its real tools."""
+        module = self.modules.get(module_name)
+        if module is None:
+            raise ToolError(f"Tool module {module_name} is no longer available")
+
+        if not module.imported:
+            tools = self.mcp._tool_manager._tools
+            placeholders = {
+                name: tools.pop(name) for name in module.tool_names if name in tools
+            }
+            started = time.perf_counter()
+            rss_before = rss_bytes()
+            if self._load_module(module) is None:
+                tools.update(placeholders)
+                raise ToolError(f"Failed to load tool module {module_name}")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            rss_mib = (rss_bytes() - rss_before) / 2**20
+            logging.info(
+                f"Imported tool module {module_name} on first call "
+                f"in {elapsed_ms:.0f} ms, RSS +{rss_mib:.1f} MiB"
+            )
+
+        tool = self.mcp._tool_manager._tools.get(tool_name)
+        if tool is None:
+            raise ToolError(f"Tool module {module_name} did not register {tool_name}")
+        return tool
+
+    def _unload_module(
+        self, module_name: str
+    ) -> tuple[ToolModule | None, dict[str, Tool], Any]:
+        """Remove a module's tools from the server.
+
+        Returns:
+            The module's previous state, its tools and its module object, so a
+            failed reload can put them back
+        """
+        tools = self.mcp._tool_manager._tools
+        module = self.modules.pop(module_name, None)
+        removed = {}
+        if module is not None:
+            removed = {
+                name: tools.pop(name) for name in module.tool_names if name in tools
+            }
+        if module_name in self.loaded_tools:
+            self.loaded_tools.remove(module_name)
+        return module, removed, sys.modules.pop(f"tools.{module_name}", None)
+
+    def reload_changed_tools(self) -> list[str]:
+        """Re-import tool files that were added, edited or deleted.
+
+        A file that fails to import keeps serving its previous version.
+
+        Returns:
+            Names of the tool modules that changed
+        """
+        changed = []
+        current = {tool_file.stem: tool_file for tool_file in self._tool_files()}
+
+        for module_name in [name for name in self.modules if name not in current]:
+            self._unload_module(module_name)
+            self.manifest.forget(module_name)
+            changed.append(module_name)
+            logging.info(f"Removed tool module: {module_name}")
+
+        for module_name, tool_file in current.items():
+            known = self.modules.get(module_name)
+            try:
+                module = self._scan(tool_file)
+            except FileNotFoundError:
+                continue
+            if known is not None and known.digest == module.digest:
+                continue
+
+            changed.append(module_name)
+            previous, removed, module_object = self._unload_module(module_name)
+            if self._load_module(module):
+                self.loaded_tools.append(module_name)
+                logging.info(f"Reloaded tool module: {module_name}")
+                continue
+
+            logging.error(
+                f"Reload of tool module {module_name} failed, keeping previous version"
+            )
+            if previous is not None:
+                # Remember the broken file so it is not retried until edited again.
+                previous.digest = module.digest
+                self.modules[module_name] = previous
+                self.mcp._tool_manager._tools.update(removed)
+                self.loaded_tools.append(module_name)
+                sys.modules[f"tools.{module_name}"] = module_object
+            else:
+                sys.modules.pop(f"tools.{module_name}", None)
+
+        if self.lazy:
+            self.manifest.save()
+        return changed
+
+    async def _watch_tools(self) -> None:
+        """Poll the tools directory and reload tool files as they change."""
+        logging.info(f"Watching {self.tools_dir} for tool changes")
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                self.reload_changed_tools()
+            except Exception as e:
+                logging.error(f"Error reloading tools: {e}")
+
     def _import_tool_module(self, tool_file: Path, tool_name: str) -> bool:
         """Import a tool module, which auto-registers tools via decorators.
 
@@ -119,6 +390,7 @@ class DynamicMCPServer:
         Returns:
             True if module was imported successfully
         """
+        global mcp
         try:
             # Load the module
             spec = importlib.util.spec_from_file_location(tool_name, tool_file)
@@ -130,6 +402,10 @@ class DynamicMCPServer:
             # Add to sys.modules so it can be imported by other modules
             sys.modules[f"tools.{tool_name}"] = module
 
+            # Tools register on the global instance, which must be this
+            # server's even when the import is deferred to a later call
+            mcp = self.mcp
+
             # Execute the module - this will trigger @mcp.tool() decorators
             spec.loader.exec_module(module)
 
@@ -145,17 +421,104 @@ class DynamicMCPServer:
         # async
         return self.mcp._tool_manager._tools
 
-    def run(self, transport_mode: str = "stdio", host: str = "localhost", port: int = 3000) -> None:
+    def run(
+        self,
+        transport_mode: str = "stdio",
+        host: str = "localhost",
+        port: int = 3000,
+        workers: int = 1,
+        json_response: bool = False,
+        drain_timeout: int | None = None,
+    ) -> None:
         """Run the FastMCP server.
 
         Args:
             transport_mode: Transport mode - "stdio", or "http"
             host: Host to bind to in HTTP mode
             port: Port to bind to in HTTP mode
+            workers: Number of HTTP worker processes; more than one serves
+                stateless HTTP, see run_workers()
+            json_response: Answer HTTP requests with plain JSON instead of
+                an SSE stream
+            drain_timeout: Seconds to let in-flight HTTP requests finish
+                after SIGTERM, unbounded if None
         """
 
         if transport_mode == "http":
-            self.mcp.run(transport="http", host=host, port=port, path="/mcp")
+            if workers > 1:
+                self.run_workers(host, port, workers, json_response, drain_timeout)
+                return
+            options: dict[str, Any] = {}
+            if json_response:
+                options["json_response"] = True
+            if drain_timeout is not None:
+                options["uvicorn_config"] = {"timeout_graceful_shutdown": drain_timeout}
+            self.mcp.run(transport="http", host=host, port=port, path="/mcp", **options)
         elif transport_mode == "stdio":
+            # Nothing can scrape a stdio server, so push metrics if a collector is set
+            if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv(
+                "OTEL_EXPORTER_OTLP_METRICS_ENDPOINT"
+            ):
+                self.metrics.enable_otlp()
             # Default to stdio mode
             self.mcp.run()
+
+    def run_workers(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        json_response: bool = False,
+        drain_timeout: int | None = None,
+    ) -> None:
+        """Serve stateless HTTP from several worker processes on one port.
+
+        Each worker builds its own server with create_worker_app() and loads
+        the tools once. Requests may land on any worker, so MCP sessions are
+        not kept between requests. On SIGTERM every worker stops accepting
+        connections and finishes its in-flight requests before exiting.
+        """
+        import uvicorn
+
+        # Workers are fresh interpreters and read their settings from here
+        os.environ.update(
+            MCP_SERVER_NAME=self.name,
+            MCP_TOOLS_DIR=str(self.tools_dir.resolve()),
+            MCP_LAZY_TOOLS=str(self.lazy).lower(),
+            MCP_JSON_RESPONSE=str(json_response).lower(),
+            MCP_WORKERS=str(workers),
+        )
+        # Lets /metrics on any worker report the totals of all of them
+        os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="mcp-metrics-")
+        )
+
+        logging.info(f"Starting {workers} stateless HTTP workers on {host}:{port}")
+        uvicorn.run(
+            "core.server:create_worker_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            timeout_graceful_shutdown=drain_timeout,
+            app_dir=str(Path(__file__).parent.parent),
+        )
+
+
+def create_worker_app() -> Starlette:
+    """Build the ASGI app of one HTTP worker started by run_workers()."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - [worker %(process)d] %(message)s",
+    )
+    server = DynamicMCPServer(
+        name=os.getenv("MCP_SERVER_NAME", "mcp-agent-control-plane"),
+        tools_dir=os.getenv("MCP_TOOLS_DIR", "src/tools"),
+        lazy=os.getenv("MCP_LAZY_TOOLS", "true") == "true",
+    )
+    server.load_tools()
+    return server.mcp.http_app(
+        path="/mcp",
+        stateless_http=True,
+        json_response=os.getenv("MCP_JSON_RESPONSE", "false") == "true",
+    )
@@ -0,0 +1,296 @@
+"""Per-agent coalescing of configuration updates.
+
+Every update to an Agent can restart its pod. When several conversations
+evolve the same agent at nearly the same time, applying each update on its
+own costs one write and one restart per call. The update queue holds the
+first update to an agent for a short window and folds every later update to
+the same agent into it, then writes once. All callers of the batch get the
+result of that single write.
+
+Within a batch the last description wins. Skill lists either replace the
+earlier ones, matching the full-replacement semantics of a single update, or
+are unioned with them, depending on the configured policy. Batches of the
+same agent are written one after another, never concurrently.
+
+Before writing, the merged update is compared with the agent as it is now,
+read from the catalog when that is current and from the API server
+otherwise. Only the fields that differ are patched, and an update that
+changes nothing is not written at all, since every write bumps the agent's
+generation and can roll its pod. Skill labels that the new skill list drops
+are removed by the same patch.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .catalog import get_agent_catalog
+from .metrics import get_tool_metrics
+from .search import SKILL_LABEL_PREFIX
+
+DEFAULT_WINDOW = 0.2
+SKILL_POLICIES = ("replace", "union")
+
+# Applies a merged update and returns the resourceVersion and the changes made.
+WriteFn = Callable[[str, list[str]], Awaitable[tuple[str | None, list[dict[str, Any]]]]]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UpdateResult:
+    """Outcome of the write that carried a caller's update."""
+
+    resource_version: str | None
+    merged: int
+    description: str
+    skills: list[str]
+    changes: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def written(self) -> bool:
+        """Whether the agent was patched, False if it was already up to date."""
+        return bool(self.changes)
+
+
+@dataclass
+class _Batch:
+    description: str
+    skills: list[str]
+    write: WriteFn
+    waiters: list[asyncio.Future[UpdateResult]] = field(default_factory=list)
+
+
+def merge_skills(earlier: list[str], later: list[str], policy: str) -> list[str]:
+    """Combine two skill lists according to ``policy``.
+
+    Args:
+        earlier: Skills of the updates already in the batch
+        later: Skills of the update being added
+        policy: "replace" keeps ``later``, "union" keeps both in first-seen
+            order
+
+    Raises:
+        ValueError: If the policy is unknown
+    """
+    if policy == "replace":
+        return list(later)
+    if policy == "union":
+        return list(dict.fromkeys([*earlier, *later]))
+    raise ValueError(
+        f"Unknown skills policy '{policy}', expected one of {SKILL_POLICIES}"
+    )
+
+
+class UpdateQueue:
+    """Debounces and merges updates per agent."""
+
+    def __init__(self, window: float = DEFAULT_WINDOW, policy: str = "replace"):
+        """Initialize an empty queue.
+
+        Args:
+            window: Seconds an agent's first update waits for others to join
+            policy: How skill lists of one batch combine, see merge_skills()
+        """
+        self.window = window
+        self.policy = policy
+        self._batches: dict[tuple[str, str], _Batch] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self.submitted = 0
+        self.writes = 0
+        self.unchanged = 0
+
+    async def submit(
+        self,
+        namespace: str,
+        name: str,
+        description: str,
+        skills: list[str],
+        write: WriteFn,
+        window: float | None = None,
+        policy: str | None = None,
+    ) -> UpdateResult:
+        """Queue an update and wait for the write that carries it.
+
+        Args:
+            namespace: Agent namespace
+            name: Agent name
+            description: New description
+            skills: New skills
+            write: Applies a merged update; the first caller's is used
+            window: Overrides the queue's window for a new batch
+            policy: Overrides the queue's skills policy
+
+        Returns:
+            The result of the write
+
+        Raises:
+            Exception: Whatever ``write`` raised, for every caller of the batch
+        """
+        key = (namespace, name)
+        self.submitted += 1
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = _Batch(description, list(skills), write)
+            self._batches[key] = batch
+            delay = self.window if window is None else window
+            asyncio.create_task(self._flush(key, batch, delay), name=f"update-{name}")
+        else:
+            batch.description = description
+            batch.skills = merge_skills(batch.skills, skills, policy or self.policy)
+            get_tool_metrics().update_requests.labels("coalesced").inc()
+
+        waiter: asyncio.Future[UpdateResult] = (
+            asyncio.get_running_loop().create_future()
+        )
+        batch.waiters.append(waiter)
+        return await waiter
+
+    async def _flush(self, key: tuple[str, str], batch: _Batch, delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Updates that arrive from here on start the next batch
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+            try:
+                resource_version, changes = await batch.write(
+                    batch.description, batch.skills
+                )
+            except Exception as e:
+                for waiter in batch.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                outcome = "written" if changes else "unchanged"
+                if changes:
+                    self.writes += 1
+                else:
+                    self.unchanged += 1
+                get_tool_metrics().update_requests.labels(outcome).inc()
+                result = UpdateResult(
+                    resource_version,
+                    len(batch.waiters),
+                    batch.description,
+                    batch.skills,
+                    changes,
+                )
+                if result.merged > 1:
+                    logger.info(
+                        f"Merged {result.merged} updates of {key[1]} into one write"
+                    )
+                for waiter in batch.waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+        if key not in self._batches and not lock.locked():
+            self._locks.pop(key, None)
+
+
+def plan_patch(
+    current: dict[str, Any], desired: dict[str, Any]
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Compute the merge patch that turns ``current`` into ``desired``.
+
+    ``desired`` is a rendered Agent manifest. Its skill labels are the
+    complete skill set, so ``skill-*`` labels of ``current`` missing from it
+    are removed. Other fields present in ``current`` only are left alone.
+
+    Args:
+        current: The Agent as stored in the cluster
+        desired: The rendered Agent manifest
+
+    Returns:
+        The patch, holding only the differing fields, and the list of changes
+        as ``{"field", "from", "to"}`` entries; both empty if nothing differs
+    """
+    desired = dict(desired)
+    metadata = dict(desired.get("metadata") or {})
+    labels = dict(metadata.get("labels") or {})
+    current_labels = (current.get("metadata") or {}).get("labels") or {}
+    for key in current_labels:
+        if key.startswith(SKILL_LABEL_PREFIX) and key not in labels:
+            labels[key] = None
+    metadata["labels"] = labels
+    desired["metadata"] = metadata
+    return _diff(current, desired, ())
+
+
+def _diff(
+    current: Any, desired: dict[str, Any], path: tuple[str, ...]
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    patch: dict[str, Any] = {}
+    changes: list[dict[str, Any]] = []
+    for key, value in desired.items():
+        old = current.get(key) if isinstance(current, dict) else None
+        field_path = (*path, key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            sub_patch, sub_changes = _diff(old, value, field_path)
+            if sub_patch:
+                patch[key] = sub_patch
+                changes.extend(sub_changes)
+        elif value is None and old is None:
+            continue
+        elif value != old:
+            patch[key] = value
+            changes.append({"field": ".".join(field_path), "from": old, "to": value})
+    return patch, changes
+
+
+_seen_versions: dict[tuple[str, str], str] = {}
+
+
+async def read_current(
+    namespace: str,
+    name: str,
+    fetch: Callable[[], Awaitable[dict[str, Any] | None]],
+) -> dict[str, Any] | None:
+    """Read an agent before updating it.
+
+    The catalog copy is used when the catalog is current and has already
+    seen the last version this process wrote or read, so an update right
+    after another one is never compared with the state before it.
+    Otherwise the agent is read from the API server with ``fetch``.
+
+    Args:
+        namespace: Agent namespace
+        name: Agent name
+        fetch: Reads the agent from the API server, None if it does not exist
+
+    Returns:
+        The agent, or None if it does not exist
+    """
+    key = (namespace, name)
+    catalog = get_agent_catalog(namespace)
+    if not catalog.is_stale():
+        item = catalog.get(namespace, name)
+        if item is not None and _seen_versions.get(key) in (
+            None,
+            item["metadata"].get("resourceVersion"),
+        ):
+            return item
+    item = await fetch()
+    if item is not None:
+        record_version(namespace, name, item["metadata"].get("resourceVersion"))
+    return item
+
+
+def record_version(namespace: str, name: str, resource_version: str | None) -> None:
+    """Remember the newest resourceVersion of an agent this process has seen."""
+    if resource_version:
+        _seen_versions[(namespace, name)] = resource_version
+    else:
+        _seen_versions.pop((namespace, name), None)
+
+
+_update_queue: UpdateQueue | None = None
+
+
+def get_update_queue() -> UpdateQueue:
+    """Get the process-wide update queue."""
+    global _update_queue
+    if _update_queue is None:
+        _update_queue = UpdateQueue()
+    return _update_queue
@@ -1,57 +1,299 @@
-"""Shared utilities for mcp-agent-control-plane MCP server."""
+"""Shared utilities for mcp-agent-control-plane MCP server.
 
+Configuration from kmcp.yaml is served by a ConfigService that parses the
+file once and hands out an immutable snapshot, so lookups from tool hot paths
+cost no I/O. While the server runs, a background task checks the file's
+status and reloads it only when it changed, notifying subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
 import os
-from typing import Any
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
+if TYPE_CHECKING:
+    from .kube import KubeClient
+
+DEFAULT_CONFIG_PATH = "kmcp.yaml"
+
+logger = logging.getLogger(__name__)
 
-def load_config(config_path: str) -> dict[str, Any]:
+_kube_client: KubeClient | None = None
+_config_service: ConfigService | None = None
+
+
+def load_config(config_path: str, strict: bool = False) -> dict[str, Any]:
     """Load configuration from YAML file.
 
     Args:
         config_path: Path to the configuration file
+        strict: Raise instead of returning an empty configuration when the
+            file is missing, is not valid YAML, or it or its ``tools`` section
+            is not a mapping
 
     Returns:
         Configuration dictionary
+
+    Raises:
+        OSError, yaml.YAMLError, ValueError: Only with ``strict``
     """
     try:
-        with open(config_path) as f:
-            return yaml.safe_load(f) or {}
+        return _parse_config(config_path)
     except FileNotFoundError:
+        if strict:
+            raise
         return {}
     except Exception as e:
+        if strict:
+            raise
         print(f"Error loading config from {config_path}: {e}")
         return {}
 
 
-def get_shared_config() -> dict[str, Any]:
+def _parse_config(config_path: str) -> dict[str, Any]:
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise ValueError("top level must be a mapping")
+    tools = config.get("tools")
+    if tools is not None and not isinstance(tools, dict):
+        raise ValueError("'tools' must be a mapping of tool names to settings")
+    invalid = [
+        name
+        for name, cfg in (tools or {}).items()
+        if cfg is not None and not isinstance(cfg, dict)
+    ]
+    if invalid:
+        raise ValueError(f"settings of tools {invalid} must be mappings")
+    return config
+
+
+def _freeze(value: Any) -> Any:
+    """Make parsed YAML read-only so a shared snapshot cannot be mutated."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of kmcp.yaml at one point in time."""
+
+    raw: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    name: str | None = None
+    version: str | None = None
+    description: str | None = None
+    tools: Mapping[str, Mapping[str, Any]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    generation: int = 0
+
+    @classmethod
+    def from_dict(cls, config: dict[str, Any], generation: int = 0) -> ConfigSnapshot:
+        """Build a snapshot from parsed YAML, ignoring malformed sections."""
+        raw = _freeze(config if isinstance(config, dict) else {})
+        tools = raw.get("tools")
+        if not isinstance(tools, Mapping):
+            tools = MappingProxyType({})
+        return cls(
+            raw=raw,
+            name=raw.get("name"),
+            version=raw.get("version"),
+            description=raw.get("description"),
+            tools=MappingProxyType(
+                {name: cfg for name, cfg in tools.items() if isinstance(cfg, Mapping)}
+            ),
+            generation=generation,
+        )
+
+    def tool(self, tool_name: str) -> Mapping[str, Any]:
+        """Configuration of one tool, empty if it has none."""
+        return self.tools.get(tool_name, MappingProxyType({}))
+
+
+ConfigListener = Callable[[ConfigSnapshot, ConfigSnapshot], None]
+
+
+class ConfigService:
+    """Parses a config file once and reloads it only when it changes."""
+
+    def __init__(self, path: str = DEFAULT_CONFIG_PATH, check_interval: float = 5.0):
+        """Initialize the service; the file is read on first access.
+
+        Args:
+            path: Path to the YAML configuration file
+            check_interval: Seconds between checks for changes while watching
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: ConfigSnapshot | None = None
+        self._file_state: tuple[int, int, int] | None = None
+        self._listeners: list[ConfigListener] = []
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self.load_count = 0
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current configuration; only the first access reads the file."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load()
+                snapshot = self._snapshot
+        return snapshot
+
+    def _stat(self) -> tuple[int, int, int] | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load(self) -> bool:
+        self._file_state = self._stat()
+        try:
+            config = load_config(self.path, strict=True)
+        except FileNotFoundError:
+            if self._snapshot is not None:
+                logger.error(
+                    f"{self.path} is missing, keeping the last good configuration"
+                )
+                return False
+            config = {}
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            if self._snapshot is not None:
+                logger.error(
+                    f"Invalid configuration in {self.path}, "
+                    f"keeping the last good one: {e}"
+                )
+                return False
+            logger.error(f"Invalid configuration in {self.path}, using defaults: {e}")
+            config = {}
+        generation = self._snapshot.generation + 1 if self._snapshot else 1
+        self._snapshot = ConfigSnapshot.from_dict(config, generation)
+        self.load_count += 1
+        return True
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed since it was last read.
+
+        Returns:
+            True if the configuration was reloaded
+        """
+        if self._snapshot is not None and self._stat() == self._file_state:
+            return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        """Reload the file unconditionally and notify subscribers of changes.
+
+        A file that cannot be parsed or validated is logged and ignored: the
+        last good snapshot stays in place and subscribers are not notified.
+
+        Returns:
+            True if the configuration was reloaded
+        """
+        with self._lock:
+            old = self._snapshot
+            if not self._load():
+                return False
+            new = self._snapshot
+        if old is not None and old.raw != new.raw:
+            logger.info(f"Reloaded configuration from {self.path}")
+            for listener in list(self._listeners):
+                try:
+                    listener(old, new)
+                except Exception as e:
+                    logger.error(f"Config listener {listener!r} failed: {e}")
+        return True
+
+    def subscribe(self, listener: ConfigListener) -> Callable[[], None]:
+        """Call ``listener(old, new)`` whenever the configuration changes.
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background change check is running."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start checking the file for changes in the background."""
+        if self.running:
+            return
+        # Parse now rather than on the first tool call
+        _ = self.snapshot
+        self._task = asyncio.create_task(self._run(), name="config-watch")
+
+    async def stop(self) -> None:
+        """Stop the background change check."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Config reload from {self.path} failed: {e}")
+
+
+def get_config_service() -> ConfigService:
+    """Get the process-wide service for kmcp.yaml."""
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService(DEFAULT_CONFIG_PATH)
+    return _config_service
+
+
+def get_config() -> ConfigSnapshot:
+    """Get the current kmcp.yaml snapshot without touching the disk."""
+    return get_config_service().snapshot
+
+
+def get_shared_config() -> Mapping[str, Mapping[str, Any]]:
     """Get shared configuration that tools can access.
 
     Returns:
-        Shared configuration dictionary
+        Read-only mapping of tool names to their configuration
     """
-    config = load_config("kmcp.yaml")
-    tools_config = config.get("tools", {})
-    if isinstance(tools_config, dict):
-        return tools_config
-    return {}
+    return get_config().tools
 
 
-def get_tool_config(tool_name: str) -> dict[str, Any]:
+def get_tool_config(tool_name: str) -> Mapping[str, Any]:
     """Get configuration for a specific tool.
 
     Args:
         tool_name: Name of the tool
 
     Returns:
-        Tool-specific configuration
+        Read-only tool-specific configuration
     """
-    shared_config = get_shared_config()
-    tool_config = shared_config.get(tool_name, {})
-    if isinstance(tool_config, dict):
-        return tool_config
-    return {}
+    return get_config().tool(tool_name)
 
 
 def get_env_var(key: str, default: str = "") -> str:
@@ -65,3 +307,34 @@ def get_env_var(key: str, default: str = "") -> str:
         Environment variable value or default
     """
     return os.environ.get(key, default)
+
+
+def worker_count() -> int:
+    """Number of HTTP worker processes serving the tools.
+
+    Set by DynamicMCPServer.run_workers(). State kept in memory, such as
+    background deploy jobs, is only seen by the worker that created it.
+
+    Returns:
+        Worker count, 1 for a single process
+    """
+    return int(get_env_var("MCP_WORKERS", "1"))
+
+
+def get_kube_client() -> KubeClient:
+    """Get the process-wide Kubernetes client shared by all tools.
+
+    The connection pool size can be tuned with the KUBE_POOL_MAXSIZE
+    environment variable.
+
+    Returns:
+        Shared Kubernetes client
+    """
+    global _kube_client
+    if _kube_client is None:
+        # Imported on first use so loading config does not load the client.
+        from .kube import DEFAULT_POOL_MAXSIZE, KubeClient
+
+        pool_maxsize = int(get_env_var("KUBE_POOL_MAXSIZE", str(DEFAULT_POOL_MAXSIZE)))
+        _kube_client = KubeClient(pool_maxsize=pool_maxsize)
+    return _kube_client
@@ -0,0 +1,186 @@
+"""Projection and size-bounded JSON encoding of Agent listings.
+
+Tool responses are pasted into LLM prompts, so their size drives both MCP
+transport time and token cost. These helpers turn Agent custom resources into
+small summaries, keep only the fields a caller asked for and cap the encoded
+size, marking where the listing was cut.
+"""
+
+import json
+from typing import Any
+
+AGENT_FIELDS = ("id", "name", "description", "labels", "state")
+
+# Room kept free for the envelope and the truncation marker, besides the
+# continue token itself.
+_RESERVED_BYTES = 128
+
+
+def agent_view(item: dict[str, Any], fields: list[str] | None = None) -> dict[str, Any]:
+    """Summarize an Agent custom resource.
+
+    Args:
+        item: Agent object as returned by the API server
+        fields: Subset of AGENT_FIELDS to keep, all of them if None
+
+    Returns:
+        Agent summary
+    """
+    spec = item.get("spec", {})
+    metadata = item.get("metadata", {})
+    view = {
+        "id": metadata.get("uid"),
+        "name": metadata.get("name"),
+        "description": spec.get("description", "No description provided"),
+        "labels": metadata.get("labels", {}),
+        "state": agent_state(item),
+    }
+    if fields is None:
+        return view
+    return {field: view[field] for field in fields}
+
+
+def agent_replicas(item: dict[str, Any]) -> int | None:
+    """Replicas requested for a BYO Agent's deployment, None if not set."""
+    deployment = ((item.get("spec") or {}).get("byo") or {}).get("deployment") or {}
+    return deployment.get("replicas")
+
+
+def agent_state(item: dict[str, Any]) -> str:
+    """Whether an agent is "warm" (running) or "cold" (scaled to zero)."""
+    return "cold" if agent_replicas(item) == 0 else "warm"
+
+
+def agent_readiness(item: dict[str, Any] | None) -> dict[str, Any]:
+    """Summarize whether an Agent's deployment is ready to serve.
+
+    An agent is ready when its Ready condition is True for the current
+    generation of its spec; a condition left over from before the last
+    update does not count.
+
+    Args:
+        item: Agent object, None if it does not exist
+
+    Returns:
+        ``{"ready": bool, "reason": str, "message": str}``
+    """
+    if item is None:
+        return {"ready": False, "reason": "NotFound", "message": "Agent does not exist"}
+    status = item.get("status") or {}
+    generation = item.get("metadata", {}).get("generation")
+    for condition in status.get("conditions") or []:
+        if condition.get("type") != "Ready":
+            continue
+        observed = condition.get("observedGeneration", status.get("observedGeneration"))
+        if generation is not None and observed is not None and observed < generation:
+            return {
+                "ready": False,
+                "reason": "Reconciling",
+                "message": f"Generation {generation} not yet observed",
+            }
+        return {
+            "ready": condition.get("status") == "True",
+            "reason": condition.get("reason", ""),
+            "message": condition.get("message", ""),
+        }
+    return {
+        "ready": False,
+        "reason": "Pending",
+        "message": "No Ready condition reported yet",
+    }
+
+
+def validate_fields(fields: list[str] | None) -> list[str]:
+    """Return the fields that are not valid projections."""
+    return [field for field in fields or [] if field not in AGENT_FIELDS]
+
+
+def _dumps(payload: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(payload, separators=(",", ":"))
+    return json.dumps(payload, indent=2)
+
+
+def dump_agents(
+    agents: list[dict[str, Any]],
+    compact: bool = False,
+    max_bytes: int | None = None,
+    paginated: bool = False,
+    continue_token: str | None = None,
+) -> str:
+    """Encode agent summaries as JSON, bounded to ``max_bytes``.
+
+    Unpaginated listings are encoded as a JSON array, as they always have
+    been. Paginated listings are wrapped in ``{"items": [...], "continue": ...}``.
+    When the bound forces agents to be dropped, the array ends with a
+    ``{"truncated": true, "omitted": N}`` marker, or the envelope carries the
+    same two keys.
+
+    Args:
+        agents: Agent summaries
+        compact: Encode without indentation or whitespace
+        max_bytes: Upper bound for the encoded response, unbounded if None
+        paginated: Wrap the items in a pagination envelope
+        continue_token: Token for the next page, if any
+
+    Returns:
+        JSON string
+    """
+    return _fit(agents, compact, max_bytes, paginated, continue_token)[1]
+
+
+def fitting_count(
+    agents: list[dict[str, Any]],
+    compact: bool = False,
+    max_bytes: int | None = None,
+    paginated: bool = False,
+    continue_token: str | None = None,
+) -> int:
+    """Return how many of ``agents`` ``dump_agents`` keeps within ``max_bytes``.
+
+    A truncated page must not hand out the continue token for the end of the
+    full page, or the agents it dropped would never be listed. Callers
+    re-fetch the page with this many agents instead, which yields the token
+    for the last agent actually returned.
+    """
+    return _fit(agents, compact, max_bytes, paginated, continue_token)[0]
+
+
+def _fit(
+    agents: list[dict[str, Any]],
+    compact: bool,
+    max_bytes: int | None,
+    paginated: bool,
+    continue_token: str | None,
+) -> tuple[int, str]:
+    kept = agents
+    if max_bytes is not None:
+        budget = max_bytes - _RESERVED_BYTES - len((continue_token or "").encode())
+        used = 0
+        for count, agent in enumerate(agents):
+            encoded = _dumps(agent, compact)
+            used += len(encoded.encode())
+            if not compact:
+                # Nested indentation adds a few spaces to every line.
+                used += 4 * encoded.count("\n") + 6
+            if used > budget:
+                kept = agents[:count]
+                break
+
+    def build(items: list[dict[str, Any]]) -> str:
+        omitted = len(agents) - len(items)
+        if paginated:
+            payload: Any = {"items": items, "continue": continue_token}
+            if omitted:
+                payload.update(truncated=True, omitted=omitted)
+        else:
+            payload = list(items)
+            if omitted:
+                payload.append({"truncated": True, "omitted": omitted})
+        return _dumps(payload, compact)
+
+    output = build(kept)
+    while max_bytes is not None and kept and len(output.encode()) > max_bytes:
+        kept = kept[:-1]
+        output = build(kept)
+    return len(kept), output
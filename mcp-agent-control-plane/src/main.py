@@ -16,6 +16,15 @@ Usage Examples:
 
   # Environment variable mode
   MCP_TRANSPORT_MODE=http python src/main.py
+
+  # Stateless HTTP served by 4 worker processes, plain JSON responses
+  python src/main.py --transport http --workers 4 --json-response
+
+  # Development: re-import tool files as they are edited
+  python src/main.py --reload
+
+  # Write the tool manifest used to register tools without importing them
+  python src/main.py --build-tool-manifest
 """
 
 import argparse
@@ -54,6 +63,48 @@ def main() -> None:
         help="Port to bind to in HTTP mode (default: 3000)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("MCP_WORKERS", "1")),
+        help=(
+            "Number of HTTP worker processes; more than 1 serves stateless HTTP "
+            "(default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--json-response",
+        action="store_true",
+        default=os.getenv("MCP_JSON_RESPONSE", "false").lower() == "true",
+        help="Answer HTTP requests with plain JSON instead of SSE streams"
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=int,
+        default=int(os.getenv("MCP_DRAIN_TIMEOUT", "25")),
+        help="Seconds to finish in-flight HTTP requests after SIGTERM (default: 25)"
+    )
+    parser.add_argument(
+        "--lazy-tools",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("MCP_LAZY_TOOLS", "true").lower() == "true",
+        help=(
+            "Register tools from the tool manifest and import them on first call "
+            "(default: on)"
+        ),
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        default=os.getenv("MCP_RELOAD_TOOLS", "false").lower() == "true",
+        help="Reload tool files when they change (development only)"
+    )
+    parser.add_argument(
+        "--build-tool-manifest",
+        action="store_true",
+        help="Import every tool, write the tool manifest and exit"
+    )
+
     args = parser.parse_args()
 
     # Check environment variable for transport mode
@@ -72,16 +123,34 @@ def main() -> None:
         # Create server with dynamic tool loading
         server = DynamicMCPServer(
             name="mcp-agent-control-plane",
-            tools_dir="src/tools"
+            tools_dir="src/tools",
+            lazy=args.lazy_tools and not args.build_tool_manifest,
+            reload=args.reload,
         )
 
         # Load tools and start server
         server.load_tools()
 
+        if args.build_tool_manifest:
+            server.manifest.save()
+            print(f"Tool manifest: {server.manifest.path}")
+            return
+
         if transport_mode not in ["http", "stdio"]:
             raise ValueError(f"Invalid transport mode: {transport_mode}. Must be one of: http, or stdio")
-
-        server.run(transport_mode=transport_mode, host=args.host, port=args.port)
+        if args.workers < 1:
+            raise ValueError("--workers must be at least 1")
+        if args.workers > 1 and transport_mode != "http":
+            raise ValueError("--workers requires the http transport")
+
+        server.run(
+            transport_mode=transport_mode,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            json_response=args.json_response,
+            drain_timeout=args.drain_timeout,
+        )
 
     except KeyboardInterrupt:
         print("\nShutting down server...")
@@ -7,5 +7,13 @@ Do not edit manually - it will be overwritten when tools are loaded.
 from .list_available_agents import list_available_agents
 from .deploy_new_agent import deploy_new_agent
 from .update_agent_config import update_agent_config
+from .get_catalog_status import get_catalog_status
+from .deploy_agents_batch import deploy_agents_batch
 
-__all__ = ["list_available_agents", "deploy_new_agent", "update_agent_config"]
+__all__ = [
+    "list_available_agents",
+    "deploy_new_agent",
+    "update_agent_config",
+    "get_catalog_status",
+    "deploy_agents_batch",
+]
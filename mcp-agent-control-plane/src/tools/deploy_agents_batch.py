@@ -0,0 +1,112 @@
+"""deploy_agents_batch tool for MCP server.
+"""
+
+import asyncio
+import json
+import logging
+
+from fastmcp import Context
+from kubernetes_asyncio.client.rest import ApiException
+from kubernetes_asyncio.dynamic.exceptions import ResourceNotFoundError
+from pydantic import BaseModel, Field
+
+from core.catalog import resolve_namespace
+from core.deploy import deploy_agent
+from core.idle import get_idle_reconciler
+from core.manifests import DEFAULT_TEMPLATE_PATH
+from core.server import invalidate, mcp
+from core.utils import get_kube_client, get_tool_config
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
+
+
+class AgentSpec(BaseModel):
+    name: str = Field(..., description="Agent name in kebab-case.")
+    description: str = Field(..., description="Executive summary of the agent's role.")
+    skills: list[str] = Field(default_factory=list, description="Skills in kebab-case.")
+
+
+@mcp.tool()
+async def deploy_agents_batch(
+    agents: list[AgentSpec],
+    max_concurrency: int | None = None,
+    namespace: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """
+    Registers and deploys many AI agents at once, each with its own RBAC security
+    context.
+
+    Agents are provisioned concurrently, at most max_concurrency at a time. Each one
+    gets the same ServiceAccount, Role, RoleBinding and Agent resources as
+    deploy_new_agent. Progress is reported as MCP progress notifications when the
+    caller requests them.
+
+    Args:
+        agents (list): The agents to deploy, each with name, description and skills.
+        max_concurrency (int, optional): Maximum number of agents deployed at the same
+                                         time.
+        namespace (str, optional): Namespace to deploy the agents to. Defaults to the
+                                   control plane's default namespace.
+
+    Returns:
+        str: A JSON array with one {"name", "status", "error"} result per agent, in
+             input order.
+    """
+    if max_concurrency is None:
+        max_concurrency = get_tool_config("deploy_agents_batch").get(
+            "max_concurrency", DEFAULT_MAX_CONCURRENCY
+        )
+    if max_concurrency < 1:
+        return "Error: max_concurrency must be a positive integer."
+
+    try:
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+    total = len(agents)
+    logger.info(
+        f"Deploying {total} agents to {namespace} with concurrency {max_concurrency}"
+    )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    done = 0
+
+    async def deploy_one(spec: AgentSpec) -> dict:
+        nonlocal done
+        async with semaphore:
+            result = {"name": spec.name, "status": "deployed", "error": None}
+            try:
+                dynamic_client = await get_kube_client().dynamic()
+                await deploy_agent(
+                    dynamic_client, spec.name, spec.description, spec.skills, namespace
+                )
+                get_idle_reconciler().touch(namespace, spec.name)
+            except FileNotFoundError:
+                result.update(
+                    status="failed", error=f"{DEFAULT_TEMPLATE_PATH} not found."
+                )
+            except ResourceNotFoundError:
+                result.update(status="failed", error="Agent CRD is not installed.")
+            except ApiException as e:
+                result.update(status="failed", error=f"K8s API Error: {e.reason}")
+            except Exception as e:
+                logger.exception(f"Unexpected error deploying {spec.name}")
+                result.update(status="failed", error=str(e))
+
+        done += 1
+        if ctx is not None:
+            await ctx.report_progress(
+                progress=done, total=total, message=f"{spec.name}: {result['status']}"
+            )
+        return result
+
+    results = await asyncio.gather(*(deploy_one(spec) for spec in agents))
+
+    failed = sum(1 for r in results if r["status"] == "failed")
+    if failed < total:
+        invalidate("agents")
+    logger.info(f"Batch deploy finished: {total - failed} deployed, {failed} failed")
+    return json.dumps(results, indent=2)
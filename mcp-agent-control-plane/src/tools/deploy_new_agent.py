@@ -1,11 +1,14 @@
+import json
 import logging
-import yaml
-import os
-from jinja2 import Template
-from kubernetes import client, config, dynamic
-from kubernetes.dynamic.exceptions import ResourceNotFoundError
-from kubernetes.client.rest import ApiException
-from core.server import mcp
+from kubernetes_asyncio.dynamic.exceptions import ResourceNotFoundError
+from kubernetes_asyncio.client.rest import ApiException
+from core.server import invalidate, mcp
+from core.catalog import resolve_namespace
+from core.deploy import deploy_agent
+from core.idle import get_idle_reconciler
+from core.jobs import get_deploy_jobs
+from core.manifests import DEFAULT_TEMPLATE_PATH
+from core.utils import get_kube_client, worker_count
 
 # Configure standard logging format if not already set globally
 logging.basicConfig(
@@ -16,102 +19,64 @@ logger = logging.getLogger(__name__)
 
 
 @mcp.tool()
-async def deploy_new_agent(name: str, description: str, skills: list) -> str:
+async def deploy_new_agent(
+    name: str,
+    description: str,
+    skills: list,
+    background: bool = False,
+    namespace: str | None = None,
+) -> str:
     """
     Registers and deploys a new AI agent including its RBAC security context.
+
+    With background=True the call returns a job id immediately, and the agent is
+    deployed and followed until its deployment is ready in the background. Poll
+    get_deploy_status with the job id, or call wait_for_agent_ready with the agent
+    name. Jobs are kept in the memory of the server process, so background=True is
+    refused when the server runs several workers (--workers N); use
+    wait_for_agent_ready after a synchronous deploy instead.
+
+    The agent is deployed to the given namespace, which must be one managed by the
+    control plane, or to its default namespace.
     """
     log = logging.LoggerAdapter(logger, {"agent_name": name})
 
     log.info(f"Initiating deployment sequence for agent: {name}")
 
     try:
-        try:
-            config.load_incluster_config()
-            log.debug("Loaded in-cluster Kubernetes configuration.")
-        except config.ConfigException:
-            config.load_kube_config()
-            log.debug("Loaded local kube-config.")
-
-        k8s_client = client.ApiClient()
-        core_api = client.CoreV1Api(k8s_client)
-        rbac_api = client.RbacAuthorizationV1Api(k8s_client)
-        dynamic_client = dynamic.DynamicClient(k8s_client)
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
 
-        namespace = os.getenv("NAMESPACE", "kagent")
+    try:
         log.info(f"Targeting namespace: {namespace}")
 
-        sa_manifest = client.V1ServiceAccount(metadata=client.V1ObjectMeta(name=name))
-
-        role_manifest = client.V1Role(
-            metadata=client.V1ObjectMeta(name=f"{name}-reader-role", namespace=namespace),
-            rules=[client.V1PolicyRule(
-                api_groups=["kagent.dev"],
-                resources=["agents"],
-                verbs=["get", "list"]
-            )]
-        )
-
-        rb_manifest = client.V1RoleBinding(
-            metadata=client.V1ObjectMeta(name=f"{name}-rb", namespace=namespace),
-            subjects=[client.RbacV1Subject(kind="ServiceAccount", name=name, namespace=namespace)],
-            role_ref=client.V1RoleRef(
-                kind="Role",
-                name=f"{name}-reader-role",
-                api_group="rbac.authorization.k8s.io"
-            )
-        )
-
-        resources = [
-            ("ServiceAccount", core_api.create_namespaced_service_account, sa_manifest),
-            ("Role", rbac_api.create_namespaced_role, role_manifest),
-            ("RoleBinding", rbac_api.create_namespaced_role_binding, rb_manifest)
-        ]
-
-        for res_type, api_call, body in resources:
-            try:
-                log.debug(f"Attempting to create {res_type}...")
-                api_call(namespace=namespace, body=body)
-                log.info(f"Successfully created {res_type}: {name}")
-            except ApiException as e:
-                if e.status == 409:
-                    log.warning(f"{res_type} '{name}' already exists. Skipping creation.")
-                else:
-                    log.error(f"Failed to create {res_type}: {e.status} - {e.reason}")
-                    raise e
+        if background:
+            if worker_count() > 1:
+                return (
+                    "Error: background=True is not available when the server runs "
+                    "several workers, since get_deploy_status may reach a worker that "
+                    "does not know the job. Deploy without background and call "
+                    "wait_for_agent_ready."
+                )
+            job = get_deploy_jobs().submit(name, description, skills, namespace)
+            log.info(f"Deployment queued as job {job.id}")
+            return json.dumps({"job_id": job.id, "name": name, "state": job.state})
 
         log.debug(f"Processing template for agent Custom Resource with {len(skills)} skills.")
-        populated_skills = {f"skill-{s.lower().replace(' ', '-')}": s for s in skills}
-
-        data_vars = {
-            "name": name,
-            "description": description,
-            "skills": populated_skills
-        }
-
-        template_path = "agent-template.yaml"
-        if not os.path.exists(template_path):
-            log.error(f"Template file missing: {template_path}")
-            return f"Error: {template_path} not found."
-
-        with open(template_path, "r") as f:
-            template = Template(f.read())
-
-        resource_data = yaml.safe_load(template.render(data_vars))
-
         try:
-            agent_resource = dynamic_client.resources.get(
-                api_version="kagent.dev/v1alpha2",
-                kind="Agent"
-            )
-            log.debug("Found Agent CRD definition.")
-
-            agent_resource.create(body=resource_data, namespace=namespace)
-            log.info(f"Agent Custom Resource '{name}' deployed successfully.")
-
+            dynamic_client = await get_kube_client().dynamic()
+            await deploy_agent(dynamic_client, name, description, skills, namespace)
+        except FileNotFoundError:
+            log.error(f"Template file missing: {DEFAULT_TEMPLATE_PATH}")
+            return f"Error: {DEFAULT_TEMPLATE_PATH} not found."
         except ResourceNotFoundError:
             log.critical("CRD 'kagent.dev/v1alpha2' not found on cluster.")
             return "Error: Agent CRD is not installed."
 
+        invalidate("agents")
+        get_idle_reconciler().touch(namespace, name)
+        log.info(f"Agent Custom Resource '{name}' deployed successfully.")
         return f"Successfully deployed agent '{name}' with full RBAC context."
 
     except ApiException as e:
@@ -119,4 +84,4 @@ async def deploy_new_agent(name: str, description: str, skills: list) -> str:
         return f"K8s API Error: {e.reason}"
     except Exception as e:
         log.exception(f"Unexpected fatal error during deployment of {name}")
-        return f"Deployment failed: {str(e)}"
\ No newline at end of file
+        return f"Deployment failed: {str(e)}"
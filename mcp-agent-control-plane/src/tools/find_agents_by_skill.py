@@ -0,0 +1,96 @@
+import asyncio
+import json
+import logging
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from core.catalog import (
+    AGENT_GROUP,
+    AGENT_PLURAL,
+    AGENT_VERSION,
+    get_agent_catalog,
+    resolve_namespace,
+)
+from core.manifests import skill_labels
+from core.server import mcp
+from core.utils import get_kube_client
+from core.views import agent_view
+
+MATCH_MODES = ("any", "all")
+
+
+@mcp.tool()
+async def find_agents_by_skill(
+    skills: list[str], match: str = "any", namespace: str | None = None
+) -> str:
+    """
+    Finds the AI agents that have the given skills.
+
+    Skills are matched exactly against the skill labels written by deploy_new_agent and
+    update_agent_config, after the same normalization (e.g. "AI Ethics" and "ai-ethics"
+    are the same skill).
+
+    Args:
+        skills (list): Skill names to look for.
+        match (str, optional): "any" returns agents with at least one of the skills,
+                               "all" only agents with every one of them.
+                               Defaults to "any".
+        namespace (str, optional): Namespace of the agents. Defaults to the
+                                   control plane's default namespace.
+
+    Returns:
+        str: A JSON array of matching agent objects, ordered by name.
+    """
+    if match not in MATCH_MODES:
+        return f"Error: match must be one of {list(MATCH_MODES)}, got '{match}'."
+    label_keys = list(skill_labels(skills))
+    if not label_keys:
+        return "Error: skills must contain at least one valid skill name."
+    try:
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    catalog = get_agent_catalog(namespace)
+    if not catalog.is_stale():
+        items = catalog.select(label_keys, match_all=match == "all")
+    else:
+        if catalog.running:
+            logging.warning(
+                f"Agent catalog is stale, querying API server: {catalog.status()}"
+            )
+        try:
+            custom_api = await get_kube_client().custom_objects()
+
+            async def list_selected(selector: str) -> list[dict]:
+                response = await custom_api.list_namespaced_custom_object(
+                    group=AGENT_GROUP,
+                    version=AGENT_VERSION,
+                    namespace=namespace,
+                    plural=AGENT_PLURAL,
+                    label_selector=selector,
+                )
+                return response.get("items", [])
+
+            # A selector ANDs its terms, so "any" takes one LIST per skill
+            if match == "all":
+                selectors = [",".join(label_keys)]
+            else:
+                selectors = label_keys
+            responses = await asyncio.gather(*(list_selected(s) for s in selectors))
+        except ApiException as e:
+            logging.error(f"Kubernetes API error: {e}")
+            return f"Error connecting to cluster: {e}"
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            return f"General error: {str(e)}"
+
+        unique = {}
+        for response in responses:
+            for item in response:
+                metadata = item.get("metadata", {})
+                key = f"{metadata.get('namespace', '')}/{metadata.get('name', '')}"
+                unique[key] = item
+        items = [unique[key] for key in sorted(unique)]
+
+    return json.dumps([agent_view(item) for item in items], indent=2)
@@ -0,0 +1,32 @@
+"""get_catalog_status tool for MCP server.
+"""
+
+import json
+
+from core.catalog import get_agent_catalog, get_catalog_shards, resolve_namespace
+from core.server import mcp
+
+
+@mcp.tool()
+async def get_catalog_status(namespace: str | None = None) -> str:
+    """
+    Reports the health of the in-memory agent catalog used by list_available_agents.
+
+    The catalog keeps one shard per namespace managed by the control plane.
+
+    Args:
+        namespace (str, optional): Only report this namespace's shard.
+                                   Defaults to all shards.
+
+    Returns:
+        str: A JSON object with the catalog's sync state, age in seconds since it last
+             heard from the API server, staleness flag, resourceVersion and agent count,
+             or an object of them keyed by namespace when no namespace is given.
+    """
+    if namespace is None:
+        return json.dumps(get_catalog_shards().status(), indent=2)
+    try:
+        catalog = get_agent_catalog(resolve_namespace(namespace))
+    except ValueError as e:
+        return f"Error: {e}"
+    return json.dumps(catalog.status(), indent=2)
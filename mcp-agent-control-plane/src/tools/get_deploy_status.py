@@ -0,0 +1,33 @@
+"""get_deploy_status tool for MCP server."""
+
+import json
+
+from core.catalog import get_agent_catalog
+from core.jobs import get_deploy_jobs
+from core.server import mcp
+from core.views import agent_readiness
+
+
+@mcp.tool()
+async def get_deploy_status(job_id: str) -> str:
+    """
+    Reports the progress of a background deploy started with
+    deploy_new_agent(background=True).
+
+    Args:
+        job_id (str): The job id returned by deploy_new_agent.
+
+    Returns:
+        str: A JSON object with the job's state (pending, applying, waiting, ready,
+             failed or timed_out), whether it is done, any error, the history of state
+             changes and the agent's current readiness as seen by the agent catalog.
+    """
+    job = get_deploy_jobs().get(job_id)
+    if job is None:
+        return f"Error: deploy job '{job_id}' not found."
+
+    status = job.to_dict()
+    catalog = get_agent_catalog(job.namespace)
+    if catalog.running:
+        status["readiness"] = agent_readiness(catalog.get(job.namespace, job.name))
+    return json.dumps(status, indent=2)
@@ -1,57 +1,155 @@
-from core.server import mcp
+from core.server import cached, mcp
+from core.catalog import (
+    AGENT_GROUP,
+    AGENT_PLURAL,
+    AGENT_VERSION,
+    get_agent_catalog,
+    is_catalog_token,
+    resolve_namespace,
+)
+from core.utils import get_kube_client, get_tool_config
+from core.views import (
+    AGENT_FIELDS,
+    agent_view,
+    dump_agents,
+    fitting_count,
+    validate_fields,
+)
 import logging
-import json
-from kubernetes_asyncio import client, config
 from kubernetes_asyncio.client.rest import ApiException
 
-import asyncio
+DEFAULT_MAX_RESPONSE_BYTES = 65536
+
+OVERSIZED_AGENT_ERROR = (
+    "Error: a single agent exceeds max_response_bytes ({max_bytes}); "
+    "request fewer fields."
+)
+
+
+def _is_listing(output: str) -> bool:
+    """Whether a response is a listing rather than an error message."""
+    return output.startswith(("[", "{"))
+
 
 @mcp.tool()
-async def list_available_agents() -> str:
+@cached(ttl=5.0, tags=("agents",), cache_if=_is_listing)
+async def list_available_agents(
+    limit: int | None = None,
+    continue_token: str | None = None,
+    fields: list[str] | None = None,
+    compact: bool = False,
+    namespace: str | None = None,
+) -> str:
     """
-    Retrieves a list of all AI agents by querying the Kubernetes Cluster CRDs.
-    
+    Retrieves a list of all AI agents in a namespace by querying the Kubernetes
+    Cluster CRDs.
+
+    Args:
+        limit (int, optional): Maximum number of agents to return. When set, the
+                               result is an object {"items": [...], "continue": token};
+                               pass the token back as continue_token to get the
+                               next page.
+        continue_token (str, optional): Token returned with the previous page.
+        fields (list, optional): Only return these fields of each agent. Any of
+                                 "id", "name", "description", "labels", "state".
+                                 "state" is "warm" for running agents and "cold" for
+                                 agents scaled to zero while idle; touch_agent
+                                 wakes them.
+        compact (bool, optional): Return JSON without indentation or whitespace.
+        namespace (str, optional): Namespace of the agents. Defaults to the control
+                                   plane's default namespace.
+
     Returns:
-        str: A JSON-formatted string containing an array of agent objects derived from CRDs.
+        str: A JSON-formatted string containing an array of agent objects derived
+             from CRDs. If the response would exceed the size limit, the last
+             element is a {"truncated": true, "omitted": N} marker.
     """
-    api_client = None
+    invalid = validate_fields(fields)
+    if invalid:
+        return f"Error: unknown fields {invalid}. Valid fields: {list(AGENT_FIELDS)}"
+    if limit is not None and limit < 1:
+        return "Error: limit must be a positive integer."
     try:
-        try:
-            config.load_incluster_config()
-        except config.ConfigException:
-            await config.load_kube_config()
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
 
-        group = "kagent.dev"
-        version = "v1alpha2"
-        plural = "agents"
+    max_bytes = get_tool_config("list_available_agents").get(
+        "max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES
+    )
+    paginated = limit is not None or continue_token is not None
 
-        api_client = client.ApiClient()
+    catalog = get_agent_catalog(namespace)
+    if not catalog.is_stale():
+        if paginated:
+            try:
+                items, next_token = catalog.page(limit or len(catalog), continue_token)
+            except ValueError as e:
+                return f"Error: {e}"
+            views = [agent_view(item, fields) for item in items]
+            fits = fitting_count(views, compact, max_bytes, True, next_token)
+            while 0 < fits < len(views):
+                # Shrink the page so the next one starts right after its last agent,
+                # then re-check the size with that agent's own, possibly longer, token
+                _, next_token = catalog.page(fits, continue_token)
+                views = views[:fits]
+                fits = fitting_count(views, compact, max_bytes, True, next_token)
+            if fits == 0 and views:
+                return OVERSIZED_AGENT_ERROR.format(max_bytes=max_bytes)
+        else:
+            items, next_token = catalog.list_agents(), None
+            views = [agent_view(item, fields) for item in items]
 
-        custom_api = client.CustomObjectsApi(api_client)
-
-        response = await custom_api.list_cluster_custom_object(
-            group=group,
-            version=version,
-            plural=plural
+        return dump_agents(
+            views,
+            compact=compact,
+            max_bytes=max_bytes,
+            paginated=paginated,
+            continue_token=next_token,
         )
 
-        agents = []
-        items = response.get("items", [])
+    if catalog.running:
+        logging.warning(
+            f"Agent catalog is stale, listing from API server: {catalog.status()}"
+        )
+    if is_catalog_token(continue_token):
+        return (
+            "Error: continue_token was issued by the agent catalog, which is out of "
+            "date; start the listing again without continue_token."
+        )
 
+    try:
+        custom_api = await get_kube_client().custom_objects()
 
-        for item in items:
-            spec = item.get("spec", {})
-            metadata = item.get("metadata", {})
+        async def list_page(page_limit: int | None) -> tuple[list[dict], str | None]:
+            response = await custom_api.list_namespaced_custom_object(
+                group=AGENT_GROUP,
+                version=AGENT_VERSION,
+                namespace=namespace,
+                plural=AGENT_PLURAL,
+                limit=page_limit,
+                _continue=continue_token,
+            )
+            views = [agent_view(item, fields) for item in response.get("items", [])]
+            return views, response.get("metadata", {}).get("continue") or None
 
-            agent_data = {
-                "id": metadata.get("uid"),
-                "name": metadata.get("name"),
-                "description": spec.get("description", "No description provided"),
-                "labels": metadata.get("labels", {}),
-            }
-            agents.append(agent_data)
+        views, next_token = await list_page(limit)
+        if paginated:
+            fits = fitting_count(views, compact, max_bytes, True, next_token)
+            while 0 < fits < len(views):
+                # API server tokens are opaque; ask again for a page that fits
+                views, next_token = await list_page(fits)
+                fits = fitting_count(views, compact, max_bytes, True, next_token)
+            if fits == 0 and views:
+                return OVERSIZED_AGENT_ERROR.format(max_bytes=max_bytes)
 
-        return json.dumps(agents, indent=2)
+        return dump_agents(
+            views,
+            compact=compact,
+            max_bytes=max_bytes,
+            paginated=paginated,
+            continue_token=next_token,
+        )
 
     except ApiException as e:
         logging.error(f"Kubernetes API error: {e}")
@@ -59,7 +157,3 @@ async def list_available_agents() -> str:
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         return f"General error: {str(e)}"
-    finally:
-        if api_client:
-            await api_client.close()
-            logging.info("Kubernetes API client session closed.")
\ No newline at end of file
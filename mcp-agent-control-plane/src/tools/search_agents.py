@@ -0,0 +1,82 @@
+import json
+import logging
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from core.catalog import (
+    AGENT_GROUP,
+    AGENT_PLURAL,
+    AGENT_VERSION,
+    get_agent_catalog,
+    resolve_namespace,
+)
+from core.search import AgentSearchIndex
+from core.server import mcp
+from core.utils import get_kube_client
+from core.views import agent_view
+
+MAX_TOP_K = 50
+
+
+@mcp.tool()
+async def search_agents(
+    query: str, top_k: int = 5, namespace: str | None = None
+) -> str:
+    """
+    Finds the AI agents whose name, description and skills best match a topic.
+
+    Use this instead of list_available_agents to pick candidate agents for a task: it
+    returns only the best few matches, ranked by BM25 relevance.
+
+    Args:
+        query (str): The topic or task to match, in free text.
+        top_k (int, optional): Maximum number of agents to return (1-50). Defaults to 5.
+        namespace (str, optional): Namespace of the agents. Defaults to the
+                                   control plane's default namespace.
+
+    Returns:
+        str: A JSON array of agent objects, best match first, each with a "score" field.
+             Agents that share no words with the query are not returned.
+    """
+    if not query.strip():
+        return "Error: query must not be empty."
+    if not 1 <= top_k <= MAX_TOP_K:
+        return f"Error: top_k must be between 1 and {MAX_TOP_K}."
+    try:
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    catalog = get_agent_catalog(namespace)
+    if not catalog.is_stale():
+        matches = catalog.search(query, top_k)
+    else:
+        if catalog.running:
+            logging.warning(
+                "Agent catalog is stale, searching a fresh listing: "
+                f"{catalog.status()}"
+            )
+        try:
+            custom_api = await get_kube_client().custom_objects()
+            response = await custom_api.list_namespaced_custom_object(
+                group=AGENT_GROUP,
+                version=AGENT_VERSION,
+                namespace=namespace,
+                plural=AGENT_PLURAL,
+            )
+        except ApiException as e:
+            logging.error(f"Kubernetes API error: {e}")
+            return f"Error connecting to cluster: {e}"
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            return f"General error: {str(e)}"
+
+        items = {str(i): item for i, item in enumerate(response.get("items", []))}
+        index = AgentSearchIndex()
+        index.rebuild(items)
+        matches = [(items[key], score) for key, score in index.search(query, top_k)]
+
+    return json.dumps(
+        [{**agent_view(item), "score": round(score, 4)} for item, score in matches],
+        indent=2,
+    )
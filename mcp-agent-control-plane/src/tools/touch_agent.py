@@ -0,0 +1,56 @@
+"""touch_agent tool for MCP server."""
+
+import json
+import logging
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from core.catalog import resolve_namespace
+from core.idle import format_time, get_idle_reconciler
+from core.server import mcp
+
+
+@mcp.tool()
+async def touch_agent(name: str, namespace: str | None = None) -> str:
+    """
+    Records that an agent is being used, and starts it again if it was scaled to zero.
+
+    Agents unused for a while are scaled to zero to free cluster memory and are
+    listed with state "cold" by list_available_agents. Call this before delegating
+    work to an agent. A cold agent takes a moment to start; use wait_for_agent_ready
+    to wait for it.
+
+    Args:
+        name (str): The agent name.
+        namespace (str, optional): Namespace of the agent. Defaults to the control
+                                   plane's default namespace.
+
+    Returns:
+        str: A JSON object {"name", "woke", "last_used"}, where "woke" is true if
+             the agent was cold and is starting again.
+    """
+    try:
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+    reconciler = get_idle_reconciler()
+    used = reconciler.touch(namespace, name)
+    try:
+        woke = await reconciler.wake(namespace, name)
+    except ApiException as e:
+        if e.status == 404:
+            return f"Error: agent '{name}' not found."
+        logging.error(f"Kubernetes API error: {e}")
+        return f"K8s API Error: {e.reason}"
+    except Exception as e:
+        logging.error(f"Unexpected error: {e}")
+        return f"General error: {str(e)}"
+
+    return json.dumps(
+        {
+            "name": name,
+            "woke": woke,
+            "last_used": format_time(used),
+        },
+        indent=2,
+    )
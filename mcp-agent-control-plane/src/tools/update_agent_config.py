@@ -1,17 +1,22 @@
 """update_agent_config tool for MCP server.
 """
 
-from core.server import mcp
+from core.server import invalidate, mcp
+from core.catalog import resolve_namespace
+from core.idle import get_idle_reconciler
+from core.manifests import DEFAULT_TEMPLATE_PATH, render_agent_manifest
+from core.updates import get_update_queue, plan_patch, read_current, record_version
+from core.utils import get_kube_client, get_tool_config
+from kubernetes_asyncio.dynamic.exceptions import NotFoundError, ResourceNotFoundError
+from jinja2 import TemplateError
+import json
 import yaml
-import io
-from jinja2 import Template
-from kubernetes import client, config, dynamic
-from kubernetes.dynamic.exceptions import ResourceNotFoundError
 
-import asyncio
 
 @mcp.tool()
-def update_agent_config(name: str, description: str, skills: list) -> str:
+async def update_agent_config(
+    name: str, description: str, skills: list, namespace: str | None = None
+) -> str:
     """
         Performs a complete update of an existing agent's configuration and skill set.
 
@@ -22,60 +27,105 @@ def update_agent_config(name: str, description: str, skills: list) -> str:
         Note: This is a full replacement update. All parameters must be provided to maintain
         the integrity of the agent's profile.
 
+        Updates to the same agent that arrive within a short window are merged and
+        written once, so the agent restarts once. The last description wins; skills
+        either replace the earlier list or are unioned with it, as configured in
+        kmcp.yaml.
+
         Args:
             name (str): You have to pass the same name of the agent that want to update, not create a one new.
             description (str): The updated description of the agent's role.
             skills (list): The new complete list of skills/tools the agent is authorized to use.
                            This replaces the previous skill set entirely.
             user_id (str): The identifier of the user performing the update (for authorization).
+            namespace (str, optional): Namespace of the agent. Defaults to the
+                                       control plane's default namespace.
+
+        Only the fields that differ from the agent's current configuration are written.
+        If nothing differs, the agent is left untouched and is not restarted.
 
         Returns:
             str: A confirmation message indicating the successful synchronization of the
-                 new configuration and the updated status of the agent.
+                 new configuration and the updated status of the agent, followed by the
+                 changes that were applied.
     """
     try:
-        config.load_kube_config()
-    except:
-        config.load_incluster_config()
-
-    k8s_client = client.ApiClient()
-    dynamic_client = dynamic.DynamicClient(k8s_client)
-
-    populated_skills = {}
-    for skill in skills:
-        key = f"skill-{skill.lower().replace(' ', '-')}"
-        populated_skills[key] = skill
-
-    data_vars = {
-        "name": name,
-        "description": description,
-        "skills": populated_skills
-    }
-
-    with open("agent-template.yaml", "r") as f:
-        template_content = f.read()
-
-    template = Template(template_content)
-    rendered_string = template.render(data_vars)
-    resource_data = yaml.safe_load(rendered_string)
-
-    try:
-        api_resource = dynamic_client.resources.get(
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+    config = get_tool_config("update_agent_config")
+
+    async def write(
+        description: str, skills: list[str]
+    ) -> tuple[str | None, list[dict]]:
+        resource_data = render_agent_manifest(name, description, skills)
+        dynamic_client = await get_kube_client().dynamic()
+        api_resource = await dynamic_client.resources.get(
             api_version="kagent.dev/v1alpha2",
             kind="Agent"
         )
 
-        dynamic_client.patch(
+        async def fetch() -> dict | None:
+            try:
+                found = await dynamic_client.get(
+                    resource=api_resource, name=name, namespace=namespace
+                )
+            except NotFoundError:
+                return None
+            return found.to_dict()
+
+        current = await read_current(namespace, name, fetch)
+        patch, changes = plan_patch(current or {}, resource_data)
+        if not changes:
+            return current["metadata"].get("resourceVersion"), []
+
+        result = await dynamic_client.patch(
             resource=api_resource,
-            body=resource_data,
+            body=patch,
             name=name,
-            namespace="kagent",
+            namespace=namespace,
             content_type="application/merge-patch+json"
         )
+        invalidate("agents")
+        metadata = getattr(result, "metadata", None)
+        resource_version = getattr(metadata, "resourceVersion", None)
+        record_version(namespace, name, resource_version)
+        return resource_version, changes
 
-        success_msg = f"Resource '{name}' updated successfully via Patch."
+    try:
+        update = await get_update_queue().submit(
+            namespace,
+            name,
+            description,
+            list(skills),
+            write,
+            window=config.get("coalesce_window"),
+            policy=config.get("skills_merge"),
+        )
+        get_idle_reconciler().touch(namespace, name)
+
+        if update.written:
+            success_msg = f"Resource '{name}' updated successfully via Patch."
+        else:
+            success_msg = (
+                f"Resource '{name}' is already up to date, no patch was applied."
+            )
+        if update.resource_version:
+            success_msg += f" resourceVersion: {update.resource_version}."
+        if update.merged > 1:
+            success_msg += f" Merged with {update.merged - 1} concurrent update(s)."
+        if update.written:
+            success_msg += f"\nChanges:\n{json.dumps(update.changes, indent=2)}"
         print(success_msg)
         return success_msg
+    except FileNotFoundError:
+        error_message = f"Error: {DEFAULT_TEMPLATE_PATH} not found."
+        print(error_message)
+        return error_message
+    except (TemplateError, yaml.YAMLError) as e:
+        error_message = f"Error: {DEFAULT_TEMPLATE_PATH} could not be rendered: {e}"
+        print(error_message)
+        return error_message
     except ResourceNotFoundError:
 
         error_message = "Error: The CRD 'Agent' (kagent.dev/v1alpha2) is not installed in the cluster."
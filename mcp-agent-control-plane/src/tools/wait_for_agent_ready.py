@@ -0,0 +1,69 @@
+"""wait_for_agent_ready tool for MCP server."""
+
+import json
+import time
+
+from fastmcp import Context
+
+from core.catalog import resolve_namespace
+from core.jobs import wait_until_ready
+from core.server import mcp
+
+MAX_TIMEOUT = 900.0
+
+
+@mcp.tool()
+async def wait_for_agent_ready(
+    name: str,
+    timeout: float = 120.0,
+    namespace: str | None = None,
+    ctx: Context | None = None,
+) -> str:
+    """
+    Waits until an agent's deployment reports Ready, or the timeout passes.
+
+    Readiness changes are followed through the agent catalog's watch on the cluster,
+    not by polling, and are reported as MCP progress notifications when the caller
+    requests them.
+
+    Args:
+        name (str): The agent name.
+        timeout (float, optional): Maximum seconds to wait (at most 900).
+                                   Defaults to 120.
+        namespace (str, optional): Namespace of the agent. Defaults to the
+                                   control plane's default namespace.
+
+    Returns:
+        str: A JSON object {"name", "ready", "reason", "message", "waited_seconds"}.
+    """
+    if not 0 <= timeout <= MAX_TIMEOUT:
+        return f"Error: timeout must be between 0 and {MAX_TIMEOUT:g} seconds."
+
+    try:
+        namespace = resolve_namespace(namespace)
+    except ValueError as e:
+        return f"Error: {e}"
+    started = time.monotonic()
+    updates = 0
+
+    async def report(readiness: dict) -> None:
+        nonlocal updates
+        updates += 1
+        if ctx is not None:
+            await ctx.report_progress(
+                progress=updates,
+                message=f"{readiness['reason']}: {readiness['message']}",
+            )
+
+    readiness = await wait_until_ready(namespace, name, timeout, report)
+    if readiness["reason"] == "CatalogUnavailable":
+        return f"Error: {readiness['message']}; readiness cannot be followed."
+
+    return json.dumps(
+        {
+            "name": name,
+            **readiness,
+            "waited_seconds": round(time.monotonic() - started, 3),
+        },
+        indent=2,
+    )
@@ -0,0 +1,132 @@
+"""Tests for the TTL result cache with single-flight."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.server import cached, invalidate  # noqa: E402
+
+
+class Backend:
+    """Counts calls and optionally blocks until released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def fetch(self, key: str) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"[{key}:{self.calls}]"
+
+
+class TestCached:
+    """Test the cache decorator."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_coalesce(self) -> None:
+        """Test that a burst of identical calls reaches the backend once."""
+        backend = Backend()
+        backend.release.clear()
+
+        @cached(ttl=60)
+        async def burst_tool(key: str, compact: bool = False) -> str:
+            return await backend.fetch(key)
+
+        calls = [asyncio.ensure_future(burst_tool("a")) for _ in range(20)]
+        calls.append(asyncio.ensure_future(burst_tool(key="a", compact=False)))
+        await asyncio.sleep(0)
+        backend.release.set()
+        results = await asyncio.gather(*calls)
+
+        assert backend.calls == 1
+        assert set(results) == {"[a:1]"}
+        assert burst_tool.cache.stats()["coalesced"] == 20
+        assert await burst_tool("a") == "[a:1]"
+        assert burst_tool.cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self) -> None:
+        """Test that results are recomputed once their TTL has passed."""
+        backend = Backend()
+
+        @cached(ttl=0.05)
+        async def ttl_tool(key: str) -> str:
+            return await backend.fetch(key)
+
+        assert await ttl_tool("a") == "[a:1]"
+        assert await ttl_tool("a") == "[a:1]"
+        await asyncio.sleep(0.06)
+        assert await ttl_tool("a") == "[a:2]"
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        backend = Backend()
+
+        @cached(ttl=60, maxsize=2)
+        async def lru_tool(key: str) -> str:
+            return await backend.fetch(key)
+
+        await lru_tool("a")
+        await lru_tool("b")
+        await lru_tool("a")
+        await lru_tool("c")
+
+        assert len(lru_tool.cache) == 2
+        assert lru_tool.cache.evictions == 1
+        assert await lru_tool("a") == "[a:1]"
+        assert await lru_tool("b") == "[b:4]"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_tag(self) -> None:
+        """Test that invalidation drops entries and results of running calls."""
+        backend = Backend()
+
+        @cached(ttl=60, tags=("agents-test",))
+        async def tagged_tool(key: str) -> str:
+            return await backend.fetch(key)
+
+        await tagged_tool("a")
+        invalidate("agents-test")
+        assert await tagged_tool("a") == "[a:2]"
+
+        backend.release.clear()
+        running = asyncio.ensure_future(tagged_tool("b"))
+        await asyncio.sleep(0)
+        invalidate("agents-test")
+        backend.release.set()
+        assert await running == "[b:3]"
+        assert await tagged_tool("b") == "[b:4]"
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self) -> None:
+        """Test that rejected results and exceptions are not stored."""
+        backend = Backend()
+
+        @cached(ttl=60, cache_if=lambda output: output.startswith("["))
+        async def flaky_tool(key: str) -> str:
+            await backend.fetch(key)
+            if backend.calls == 1:
+                return "Error connecting to cluster"
+            if backend.calls == 2:
+                raise RuntimeError("boom")
+            return "[ok]"
+
+        assert await flaky_tool("a") == "Error connecting to cluster"
+        with pytest.raises(RuntimeError):
+            await flaky_tool("a")
+        assert await flaky_tool("a") == "[ok]"
+        assert await flaky_tool("a") == "[ok]"
+        assert backend.calls == 3
+
+    def test_requires_async_function(self) -> None:
+        """Test that sync functions are rejected."""
+        with pytest.raises(TypeError):
+            cached()(lambda: None)
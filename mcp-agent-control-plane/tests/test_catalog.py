@@ -0,0 +1,149 @@
+"""Tests for the watch-backed agent catalog."""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from kubernetes_asyncio.client.rest import ApiException
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.catalog import (  # noqa: E402
+    AgentCatalog,
+    CatalogShards,
+    managed_namespaces,
+    resolve_namespace,
+)
+
+
+def make_agent(name: str, resource_version: str, namespace: str = "kagent") -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "uid": f"uid-{name}",
+            "resourceVersion": resource_version,
+        },
+        "spec": {"description": f"{name} description"},
+    }
+
+
+class TestAgentCatalog:
+    """Test cache maintenance from LIST and WATCH results."""
+
+    def test_new_catalog_is_stale(self) -> None:
+        """Test that an unsynced catalog is never served."""
+        catalog = AgentCatalog()
+        assert catalog.is_stale()
+        assert catalog.age() is None
+        assert catalog.status()["synced"] is False
+
+    def test_replace_seeds_cache(self) -> None:
+        """Test that a LIST result replaces the cache and records its version."""
+        catalog = AgentCatalog()
+        catalog.replace([make_agent("a", "1"), make_agent("b", "2")], "10")
+
+        assert not catalog.is_stale()
+        assert catalog.resource_version == "10"
+        assert {a["metadata"]["name"] for a in catalog.list_agents()} == {"a", "b"}
+
+    def test_apply_events(self) -> None:
+        """Test ADDED, MODIFIED, DELETED and BOOKMARK handling."""
+        catalog = AgentCatalog()
+        catalog.replace([make_agent("a", "1")], "10")
+
+        catalog.apply_event("ADDED", make_agent("b", "11"))
+        modified = make_agent("a", "12")
+        modified["spec"]["description"] = "changed"
+        catalog.apply_event("MODIFIED", modified)
+        catalog.apply_event("DELETED", make_agent("b", "13"))
+        catalog.apply_event("BOOKMARK", {"metadata": {"resourceVersion": "20"}})
+
+        agents = catalog.list_agents()
+        assert len(agents) == 1
+        assert agents[0]["spec"]["description"] == "changed"
+        assert catalog.resource_version == "20"
+
+    def test_same_name_in_different_namespaces(self) -> None:
+        """Test that agents are keyed by namespace and name."""
+        catalog = AgentCatalog()
+        catalog.replace(
+            [make_agent("a", "1", "team-1"), make_agent("a", "2", "team-2")], "10"
+        )
+        assert len(catalog.list_agents()) == 2
+
+    def test_staleness_threshold(self) -> None:
+        """Test that the catalog turns stale without API server contact."""
+        catalog = AgentCatalog(max_staleness=30)
+        catalog.replace([], "1")
+
+        with patch("core.catalog.time.monotonic", return_value=catalog._last_sync + 31):
+            assert catalog.is_stale()
+            assert catalog.status()["age_seconds"] == pytest.approx(31)
+
+    @pytest.mark.asyncio
+    async def test_relist_on_410_gone(self) -> None:
+        """Test that an expired resourceVersion triggers a fresh LIST."""
+        catalog = AgentCatalog(retry_delay=0)
+        watches = 0
+
+        async def fake_relist(custom_api: object) -> None:
+            catalog.replace([make_agent("a", "1")], str(catalog.relist_count + 1))
+            catalog.relist_count += 1
+
+        async def fake_watch(custom_api: object) -> None:
+            nonlocal watches
+            watches += 1
+            if watches == 1:
+                raise ApiException(status=410, reason="Gone")
+            await asyncio.sleep(3600)
+
+        with patch.object(catalog, "_relist", fake_relist), patch.object(
+            catalog, "_watch", fake_watch
+        ):
+            catalog._task = asyncio.create_task(catalog._run())
+            for _ in range(100):
+                if watches >= 2:
+                    break
+                await asyncio.sleep(0.01)
+            await catalog.stop()
+
+        assert catalog.relist_count == 2
+        assert catalog.resource_version == "2"
+
+
+class TestCatalogShards:
+    """Test the namespaces the control plane manages and their shards."""
+
+    def test_default_namespace_only(self, monkeypatch) -> None:
+        """Test that NAMESPACE alone is managed when AGENT_NAMESPACES is unset."""
+        monkeypatch.delenv("AGENT_NAMESPACES", raising=False)
+        monkeypatch.setenv("NAMESPACE", "team-1")
+
+        assert managed_namespaces() == ["team-1"]
+        assert resolve_namespace(None) == "team-1"
+
+    def test_resolve_namespace(self, monkeypatch) -> None:
+        """Test defaulting and rejection of unmanaged namespaces."""
+        monkeypatch.setenv("AGENT_NAMESPACES", "team-1, team-2,team-1")
+        monkeypatch.setenv("NAMESPACE", "team-2")
+
+        assert managed_namespaces() == ["team-1", "team-2"]
+        assert resolve_namespace(None) == "team-2"
+        assert resolve_namespace("team-1") == "team-1"
+        with pytest.raises(ValueError):
+            resolve_namespace("team-3")
+
+    def test_shards_are_independent(self) -> None:
+        """Test that each namespace has its own cache and status."""
+        shards = CatalogShards(["team-1", "team-2"])
+        shards.shard("team-1").replace([make_agent("a", "1", "team-1")], "10")
+
+        assert len(shards.shard("team-1")) == 1
+        assert shards.shard("team-2").is_stale()
+        assert shards.status()["team-1"]["namespace"] == "team-1"
+        with pytest.raises(ValueError):
+            shards.shard("team-3")
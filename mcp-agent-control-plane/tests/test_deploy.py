@@ -0,0 +1,137 @@
+"""Tests for the server-side-apply deploy engine."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from kubernetes_asyncio.dynamic.exceptions import ResourceNotFoundError
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.deploy import (  # noqa: E402
+    FIELD_MANAGER,
+    MANAGED_BY_LABEL,
+    AgentDeployer,
+    agent_manifests,
+)
+
+API_DELAY = 0.05
+
+
+class FakeApplyServer:
+    """Dynamic client stand-in that stores applied objects like the API server.
+
+    resourceVersion is only bumped when an apply changes the stored object.
+    """
+
+    def __init__(self, missing_kinds: tuple[str, ...] = ()) -> None:
+        self.missing_kinds = missing_kinds
+        self.objects: dict[str, dict[str, Any]] = {}
+        self.versions: dict[str, int] = {}
+        self.log: list[tuple[str, str, float]] = []
+        self.resources = SimpleNamespace(get=self._get)
+        self._counter = 0
+
+    async def _get(self, api_version: str, kind: str) -> SimpleNamespace:
+        if kind in self.missing_kinds:
+            raise ResourceNotFoundError(f"No matches found for {kind}")
+        return SimpleNamespace(kind=kind)
+
+    async def server_side_apply(
+        self, resource: SimpleNamespace, body: dict, namespace: str, **kwargs: Any
+    ) -> SimpleNamespace:
+        assert kwargs["field_manager"] == FIELD_MANAGER
+        assert kwargs["force_conflicts"] is True
+        self.log.append(("start", resource.kind, time.perf_counter()))
+        await asyncio.sleep(API_DELAY)
+
+        key = f"{resource.kind}/{namespace}/{body['metadata']['name']}"
+        if self.objects.get(key) != body:
+            self._counter += 1
+            self.objects[key] = body
+            self.versions[key] = self._counter
+        self.log.append(("end", resource.kind, time.perf_counter()))
+        return SimpleNamespace(
+            metadata=SimpleNamespace(resourceVersion=str(self.versions[key]))
+        )
+
+    def at(self, phase: str, kind: str) -> float:
+        return next(t for p, k, t in self.log if p == phase and k == kind)
+
+
+def manifests() -> dict:
+    return agent_manifests("tutor", "Teaches things", ["python"], "kagent")
+
+
+class TestAgentDeployer:
+    """Test dependency ordering, concurrency and idempotency."""
+
+    @pytest.mark.asyncio
+    async def test_applies_all_objects(self) -> None:
+        """Test that every object is applied with its namespace."""
+        server = FakeApplyServer()
+        versions = await AgentDeployer(server).deploy(manifests(), "kagent")
+
+        assert set(versions) == {"ServiceAccount", "Role", "RoleBinding", "Agent"}
+        assert "Agent/kagent/tutor" in server.objects
+        assert server.objects["Agent/kagent/tutor"]["metadata"]["namespace"] == "kagent"
+
+    @pytest.mark.asyncio
+    async def test_dependency_order_and_overlap(self) -> None:
+        """Test that independent objects overlap and dependents wait."""
+        server = FakeApplyServer()
+
+        started = time.perf_counter()
+        await AgentDeployer(server).deploy(manifests(), "kagent")
+        elapsed = time.perf_counter() - started
+
+        assert server.at("start", "RoleBinding") >= server.at("end", "Role")
+        assert server.at("start", "Agent") >= server.at("end", "ServiceAccount")
+        assert server.at("start", "Role") < server.at("end", "ServiceAccount")
+        # Two chained round trips, not four sequential ones.
+        assert elapsed < 3 * API_DELAY
+
+    @pytest.mark.asyncio
+    async def test_redeploy_is_a_no_op(self) -> None:
+        """Test that re-running a deploy leaves every object unchanged."""
+        server = FakeApplyServer()
+        deployer = AgentDeployer(server)
+
+        first = await deployer.deploy(manifests(), "kagent")
+        second = await deployer.deploy(manifests(), "kagent")
+
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_changed_spec_is_converged(self) -> None:
+        """Test that a re-deploy with a new description updates the Agent."""
+        server = FakeApplyServer()
+        deployer = AgentDeployer(server)
+
+        first = await deployer.deploy(manifests(), "kagent")
+        changed = agent_manifests("tutor", "New description", ["python"], "kagent")
+        second = await deployer.deploy(changed, "kagent")
+
+        assert second["Agent"] != first["Agent"]
+        assert second["Role"] == first["Role"]
+
+    @pytest.mark.asyncio
+    async def test_missing_crd_writes_nothing(self) -> None:
+        """Test that a missing Agent CRD aborts before any write."""
+        server = FakeApplyServer(missing_kinds=("Agent",))
+
+        with pytest.raises(ResourceNotFoundError):
+            await AgentDeployer(server).deploy(manifests(), "kagent")
+        assert server.objects == {}
+
+    def test_agent_is_labelled_as_managed(self) -> None:
+        """Test that deployed Agents carry the managed-by label next to their skills."""
+        labels = manifests()["Agent"]["metadata"]["labels"]
+
+        assert labels[MANAGED_BY_LABEL] == FIELD_MANAGER
+        assert labels["skill-python"] == "python"
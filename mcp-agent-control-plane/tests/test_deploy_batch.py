@@ -0,0 +1,117 @@
+"""Tests for the deploy_agents_batch tool."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.server import DynamicMCPServer  # noqa: E402
+
+
+class TrackingKubeClient:
+    """Fake shared client that tracks how many agents deploy at once."""
+
+    def __init__(self, failing: str | None = None) -> None:
+        self.failing = failing
+        self.in_flight: set[str] = set()
+        self.peak = 0
+
+    async def _get(self, api_version: str, kind: str) -> SimpleNamespace:
+        return SimpleNamespace(kind=kind)
+
+    async def _apply(self, resource: SimpleNamespace, body: dict, **kwargs: object):
+        agent = body["metadata"]["name"].split("-")[0]
+        self.in_flight.add(agent)
+        self.peak = max(self.peak, len(self.in_flight))
+        await asyncio.sleep(0.02)
+        if agent == self.failing:
+            self.in_flight.discard(agent)
+            raise RuntimeError(f"boom {agent}")
+        if resource.kind in ("Agent", "RoleBinding"):
+            self.in_flight.discard(agent)
+        return SimpleNamespace(metadata=SimpleNamespace(resourceVersion="1"))
+
+    async def dynamic(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            resources=SimpleNamespace(get=self._get), server_side_apply=self._apply
+        )
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.progress: list[tuple[float, float | None, str | None]] = []
+
+    async def report_progress(
+        self, progress: float, total: float | None = None, message: str | None = None
+    ) -> None:
+        self.progress.append((progress, total, message))
+
+
+@pytest.fixture
+def batch_tool():
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    tool = server.get_tools_sync()["deploy_agents_batch"]
+    return tool, sys.modules["tools.deploy_agents_batch"]
+
+
+def specs(module, count: int) -> list:
+    return [
+        module.AgentSpec(name=f"agent{i}", description="Tutor", skills=["python"])
+        for i in range(count)
+    ]
+
+
+class TestDeployAgentsBatch:
+    """Test bounded concurrency, per-agent results and progress."""
+
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_limit(self, batch_tool) -> None:
+        """Test that no more than max_concurrency agents deploy at once."""
+        tool, module = batch_tool
+        fake = TrackingKubeClient()
+
+        with patch.object(module, "get_kube_client", return_value=fake):
+            output = await tool.fn(specs(module, 12), max_concurrency=3)
+
+        results = json.loads(output)
+        assert [r["name"] for r in results] == [f"agent{i}" for i in range(12)]
+        assert all(r["status"] == "deployed" for r in results)
+        assert 1 < fake.peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_agent(self, batch_tool) -> None:
+        """Test that one failing agent does not abort the batch."""
+        tool, module = batch_tool
+        fake = TrackingKubeClient(failing="agent1")
+
+        with patch.object(module, "get_kube_client", return_value=fake):
+            results = json.loads(await tool.fn(specs(module, 3), max_concurrency=2))
+
+        assert [r["status"] for r in results] == ["deployed", "failed", "deployed"]
+        assert "boom" in results[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_reports_progress(self, batch_tool) -> None:
+        """Test that one progress notification is sent per agent."""
+        tool, module = batch_tool
+        ctx = FakeContext()
+
+        with patch.object(module, "get_kube_client", return_value=TrackingKubeClient()):
+            await tool.fn(specs(module, 4), max_concurrency=2, ctx=ctx)
+
+        assert [p[0] for p in ctx.progress] == [1, 2, 3, 4]
+        assert all(p[1] == 4 for p in ctx.progress)
+
+    def test_context_not_in_schema(self, batch_tool) -> None:
+        """Test that the MCP context is injected rather than exposed."""
+        tool, _ = batch_tool
+        properties = set(tool.parameters["properties"])
+        assert properties == {"agents", "max_concurrency", "namespace"}
@@ -0,0 +1,123 @@
+"""Tests that the write tools run concurrently without blocking the event loop."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.server import DynamicMCPServer  # noqa: E402
+
+API_DELAY = 0.05
+
+
+async def slow_call(*args: object, **kwargs: object) -> dict:
+    await asyncio.sleep(API_DELAY)
+    return {}
+
+
+class FakeKubeClient:
+    """Stand-in for the shared client whose API calls take API_DELAY seconds."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def _call(self, *args: object, **kwargs: object) -> dict:
+        self.calls += 1
+        return await slow_call()
+
+    async def _apply(self, *args: object, **kwargs: object) -> SimpleNamespace:
+        await self._call()
+        return SimpleNamespace(metadata=SimpleNamespace(resourceVersion="1"))
+
+    async def _get(self, *args: object, **kwargs: object) -> SimpleNamespace:
+        await self._call()
+        agent = {"metadata": {"resourceVersion": "1"}, "spec": {"description": "Old"}}
+        return SimpleNamespace(to_dict=lambda: agent)
+
+    async def core_v1(self) -> SimpleNamespace:
+        return SimpleNamespace(create_namespaced_service_account=self._call)
+
+    async def rbac_v1(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            create_namespaced_role=self._call,
+            create_namespaced_role_binding=self._call,
+        )
+
+    async def dynamic(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            resources=SimpleNamespace(get=slow_call),
+            server_side_apply=self._apply,
+            get=self._get,
+            patch=self._call,
+        )
+
+
+async def max_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Measure the worst delay of a periodic timer while other work runs."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+def load_tool(name: str):
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    return server.get_tools_sync()[name].fn, sys.modules[f"tools.{name}"]
+
+
+class TestNonBlockingWriteTools:
+    """Test concurrent execution of deploy_new_agent and update_agent_config."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_deploys(self) -> None:
+        """Test that N deploys overlap and never stall the event loop."""
+        deploy, module = load_tool("deploy_new_agent")
+        fake = FakeKubeClient()
+        n = 20
+
+        with patch.object(module, "get_kube_client", return_value=fake):
+            stop = asyncio.Event()
+            lag = asyncio.create_task(max_loop_lag(stop))
+
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(deploy(f"agent-{i}", "Test agent", ["python"]) for i in range(n))
+            )
+            elapsed = time.perf_counter() - started
+
+            stop.set()
+            worst_lag = await lag
+
+        assert all(r.startswith("Successfully deployed") for r in results)
+        assert fake.calls == n * 4
+        # Serially this would take n * 4 * API_DELAY = 4 seconds.
+        assert elapsed < n * 4 * API_DELAY / 4
+        # A blocking client would freeze the loop for every round trip in turn.
+        assert worst_lag < 4 * API_DELAY
+
+    @pytest.mark.asyncio
+    async def test_parallel_updates(self) -> None:
+        """Test that concurrent updates overlap instead of running one by one."""
+        update, module = load_tool("update_agent_config")
+        fake = FakeKubeClient()
+        n = 20
+
+        with patch.object(module, "get_kube_client", return_value=fake):
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(update(f"agent-{i}", "Updated", ["python"]) for i in range(n))
+            )
+            elapsed = time.perf_counter() - started
+
+        assert all("updated successfully" in r for r in results)
+        assert elapsed < n * API_DELAY / 2
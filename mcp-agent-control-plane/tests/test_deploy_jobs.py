@@ -0,0 +1,289 @@
+"""Tests for background deploy jobs and readiness tracking."""
+
+import asyncio
+import json
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Add src and benchmarks to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from fake_kube import FakeKubeAPI  # noqa: E402
+from kubernetes_asyncio.client.rest import ApiException  # noqa: E402
+
+from core import jobs  # noqa: E402
+from core.catalog import AgentCatalog  # noqa: E402
+from core.kube import KubeClient  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+from core.views import agent_readiness  # noqa: E402
+
+
+def make_agent(
+    generation: int = 1, ready: str | None = None, observed: int = 1
+) -> dict:
+    agent = {
+        "metadata": {"name": "tutor", "namespace": "kagent", "generation": generation},
+        "spec": {"description": "Tutor"},
+    }
+    if ready is not None:
+        agent["status"] = {
+            "conditions": [
+                {
+                    "type": "Ready",
+                    "status": ready,
+                    "reason": "R",
+                    "observedGeneration": observed,
+                }
+            ]
+        }
+    return agent
+
+
+@asynccontextmanager
+async def cluster(tmp_path, monkeypatch, ready_after=0.05):
+    """Fake API server with a running catalog, wired into core.jobs."""
+    fake = FakeKubeAPI(ready_after=ready_after)
+    await fake.start()
+    monkeypatch.setenv(
+        "KUBECONFIG", str(fake.write_kubeconfig(tmp_path / "kubeconfig"))
+    )
+    monkeypatch.delenv("KUBERNETES_SERVICE_HOST", raising=False)
+    kube = KubeClient()
+    catalog = AgentCatalog()
+    try:
+        await catalog.start(await kube.connect())
+        assert await catalog.wait_synced(5)
+        with (
+            patch.object(jobs, "get_kube_client", return_value=kube),
+            patch.object(jobs, "get_agent_catalog", return_value=catalog),
+        ):
+            yield fake, catalog
+    finally:
+        await catalog.stop()
+        await kube.close()
+        await fake.stop()
+
+
+async def finished(manager: jobs.DeployJobManager, job: jobs.DeployJob) -> None:
+    for _ in range(200):
+        if job.done:
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job stuck in {job.state}")
+
+
+class TestAgentReadiness:
+    """Test the readiness summary of an Agent."""
+
+    def test_ready_condition(self) -> None:
+        """Test that a True Ready condition for this generation is ready."""
+        assert agent_readiness(make_agent(ready="True"))["ready"] is True
+        assert agent_readiness(make_agent(ready="False"))["ready"] is False
+
+    def test_condition_from_older_generation(self) -> None:
+        """Test that Ready from before the last update does not count."""
+        readiness = agent_readiness(make_agent(generation=2, ready="True", observed=1))
+        assert readiness == {
+            "ready": False,
+            "reason": "Reconciling",
+            "message": "Generation 2 not yet observed",
+        }
+
+    def test_missing_agent_and_condition(self) -> None:
+        """Test the reasons for agents without a Ready condition."""
+        assert agent_readiness(None)["reason"] == "NotFound"
+        assert agent_readiness(make_agent())["reason"] == "Pending"
+
+
+class TestCatalogWaitFor:
+    """Test waiting on catalog events."""
+
+    @pytest.mark.asyncio
+    async def test_wakes_on_event(self) -> None:
+        """Test that a waiter returns as soon as the watch delivers a match."""
+        catalog = AgentCatalog()
+        catalog.replace([make_agent()], "1")
+        seen = []
+
+        async def on_change(item):
+            seen.append(agent_readiness(item)["reason"])
+
+        async def mark_ready():
+            await asyncio.sleep(0.05)
+            catalog.apply_event("MODIFIED", make_agent(ready="True"))
+
+        asyncio.get_running_loop().create_task(mark_ready())
+        item = await catalog.wait_for(
+            "kagent", "tutor", lambda item: agent_readiness(item)["ready"], 5, on_change
+        )
+
+        assert agent_readiness(item)["ready"] is True
+        assert seen == ["Pending", "R"]
+
+    @pytest.mark.asyncio
+    async def test_times_out(self) -> None:
+        """Test that the last state is returned when the predicate is never met."""
+        catalog = AgentCatalog()
+        catalog.replace([], "1")
+
+        item = await catalog.wait_for(
+            "kagent", "tutor", lambda item: item is not None, 0.05
+        )
+
+        assert item is None
+
+
+class TestDeployJobManager:
+    """Test deploy jobs against the fake API server."""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_until_ready(self, tmp_path, monkeypatch) -> None:
+        """Test that a job applies the agent and follows it to Ready."""
+        async with cluster(tmp_path, monkeypatch) as (fake, _):
+            manager = jobs.DeployJobManager()
+            job = manager.submit("tutor", "Tutor", ["math"], "kagent")
+            assert job.state == "pending"
+
+            await finished(manager, job)
+
+            assert job.state == "ready"
+            assert [entry["state"] for entry in job.history] == [
+                "pending",
+                "applying",
+                "waiting",
+                "ready",
+            ]
+            assert set(job.resource_versions) == {
+                "ServiceAccount",
+                "Role",
+                "RoleBinding",
+                "Agent",
+            }
+            assert fake.requests["patch agents"] == 1
+
+    @pytest.mark.asyncio
+    async def test_job_times_out(self, tmp_path, monkeypatch) -> None:
+        """Test that an agent that never becomes ready times the job out."""
+        async with cluster(tmp_path, monkeypatch, ready_after=None):
+            manager = jobs.DeployJobManager()
+            with patch.object(
+                jobs, "get_tool_config", return_value={"ready_timeout": 0.1}
+            ):
+                job = manager.submit("tutor", "Tutor", ["math"], "kagent")
+                await finished(manager, job)
+
+            assert job.state == "timed_out"
+            assert job.readiness["reason"] == "Pending"
+
+    @pytest.mark.asyncio
+    async def test_job_fails_on_api_error(self) -> None:
+        """Test that a rejected apply fails the job with the API reason."""
+        manager = jobs.DeployJobManager()
+        error = ApiException(status=403, reason="Forbidden")
+        with (
+            patch.object(jobs, "get_kube_client", return_value=AsyncMock()),
+            patch.object(jobs, "deploy_agent", AsyncMock(side_effect=error)),
+        ):
+            job = manager.submit("tutor", "Tutor", ["math"], "kagent")
+            await finished(manager, job)
+
+        assert job.state == "failed"
+        assert job.error == "K8s API Error: Forbidden"
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_are_pruned(self) -> None:
+        """Test that only `retention` finished jobs are kept."""
+        manager = jobs.DeployJobManager(retention=2)
+        with (
+            patch.object(jobs, "get_kube_client", return_value=AsyncMock()),
+            patch.object(
+                jobs, "deploy_agent", AsyncMock(side_effect=FileNotFoundError)
+            ),
+        ):
+            for i in range(4):
+                job = manager.submit(f"tutor-{i}", "Tutor", [], "kagent")
+                await finished(manager, job)
+
+        assert len(manager) <= 3
+        assert manager.get(job.id) is job
+
+
+class TestDeployJobTools:
+    """Test the tools that start and follow deploy jobs."""
+
+    @pytest.mark.asyncio
+    async def test_background_deploy_and_status(self, tmp_path, monkeypatch) -> None:
+        """Test background deploys, get_deploy_status and wait_for_agent_ready."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+        server.load_tools()
+        tools = server.get_tools_sync()
+        manager = jobs.DeployJobManager()
+        monkeypatch.setenv("NAMESPACE", "kagent")
+
+        async with cluster(tmp_path, monkeypatch) as (_, catalog):
+            with (
+                patch.object(
+                    sys.modules["tools.deploy_new_agent"],
+                    "get_deploy_jobs",
+                    return_value=manager,
+                ),
+                patch.object(
+                    sys.modules["tools.get_deploy_status"],
+                    "get_deploy_jobs",
+                    return_value=manager,
+                ),
+                patch.object(
+                    sys.modules["tools.get_deploy_status"],
+                    "get_agent_catalog",
+                    return_value=catalog,
+                ),
+            ):
+                started = json.loads(
+                    await tools["deploy_new_agent"].fn(
+                        "tutor", "Tutor", ["math"], background=True
+                    )
+                )
+                ready = json.loads(
+                    await tools["wait_for_agent_ready"].fn("tutor", timeout=5)
+                )
+                await finished(manager, manager.get(started["job_id"]))
+                status = json.loads(
+                    await tools["get_deploy_status"].fn(started["job_id"])
+                )
+                missing = await tools["get_deploy_status"].fn("nope")
+
+        assert started["state"] == "pending"
+        assert ready["ready"] is True
+        assert status["state"] == "ready"
+        assert status["readiness"]["ready"] is True
+        assert missing.startswith("Error:")
+
+    @pytest.mark.asyncio
+    async def test_background_deploy_refused_with_several_workers(
+        self, monkeypatch
+    ) -> None:
+        """Test that background deploys are refused when jobs cannot be shared."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+        server.load_tools()
+        tools = server.get_tools_sync()
+        manager = jobs.DeployJobManager()
+        monkeypatch.setenv("NAMESPACE", "kagent")
+        monkeypatch.setenv("MCP_WORKERS", "4")
+
+        with patch.object(
+            sys.modules["tools.deploy_new_agent"],
+            "get_deploy_jobs",
+            return_value=manager,
+        ):
+            result = await tools["deploy_new_agent"].fn(
+                "tutor", "Tutor", ["math"], background=True
+            )
+
+        assert result.startswith("Error:")
+        assert "wait_for_agent_ready" in result
+        assert len(manager) == 0
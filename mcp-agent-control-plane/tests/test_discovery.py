@@ -9,6 +9,7 @@ import pytest
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from core.registry import LazyTool  # noqa: E402
 from core.server import DynamicMCPServer  # noqa: E402
 
 
@@ -92,3 +93,118 @@ def wrong_name(message: str) -> str:
             # Should not raise exception
             server.load_tools()
             assert len(server.loaded_tools) == 0
+
+
+def _write_tool(tools_dir: Path, name: str, reply: str) -> Path:
+    tool_file = tools_dir / f"{name}.py"
+    tool_file.write_text(f'''
+from core.server import mcp
+
+@mcp.tool()
+def {name}(message: str, times: int = 1) -> str:
+    """Echo a message."""
+    return "{reply}: " + message * times
+''')
+    return tool_file
+
+
+class TestLazyToolLoading:
+    """Test registering tools from the manifest and importing them on first call."""
+
+    def _build_manifest(self, tools_dir: Path) -> DynamicMCPServer:
+        server = DynamicMCPServer(name="Eager", tools_dir=str(tools_dir))
+        server.load_tools()
+        assert server.manifest.save()
+        return server
+
+    def test_lazy_tools_are_not_imported(self) -> None:
+        """Test that manifest-backed tools advertise the same schema without import."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tools_dir = Path(temp_dir)
+            _write_tool(tools_dir, "lazy_echo", "Echo")
+            eager = self._build_manifest(tools_dir).get_tools_sync()["lazy_echo"]
+            sys.modules.pop("tools.lazy_echo")
+
+            server = DynamicMCPServer(name="Lazy", tools_dir=str(tools_dir), lazy=True)
+            server.load_tools()
+            tool = server.get_tools_sync()["lazy_echo"]
+
+            assert isinstance(tool, LazyTool)
+            assert "tools.lazy_echo" not in sys.modules
+            assert server.loaded_tools == ["lazy_echo"]
+            assert tool.to_mcp_tool() == eager.to_mcp_tool()
+
+    @pytest.mark.asyncio
+    async def test_first_call_imports_module(self) -> None:
+        """Test that calling a lazy tool imports its module and runs the real tool."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tools_dir = Path(temp_dir)
+            _write_tool(tools_dir, "lazy_call", "Echo")
+            self._build_manifest(tools_dir)
+
+            server = DynamicMCPServer(name="Lazy", tools_dir=str(tools_dir), lazy=True)
+            server.load_tools()
+            tool = server.get_tools_sync()["lazy_call"]
+            result = await tool.run({"message": "hi", "times": 2})
+
+            assert result.content[0].text == "Echo: hihi"
+            assert not isinstance(server.get_tools_sync()["lazy_call"], LazyTool)
+            assert "tools.lazy_call" in sys.modules
+
+    def test_stale_manifest_entry_imports_eagerly(self) -> None:
+        """Test that a tool file edited after the manifest was written is imported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tools_dir = Path(temp_dir)
+            _write_tool(tools_dir, "lazy_stale", "Echo")
+            self._build_manifest(tools_dir)
+            _write_tool(tools_dir, "lazy_stale", "Edited")
+
+            server = DynamicMCPServer(name="Lazy", tools_dir=str(tools_dir), lazy=True)
+            server.load_tools()
+
+            assert server.get_tools_sync()["lazy_stale"].fn("a") == "Edited: a"
+            reloaded = DynamicMCPServer(
+                name="Lazy", tools_dir=str(tools_dir), lazy=True
+            )
+            assert reloaded.manifest.tools_for(
+                "lazy_stale", server.modules["lazy_stale"].digest
+            )
+
+
+class TestToolReload:
+    """Test reloading tool files while the server runs."""
+
+    def test_reload_picks_up_changes(self) -> None:
+        """Test that edited, added and deleted tool files are reloaded."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tools_dir = Path(temp_dir)
+            tool_file = _write_tool(tools_dir, "reload_echo", "Echo")
+            server = DynamicMCPServer(name="Reload", tools_dir=str(tools_dir))
+            server.load_tools()
+
+            _write_tool(tools_dir, "reload_echo", "Edited")
+            _write_tool(tools_dir, "reload_added", "Added")
+            reloaded_tools = sorted(server.reload_changed_tools())
+            assert reloaded_tools == ["reload_added", "reload_echo"]
+            assert server.get_tools_sync()["reload_echo"].fn("a") == "Edited: a"
+            assert server.get_tools_sync()["reload_added"].fn("a") == "Added: a"
+
+            tool_file.unlink()
+            assert server.reload_changed_tools() == ["reload_echo"]
+            assert "reload_echo" not in server.get_tools_sync()
+            assert server.reload_changed_tools() == []
+
+    def test_broken_edit_keeps_previous_version(self) -> None:
+        """Test that a tool file that fails to import keeps serving its last version."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tools_dir = Path(temp_dir)
+            tool_file = _write_tool(tools_dir, "reload_broken", "Echo")
+            server = DynamicMCPServer(name="Reload", tools_dir=str(tools_dir))
+            server.load_tools()
+
+            tool_file.write_text("syntax error")
+            assert server.reload_changed_tools() == ["reload_broken"]
+            assert server.get_tools_sync()["reload_broken"].fn("a") == "Echo: a"
+            assert server.loaded_tools == ["reload_broken"]
+            # Not retried until the file changes again
+            assert server.reload_changed_tools() == []
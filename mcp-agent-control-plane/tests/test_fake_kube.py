@@ -0,0 +1,208 @@
+"""Tests for the fake API server the benchmarks run against.
+
+They drive it with the real Kubernetes client, agent catalog and deployer, so
+the benchmarks keep measuring the same code paths a cluster would exercise.
+"""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+# Add src and benchmarks to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from fake_kube import AGENT_GROUP, AGENT_VERSION, FakeKubeAPI  # noqa: E402
+from kubernetes_asyncio import watch  # noqa: E402
+from kubernetes_asyncio.client.rest import ApiException  # noqa: E402
+
+from core.catalog import AgentCatalog, CatalogShards  # noqa: E402
+from core.deploy import deploy_agent  # noqa: E402
+from core.kube import KubeClient  # noqa: E402
+
+
+@asynccontextmanager
+async def running_fake(tmp_path, monkeypatch, **kwargs):
+    """Start a fake API server and a KubeClient connected to it."""
+    fake = FakeKubeAPI(**kwargs)
+    await fake.start()
+    monkeypatch.setenv(
+        "KUBECONFIG", str(fake.write_kubeconfig(tmp_path / "kubeconfig"))
+    )
+    monkeypatch.delenv("KUBERNETES_SERVICE_HOST", raising=False)
+    kube = KubeClient()
+    try:
+        await kube.connect()
+        yield fake, kube
+    finally:
+        await kube.close()
+        await fake.stop()
+
+
+class TestFakeKubeAPI:
+    """Test the fake API server with the real client."""
+
+    @pytest.mark.asyncio
+    async def test_list_pages_with_continue_token(self, tmp_path, monkeypatch):
+        """Test that LIST honors limit and continue."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            fake.seed_agents(5)
+            custom_api = await kube.custom_objects()
+
+            names = []
+            token = None
+            while True:
+                page = await custom_api.list_cluster_custom_object(
+                    AGENT_GROUP, AGENT_VERSION, "agents", limit=2, _continue=token
+                )
+                names.extend(item["metadata"]["name"] for item in page["items"])
+                token = page["metadata"].get("continue")
+                if not token:
+                    break
+
+            assert names == [f"agent-{i:05d}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_catalog_follows_writes(self, tmp_path, monkeypatch):
+        """Test that the agent catalog lists and then watches the fake."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            fake.seed_agents(3)
+            catalog = AgentCatalog()
+            await catalog.start(await kube.connect())
+            try:
+                assert await catalog.wait_synced(5)
+                assert len(catalog) == 3
+
+                await deploy_agent(
+                    await kube.dynamic(), "new-agent", "New", ["python"], "kagent"
+                )
+                for _ in range(100):
+                    if len(catalog) == 4:
+                        break
+                    await asyncio.sleep(0.02)
+                assert len(catalog) == 4
+            finally:
+                await catalog.stop()
+
+    @pytest.mark.asyncio
+    async def test_catalog_shards_watch_their_namespace(self, tmp_path, monkeypatch):
+        """Test that each shard lists and watches only its own namespace."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            fake.seed_agents(3, "tenant-a")
+            fake.seed_agents(2, "tenant-b")
+            fake.seed_agents(4, "unmanaged")
+            shards = CatalogShards(["tenant-a", "tenant-b"])
+            await shards.start(await kube.connect())
+            try:
+                for shard in shards:
+                    assert await shard.wait_synced(5)
+                assert len(shards.shard("tenant-a")) == 3
+                assert len(shards.shard("tenant-b")) == 2
+
+                dynamic = await kube.dynamic()
+                await deploy_agent(dynamic, "new-agent", "New", [], "tenant-b")
+                await deploy_agent(dynamic, "other", "Other", [], "unmanaged")
+                for _ in range(100):
+                    if len(shards.shard("tenant-b")) == 3:
+                        break
+                    await asyncio.sleep(0.02)
+                assert len(shards.shard("tenant-b")) == 3
+                assert len(shards) == 6
+            finally:
+                await shards.stop()
+
+    @pytest.mark.asyncio
+    async def test_server_side_apply_creates_rbac(self, tmp_path, monkeypatch):
+        """Test that deploying an agent applies its ServiceAccount, Role and binding."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            await deploy_agent(
+                await kube.dynamic(), "tutor", "Tutor", ["math"], "kagent"
+            )
+
+            counts = {
+                plural: len(objects) for (_, _, plural), objects in fake.objects.items()
+            }
+            assert counts == {
+                "serviceaccounts": 1,
+                "roles": 1,
+                "rolebindings": 1,
+                "agents": 1,
+            }
+            assert fake.requests["patch agents"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_apply_keeps_resource_version(self, tmp_path, monkeypatch):
+        """Test that re-applying the same object is not a write."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            dynamic = await kube.dynamic()
+            await deploy_agent(dynamic, "tutor", "Tutor", ["math"], "kagent")
+            version = fake.resource_version
+
+            await deploy_agent(dynamic, "tutor", "Tutor", ["math"], "kagent")
+
+            assert fake.resource_version == version
+
+    @pytest.mark.asyncio
+    async def test_patch_agent_rolls_out_a_new_generation(self, tmp_path, monkeypatch):
+        """Test that a spec patch bumps the generation and is reported Ready later."""
+        async with running_fake(tmp_path, monkeypatch, ready_after=0.01) as (fake, _):
+            fake.seed_agents(1)
+
+            patched = fake.patch_agent("agent-00000", {"spec": {"description": "New"}})
+            assert patched["metadata"]["generation"] == 2
+            assert "status" not in patched
+            await asyncio.sleep(0.05)
+
+            ready = fake.agents()[0]
+            assert ready["status"]["observedGeneration"] == 2
+            assert (
+                fake.patch_agent("agent-00000", {"spec": {"description": "New"}})
+                is ready
+            )
+
+            # Nulls are dropped, also inside objects the target did not have yet
+            annotations = {"metadata": {"annotations": {"a": "1", "b": None}}}
+            patched = fake.patch_agent("agent-00000", annotations)
+            assert patched["metadata"]["annotations"] == {"a": "1"}
+
+    @pytest.mark.asyncio
+    async def test_watch_too_old_version_is_gone(self, tmp_path, monkeypatch):
+        """Test that watching from a version outside the event window fails with 410."""
+        async with running_fake(tmp_path, monkeypatch, event_window=2) as (fake, kube):
+            fake.seed_agents(5)
+            custom_api = await kube.custom_objects()
+            stream = watch.Watch()
+            with pytest.raises(ApiException) as excinfo:
+                async for _ in stream.stream(
+                    custom_api.list_cluster_custom_object,
+                    AGENT_GROUP,
+                    AGENT_VERSION,
+                    "agents",
+                    resource_version="1",
+                    timeout_seconds=1,
+                ):
+                    pass
+            await stream.close()
+
+            assert excinfo.value.status == 410
+
+    @pytest.mark.asyncio
+    async def test_injected_latency(self, tmp_path, monkeypatch):
+        """Test that every request is delayed by the configured latency."""
+        async with running_fake(tmp_path, monkeypatch) as (fake, kube):
+            custom_api = await kube.custom_objects()
+            await custom_api.list_cluster_custom_object(
+                AGENT_GROUP, AGENT_VERSION, "agents"
+            )
+            fake.latency = 0.1
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await custom_api.list_cluster_custom_object(
+                AGENT_GROUP, AGENT_VERSION, "agents"
+            )
+
+            assert loop.time() - started >= 0.1
@@ -0,0 +1,217 @@
+"""Tests for scaling idle agents to zero and back."""
+
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add src and benchmarks to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from fake_kube import FakeKubeAPI  # noqa: E402
+
+from core import idle  # noqa: E402
+from core.catalog import AgentCatalog  # noqa: E402
+from core.deploy import FIELD_MANAGER, MANAGED_BY_LABEL  # noqa: E402
+from core.kube import KubeClient  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+from core.views import agent_replicas, agent_state, agent_view  # noqa: E402
+
+HOUR = 3600.0
+
+
+@asynccontextmanager
+async def cluster(tmp_path, monkeypatch, agents=2):
+    """Fake API server with seeded agents and a running catalog, wired to core.idle."""
+    fake = FakeKubeAPI()
+    fake.seed_agents(agents)
+    for agent in fake.agents():
+        agent["metadata"]["labels"][MANAGED_BY_LABEL] = FIELD_MANAGER
+    await fake.start()
+    monkeypatch.setenv(
+        "KUBECONFIG", str(fake.write_kubeconfig(tmp_path / "kubeconfig"))
+    )
+    monkeypatch.delenv("KUBERNETES_SERVICE_HOST", raising=False)
+    kube = KubeClient()
+    catalog = AgentCatalog()
+    try:
+        await catalog.start(await kube.connect())
+        assert await catalog.wait_synced(5)
+        with (
+            patch.object(idle, "get_kube_client", return_value=kube),
+            patch.object(idle, "get_agent_catalog", return_value=catalog),
+            patch.object(idle, "get_tool_config", return_value={}),
+        ):
+            yield fake, catalog
+    finally:
+        await catalog.stop()
+        await kube.close()
+        await fake.stop()
+
+
+async def settled(catalog: AgentCatalog, name: str, predicate) -> dict:
+    item = await catalog.wait_for("kagent", name, predicate, 5)
+    assert predicate(item), item
+    return item
+
+
+class TestAgentState:
+    """Test the warm/cold summary of an Agent."""
+
+    def test_state_follows_replicas(self) -> None:
+        """Test that only agents scaled to zero are cold."""
+        agent = {"metadata": {"name": "a"}, "spec": {"byo": {"deployment": {}}}}
+        assert agent_state(agent) == "warm"
+        assert agent_view(agent)["state"] == "warm"
+
+        agent["spec"]["byo"]["deployment"]["replicas"] = 0
+        assert agent_state(agent) == "cold"
+        assert agent_replicas(agent) == 0
+
+    def test_time_round_trip(self) -> None:
+        """Test the annotation time format."""
+        assert idle.parse_time(idle.format_time(1700000000)) == 1700000000
+        assert idle.parse_time("yesterday") is None
+
+
+class TestIdleReconciler:
+    """Test the reconciler against the fake API server."""
+
+    @pytest.mark.asyncio
+    async def test_scales_idle_agents_to_zero(self, tmp_path, monkeypatch) -> None:
+        """Test that only agents idle past the threshold are scaled down."""
+        async with cluster(tmp_path, monkeypatch) as (fake, catalog):
+            reconciler = idle.IdleReconciler(idle_after=HOUR)
+            reconciler.started_at = 0
+            later = time.time() + 2 * HOUR
+            reconciler.touch("kagent", "agent-00001", now=later - 60)
+
+            counts = await reconciler.reconcile(now=later)
+
+            cold = await settled(
+                catalog, "agent-00000", lambda item: agent_state(item) == "cold"
+            )
+            used = await settled(
+                catalog,
+                "agent-00001",
+                lambda item: (
+                    idle.LAST_USED_ANNOTATION
+                    in (item["metadata"].get("annotations") or {})
+                ),
+            )
+
+        assert counts == {"scaled_down": 1, "recorded": 1}
+        assert cold["metadata"]["annotations"][idle.REPLICAS_ANNOTATION] == "1"
+        assert agent_state(used) == "warm"
+        # Recording use only touches metadata and does not roll the agent
+        assert used["metadata"]["generation"] == 1
+        assert fake.requests["patch agents"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_threshold(self, tmp_path, monkeypatch) -> None:
+        """Test that idle_after: 0 in kmcp.yaml turns scaling down off."""
+        async with cluster(tmp_path, monkeypatch):
+            reconciler = idle.IdleReconciler()
+            reconciler.started_at = 0
+            with patch.object(idle, "get_tool_config", return_value={"idle_after": 0}):
+                counts = await reconciler.reconcile(now=time.time() + 100 * HOUR)
+
+        assert counts["scaled_down"] == 0
+
+    @pytest.mark.asyncio
+    async def test_only_managed_or_opted_in_agents(self, tmp_path, monkeypatch) -> None:
+        """Test that agents deployed by others are scaled only if they opt in."""
+        async with cluster(tmp_path, monkeypatch, agents=4) as (fake, catalog):
+            agents = {agent["metadata"]["name"]: agent for agent in fake.agents()}
+            del agents["agent-00001"]["metadata"]["labels"][MANAGED_BY_LABEL]
+            del agents["agent-00002"]["metadata"]["labels"][MANAGED_BY_LABEL]
+            agents["agent-00002"]["metadata"]["annotations"] = {
+                idle.IDLE_SCALING_ANNOTATION: "enabled"
+            }
+            agents["agent-00003"]["metadata"]["annotations"] = {
+                idle.IDLE_SCALING_ANNOTATION: "disabled"
+            }
+            for agent in agents.values():
+                fake.put(("kagent.dev", "v1alpha2", "agents"), agent)
+            await settled(
+                catalog,
+                "agent-00003",
+                lambda item: (
+                    idle.IDLE_SCALING_ANNOTATION
+                    in (item["metadata"].get("annotations") or {})
+                ),
+            )
+            reconciler = idle.IdleReconciler(idle_after=HOUR)
+            reconciler.started_at = 0
+
+            counts = await reconciler.reconcile(now=time.time() + 2 * HOUR)
+            for name in ("agent-00000", "agent-00002"):
+                await settled(
+                    catalog, name, lambda item: agent_state(item) == "cold"
+                )
+            states = {
+                item["metadata"]["name"]: agent_state(item)
+                for item in catalog.list_agents()
+            }
+
+        assert counts["scaled_down"] == 2
+        assert states == {
+            "agent-00000": "cold",
+            "agent-00001": "warm",
+            "agent-00002": "cold",
+            "agent-00003": "warm",
+        }
+
+    @pytest.mark.asyncio
+    async def test_not_started_with_several_workers(self, monkeypatch) -> None:
+        """Test that the reconciler stays off when uses are spread over workers."""
+        monkeypatch.setenv("MCP_WORKERS", "4")
+        reconciler = idle.IdleReconciler(idle_after=HOUR)
+
+        await reconciler.start()
+
+        assert not reconciler.running
+
+    @pytest.mark.asyncio
+    async def test_touch_agent_wakes_cold_agent(self, tmp_path, monkeypatch) -> None:
+        """Test that touch_agent restores the replicas an agent had before."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+        server.load_tools()
+        touch_agent = server.get_tools_sync()["touch_agent"].fn
+        module = sys.modules["tools.touch_agent"]
+        monkeypatch.setenv("NAMESPACE", "kagent")
+
+        async with cluster(tmp_path, monkeypatch, agents=1) as (_, catalog):
+            reconciler = idle.IdleReconciler(idle_after=HOUR)
+            reconciler.started_at = 0
+            await reconciler._patch(
+                "kagent",
+                "agent-00000",
+                {"spec": {"byo": {"deployment": {"replicas": 2}}}},
+            )
+            await settled(
+                catalog, "agent-00000", lambda item: agent_replicas(item) == 2
+            )
+            await reconciler.reconcile(now=time.time() + 2 * HOUR)
+            await settled(
+                catalog, "agent-00000", lambda item: agent_state(item) == "cold"
+            )
+
+            with patch.object(module, "get_idle_reconciler", return_value=reconciler):
+                woke = json.loads(await touch_agent("agent-00000"))
+                warm = await settled(
+                    catalog, "agent-00000", lambda item: agent_state(item) == "warm"
+                )
+                again = json.loads(await touch_agent("agent-00000"))
+                missing = await touch_agent("nope")
+
+        assert woke["woke"] is True
+        assert again["woke"] is False
+        assert agent_replicas(warm) == 2
+        assert idle.REPLICAS_ANNOTATION not in warm["metadata"]["annotations"]
+        assert missing.startswith("Error:")
@@ -0,0 +1,253 @@
+"""Tests for list_available_agents output shaping."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add src and benchmarks to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from fake_kube import FakeKubeAPI  # noqa: E402
+
+from core.catalog import AgentCatalog  # noqa: E402
+from core.kube import KubeClient  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+from core.views import agent_view, dump_agents  # noqa: E402
+
+
+def make_agent(name: str) -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "kagent",
+            "uid": f"uid-{name}",
+            "labels": {"skill-python": "python"},
+        },
+        "spec": {"description": f"Agent {name} teaches a topic in depth."},
+    }
+
+
+@pytest.fixture
+def list_agents():
+    """Load the tool with a synced catalog of 25 agents."""
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    module = sys.modules["tools.list_available_agents"]
+
+    catalog = AgentCatalog()
+    catalog.replace([make_agent(f"agent-{i:02d}") for i in range(25)], "1")
+    with patch.object(module, "get_agent_catalog", return_value=catalog):
+        yield server.get_tools_sync()["list_available_agents"].fn
+
+
+class TestDumpAgents:
+    """Test projection and bounded encoding."""
+
+    def test_projection(self) -> None:
+        """Test that only the requested fields are kept."""
+        view = agent_view(make_agent("a"), ["name"])
+        assert view == {"name": "a"}
+
+    def test_truncation_marker(self) -> None:
+        """Test that oversized listings are cut and marked."""
+        agents = [agent_view(make_agent(f"a{i}")) for i in range(100)]
+        output = dump_agents(agents, max_bytes=2000)
+
+        assert len(output.encode()) <= 2000
+        decoded = json.loads(output)
+        assert decoded[-1]["truncated"] is True
+        assert decoded[-1]["omitted"] == 100 - (len(decoded) - 1)
+
+    def test_paginated_truncation(self) -> None:
+        """Test that the envelope carries the truncation marker."""
+        agents = [agent_view(make_agent(f"a{i}")) for i in range(100)]
+        decoded = json.loads(
+            dump_agents(agents, compact=True, max_bytes=1000, paginated=True)
+        )
+
+        assert decoded["truncated"] is True
+        assert decoded["continue"] is None
+        assert len(decoded["items"]) + decoded["omitted"] == 100
+
+    def test_unbounded(self) -> None:
+        """Test that no marker is added when everything fits."""
+        agents = [agent_view(make_agent("a"))]
+        assert json.loads(dump_agents(agents, max_bytes=10_000)) == agents
+
+
+class TestListAvailableAgents:
+    """Test the tool's pagination, projection and compact modes."""
+
+    @pytest.mark.asyncio
+    async def test_default_output_is_indented_array(self, list_agents) -> None:
+        """Test that calls without arguments return the full indented array."""
+        output = await list_agents()
+        decoded = json.loads(output)
+
+        assert output == json.dumps(decoded, indent=2)
+        assert len(decoded) == 25
+        assert set(decoded[0]) == {"id", "name", "description", "labels", "state"}
+
+    @pytest.mark.asyncio
+    async def test_compact_projection(self, list_agents) -> None:
+        """Test names-only compact output."""
+        output = await list_agents(fields=["name"], compact=True)
+
+        assert "\n" not in output
+        assert json.loads(output)[0] == {"name": "agent-00"}
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, list_agents) -> None:
+        """Test walking every page with continue tokens."""
+        names, token, pages = [], None, 0
+        while True:
+            page = json.loads(
+                await list_agents(limit=10, continue_token=token, fields=["name"])
+            )
+            names += [item["name"] for item in page["items"]]
+            pages += 1
+            token = page["continue"]
+            if token is None:
+                break
+
+        assert pages == 3
+        assert names == [f"agent-{i:02d}" for i in range(25)]
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, list_agents) -> None:
+        """Test that bad fields, limits and tokens are reported."""
+        assert (await list_agents(fields=["spec"])).startswith("Error")
+        assert (await list_agents(limit=0)).startswith("Error")
+        assert (await list_agents(limit=5, continue_token="bogus")).startswith("Error")
+
+    @pytest.mark.asyncio
+    async def test_truncated_pages_lose_no_agents(self, list_agents) -> None:
+        """Test that a page cut by max_response_bytes continues after its last agent."""
+        module = sys.modules["tools.list_available_agents"]
+        names, token, pages = [], None, 0
+        with patch.object(
+            module, "get_tool_config", return_value={"max_response_bytes": 600}
+        ):
+            while True:
+                page = json.loads(await list_agents(limit=10, continue_token=token))
+                assert "truncated" not in page
+                names += [item["name"] for item in page["items"]]
+                pages += 1
+                token = page["continue"]
+                if token is None:
+                    break
+
+        assert pages > 3
+        assert names == [f"agent-{i:02d}" for i in range(25)]
+
+    @pytest.mark.asyncio
+    async def test_long_catalog_tokens_keep_pages_within_bounds(self) -> None:
+        """Test that a shrunk page is re-checked with its own, longer continue token."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+        server.load_tools()
+        list_agents = server.get_tools_sync()["list_available_agents"].fn
+        module = sys.modules["tools.list_available_agents"]
+        expected = [f"agent-{i:02d}-" + "x" * 200 for i in range(6)]
+        catalog = AgentCatalog()
+        catalog.replace([make_agent(name) for name in expected], "1")
+
+        names, token = [], None
+        with (
+            patch.object(module, "get_agent_catalog", return_value=catalog),
+            patch.object(
+                module, "get_tool_config", return_value={"max_response_bytes": 1100}
+            ),
+        ):
+            while True:
+                output = await list_agents(
+                    limit=6, continue_token=token, fields=["name"], compact=True
+                )
+                page = json.loads(output)
+                assert len(output.encode()) <= 1100
+                assert "truncated" not in page
+                names += [item["name"] for item in page["items"]]
+                token = page["continue"]
+                if token is None:
+                    break
+
+        assert names == expected
+
+    @pytest.mark.asyncio
+    async def test_catalog_changes_invalidate_cached_listings(
+        self, list_agents
+    ) -> None:
+        """Test that agents added by the watch show up without waiting for the TTL."""
+        module = sys.modules["tools.list_available_agents"]
+        catalog = module.get_agent_catalog()
+        assert len(json.loads(await list_agents(fields=["name"]))) == 25
+
+        catalog.apply_event("ADDED", make_agent("agent-25"))
+
+        assert len(json.loads(await list_agents(fields=["name"]))) == 26
+
+    @pytest.mark.asyncio
+    async def test_catalog_token_after_catalog_goes_stale(self, list_agents) -> None:
+        """Test that a catalog token is not passed to the API server fallback."""
+        module = sys.modules["tools.list_available_agents"]
+        catalog = module.get_agent_catalog()
+        token = json.loads(await list_agents(limit=10))["continue"]
+
+        with patch.object(catalog, "is_stale", return_value=True):
+            output = await list_agents(limit=10, continue_token=token)
+
+        assert output.startswith(
+            "Error: continue_token was issued by the agent catalog"
+        )
+
+    @pytest.mark.asyncio
+    async def test_truncated_api_server_pages_lose_no_agents(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        """Test that the API server fallback re-lists a truncated page to resume it."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+        server.load_tools()
+        list_agents = server.get_tools_sync()["list_available_agents"].fn
+        module = sys.modules["tools.list_available_agents"]
+
+        fake = FakeKubeAPI()
+        fake.seed_agents(12)
+        await fake.start()
+        monkeypatch.setenv(
+            "KUBECONFIG", str(fake.write_kubeconfig(tmp_path / "kubeconfig"))
+        )
+        monkeypatch.delenv("KUBERNETES_SERVICE_HOST", raising=False)
+        kube = KubeClient()
+        names, token, pages = [], None, 0
+        try:
+            await kube.connect()
+            with (
+                patch.object(module, "get_agent_catalog", return_value=AgentCatalog()),
+                patch.object(module, "get_kube_client", return_value=kube),
+                patch.object(
+                    module, "get_tool_config", return_value={"max_response_bytes": 600}
+                ),
+            ):
+                while True:
+                    page = json.loads(
+                        await list_agents(
+                            limit=5,
+                            continue_token=token,
+                            fields=["name", "description"],
+                        )
+                    )
+                    assert "truncated" not in page
+                    names += [item["name"] for item in page["items"]]
+                    pages += 1
+                    token = page["continue"]
+                    if token is None:
+                        break
+        finally:
+            await kube.close()
+            await fake.stop()
+
+        assert pages > 3
+        assert names == [f"agent-{i:05d}" for i in range(12)]
@@ -0,0 +1,115 @@
+"""Tests for the cached agent manifest renderer."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.manifests import ManifestRenderer, render_agent_manifest, skill_labels  # noqa: E402
+
+TEMPLATE_PATH = str(Path(__file__).parent.parent / "agent-template.yaml")
+
+
+class TestSkillLabels:
+    """Test conversion of skills to Kubernetes labels."""
+
+    def test_kebab_case_skills_unchanged(self) -> None:
+        """Test that well-formed skills map to skill-<name> labels."""
+        assert skill_labels(["ai-ethics"]) == {"skill-ai-ethics": "ai-ethics"}
+
+    def test_unsafe_characters_are_replaced(self) -> None:
+        """Test that spaces, quotes and punctuation produce valid labels."""
+        labels = skill_labels(['AI "ethics"', "C++ / Rust", "!!!"])
+        assert labels == {"skill-ai-ethics": "AI-ethics", "skill-c-rust": "C-Rust"}
+
+    def test_colliding_skills_keep_the_first(self, caplog) -> None:
+        """Test that skills sanitizing to the same key are deduplicated and logged."""
+        with caplog.at_level("WARNING", logger="core.manifests"):
+            labels = skill_labels(["ML Ops", "ml-ops", "ML Ops", "C++", "C"])
+
+        assert labels == {"skill-ml-ops": "ML-Ops", "skill-c": "C"}
+        assert len(caplog.records) == 2
+        assert "skill-ml-ops" in caplog.records[0].getMessage()
+
+    def test_long_skills_are_truncated(self) -> None:
+        """Test that labels respect the 63 character limit."""
+        key, value = next(iter(skill_labels(["x" * 100]).items()))
+        assert len(key) <= 63
+        assert len(value) <= 63
+
+
+class TestManifestRenderer:
+    """Test rendering the Agent template into a dict."""
+
+    def test_renders_agent_manifest(self) -> None:
+        """Test that the shipped template renders into an Agent CR."""
+        manifest = render_agent_manifest(
+            "ethics-specialist", "Bias expert", ["ai-ethics"], TEMPLATE_PATH
+        )
+        assert manifest["kind"] == "Agent"
+        assert manifest["metadata"]["name"] == "ethics-specialist"
+        assert manifest["metadata"]["labels"] == {"skill-ai-ethics": "ai-ethics"}
+        assert manifest["spec"]["serviceAccountName"] == "ethics-specialist"
+        assert manifest["spec"]["description"] == "Bias expert"
+
+    @pytest.mark.parametrize(
+        "description",
+        ['Says "hello"', "key: value", "line one\nline two", "{{ name }}", "- item #1"],
+    )
+    def test_description_is_inserted_verbatim(self, description: str) -> None:
+        """Test that YAML-significant characters survive rendering."""
+        manifest = render_agent_manifest("agent", description, [], TEMPLATE_PATH)
+        assert manifest["spec"]["description"] == description
+
+    def test_embedded_expressions(self, tmp_path: Path) -> None:
+        """Test strings that mix literal text and expressions."""
+        template = tmp_path / "template.yaml"
+        template.write_text('image: "registry/{{ name }}:latest"\nreplicas: 1\n')
+
+        renderer = ManifestRenderer(str(template))
+        assert renderer.render(name="tutor") == {
+            "image": "registry/tutor:latest",
+            "replicas": 1,
+        }
+
+    def test_compiles_once_and_reloads_on_mtime_change(self, tmp_path: Path) -> None:
+        """Test that the template is parsed once until the file changes."""
+        template = tmp_path / "template.yaml"
+        template.write_text('name: "{{ name }}"\n')
+        renderer = ManifestRenderer(str(template))
+
+        renderer.render(name="a")
+        renderer.render(name="b")
+        assert renderer.load_count == 1
+
+        template.write_text('name: "{{ name }}"\nkind: Agent\n')
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert renderer.render(name="c") == {"name": "c", "kind": "Agent"}
+        assert renderer.load_count == 2
+
+    def test_rendered_manifests_are_independent(self) -> None:
+        """Test that mutating one result does not leak into the next render."""
+        first = render_agent_manifest("a", "d", ["x"], TEMPLATE_PATH)
+        first["metadata"]["labels"]["extra"] = "1"
+        first["spec"]["byo"]["deployment"]["env"].clear()
+
+        second = render_agent_manifest("a", "d", ["x"], TEMPLATE_PATH)
+        assert "extra" not in second["metadata"]["labels"]
+        assert second["spec"]["byo"]["deployment"]["env"]
+
+    def test_template_is_valid_yaml(self) -> None:
+        """Test that the template file itself parses as plain YAML."""
+        with open(TEMPLATE_PATH) as f:
+            assert yaml.safe_load(f)["metadata"]["labels"] == "{{ skills }}"
+
+    def test_missing_template(self, tmp_path: Path) -> None:
+        """Test that a missing template raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            ManifestRenderer(str(tmp_path / "missing.yaml")).render(name="a")
@@ -0,0 +1,144 @@
+"""Tests for per-tool call metrics."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from starlette.testclient import TestClient
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.metrics import ToolMetrics  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+
+TOOLS = """
+from core.server import mcp
+
+@mcp.tool()
+def metrics_ok(message: str) -> str:
+    return "ok: " + message
+
+@mcp.tool()
+def metrics_error_string() -> str:
+    return "K8s API Error: Forbidden"
+
+@mcp.tool()
+def metrics_raises() -> str:
+    raise PermissionError("denied")
+"""
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> DynamicMCPServer:
+    """Server with one module of well-behaved and failing tools."""
+    (tmp_path / "metrics_tools.py").write_text(TOOLS)
+    server = DynamicMCPServer(name="Metrics", tools_dir=str(tmp_path))
+    server.load_tools()
+    return server
+
+
+def sample(metrics: ToolMetrics, name: str, **labels: str) -> float:
+    return metrics.registry.get_sample_value(name, labels) or 0.0
+
+
+class TestToolMetricsMiddleware:
+    """Test that every tool call is measured."""
+
+    @pytest.mark.asyncio
+    async def test_records_calls_latency_and_sizes(
+        self, server: DynamicMCPServer
+    ) -> None:
+        """Test that a successful call updates count, latency and size metrics."""
+        metrics = server.metrics
+        before = sample(
+            metrics, "mcp_tool_calls_total", tool="metrics_ok", outcome="ok"
+        )
+
+        async with Client(server.mcp) as client:
+            await client.call_tool("metrics_ok", {"message": "hello"})
+
+        calls = sample(metrics, "mcp_tool_calls_total", tool="metrics_ok", outcome="ok")
+        assert calls == before + 1
+        assert (
+            sample(metrics, "mcp_tool_duration_seconds_count", tool="metrics_ok") >= 1
+        )
+        request_bytes = sample(metrics, "mcp_tool_request_bytes_sum", tool="metrics_ok")
+        assert request_bytes >= len('{"message": "hello"}')
+        response_bytes = sample(
+            metrics, "mcp_tool_response_bytes_sum", tool="metrics_ok"
+        )
+        assert response_bytes >= len("ok: hello")
+
+    @pytest.mark.asyncio
+    async def test_classifies_errors(self, server: DynamicMCPServer) -> None:
+        """Test that error strings and exceptions are counted by error class."""
+        metrics = server.metrics
+
+        async with Client(server.mcp) as client:
+            await client.call_tool("metrics_error_string", {})
+            with pytest.raises(ToolError):
+                await client.call_tool("metrics_raises", {})
+
+        assert (
+            sample(
+                metrics,
+                "mcp_tool_errors_total",
+                tool="metrics_error_string",
+                error="ApiException",
+            )
+            >= 1
+        )
+        assert (
+            sample(
+                metrics,
+                "mcp_tool_errors_total",
+                tool="metrics_raises",
+                error="PermissionError",
+            )
+            >= 1
+        )
+        assert (
+            sample(
+                metrics, "mcp_tool_calls_total", tool="metrics_raises", outcome="error"
+            )
+            >= 1
+        )
+
+    def test_metrics_route(self, server: DynamicMCPServer) -> None:
+        """Test that the HTTP app serves the metrics in the Prometheus format."""
+        server.metrics.record("metrics_route", 0.01, None, 2, 10)
+
+        response = TestClient(server.mcp.http_app(path="/mcp")).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'mcp_tool_calls_total{outcome="ok",tool="metrics_route"}' in response.text
+        )
+
+
+class TestOtlpExport:
+    """Test mirroring the measurements to OpenTelemetry."""
+
+    def test_enable_otlp_mirrors_measurements(self) -> None:
+        """Test that recorded calls reach the OpenTelemetry reader."""
+        pytest.importorskip("opentelemetry.sdk.metrics")
+        from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+        metrics = ToolMetrics()
+        reader = InMemoryMetricReader()
+        assert metrics.enable_otlp(reader=reader)
+        metrics.record("otlp_tool", 0.2, "ApiException", 10, None)
+
+        data = reader.get_metrics_data()
+        names = {
+            metric.name
+            for resource in data.resource_metrics
+            for scope in resource.scope_metrics
+            for metric in scope.metrics
+        }
+        assert {"mcp.tool.calls", "mcp.tool.errors", "mcp.tool.duration"} <= names
+        metrics.shutdown()
@@ -0,0 +1,230 @@
+"""Tests for agent lookups: the search index, search_agents and find_agents_by_skill."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.catalog import AgentCatalog  # noqa: E402
+from core.search import AgentSearchIndex, agent_terms, tokenize  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+
+
+def make_agent(name: str, description: str, skills: list[str]) -> dict:
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "kagent",
+            "uid": f"uid-{name}",
+            "resourceVersion": "1",
+            "labels": {f"skill-{skill}": skill for skill in skills},
+        },
+        "spec": {"description": description},
+    }
+
+
+AGENTS = [
+    make_agent(
+        "ethics-tutor",
+        "Teaches algorithmic bias and fairness.",
+        ["ai-ethics", "fairness"],
+    ),
+    make_agent(
+        "stats-tutor", "Explains hypothesis testing and regression.", ["statistics"]
+    ),
+    make_agent(
+        "k8s-tutor", "Walks through pods, deployments and services.", ["kubernetes"]
+    ),
+    make_agent("python-tutor", "Teaches Python, from basics to asyncio.", ["python"]),
+]
+
+
+@pytest.fixture
+def search_agents():
+    """Load the tool with a synced catalog of AGENTS."""
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    module = sys.modules["tools.search_agents"]
+
+    catalog = AgentCatalog()
+    catalog.replace(list(AGENTS), "1")
+    with patch.object(module, "get_agent_catalog", return_value=catalog):
+        yield server.get_tools_sync()["search_agents"].fn
+
+
+class TestAgentSearchIndex:
+    """Test BM25 ranking and incremental updates."""
+
+    def test_tokenize_splits_kebab_case(self) -> None:
+        """Test that skill labels split into words."""
+        tokens = tokenize("AI-Ethics, risk_management")
+        assert tokens == ["ai", "ethics", "risk", "management"]
+
+    def test_skill_labels_are_indexed(self) -> None:
+        """Test that only skill-* labels contribute terms."""
+        agent = make_agent("a", "", ["ai-ethics"])
+        agent["metadata"]["labels"]["team"] = "platform"
+
+        terms = agent_terms(agent)
+
+        assert terms["ethics"] == 2
+        assert "platform" not in terms
+
+    def test_ranks_best_match_first(self) -> None:
+        """Test that the agent matching the query best comes first."""
+        index = AgentSearchIndex()
+        index.rebuild({agent["metadata"]["name"]: agent for agent in AGENTS})
+
+        results = index.search("bias and fairness in algorithms", top_k=2)
+
+        assert results[0][0] == "ethics-tutor"
+        assert all(score > 0 for _, score in results)
+
+    def test_no_shared_terms(self) -> None:
+        """Test that unrelated agents are not returned."""
+        index = AgentSearchIndex()
+        index.rebuild({agent["metadata"]["name"]: agent for agent in AGENTS})
+
+        assert index.search("medieval poetry") == []
+
+    def test_incremental_updates(self) -> None:
+        """Test that modified and removed agents are reflected in results."""
+        index = AgentSearchIndex()
+        index.add("a", make_agent("a", "Teaches chemistry.", []))
+        index.add("a", make_agent("a", "Teaches astronomy.", []))
+
+        assert index.search("chemistry") == []
+        assert index.search("astronomy")[0][0] == "a"
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index.search("astronomy") == []
+
+    def test_catalog_events_update_index(self) -> None:
+        """Test that catalog watch events keep the index in sync."""
+        catalog = AgentCatalog()
+        catalog.replace([], "1")
+        agent = make_agent("geo-tutor", "Teaches geography.", ["maps"])
+
+        catalog.apply_event("ADDED", agent)
+        assert catalog.search("maps")[0][0]["metadata"]["name"] == "geo-tutor"
+
+        catalog.apply_event("DELETED", agent)
+        assert catalog.search("maps") == []
+
+
+class TestSearchAgentsTool:
+    """Test the search_agents tool."""
+
+    @pytest.mark.asyncio
+    async def test_returns_ranked_top_k(self, search_agents) -> None:
+        """Test that results are agent summaries with descending scores."""
+        response = await search_agents("python asyncio and statistics", top_k=2)
+        results = json.loads(response)
+
+        assert [agent["name"] for agent in results] == ["python-tutor", "stats-tutor"]
+        assert results[0]["score"] >= results[1]["score"]
+        assert results[0]["labels"] == {"skill-python": "python"}
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_arguments(self, search_agents) -> None:
+        """Test validation of the query and top_k."""
+        assert (await search_agents("  ")).startswith("Error:")
+        assert (await search_agents("python", top_k=0)).startswith("Error:")
+
+
+@pytest.fixture
+def find_by_skill():
+    """Load find_agents_by_skill with a synced catalog of AGENTS."""
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    module = sys.modules["tools.find_agents_by_skill"]
+
+    catalog = AgentCatalog()
+    catalog.replace(list(AGENTS), "1")
+    with patch.object(module, "get_agent_catalog", return_value=catalog):
+        yield server.get_tools_sync()["find_agents_by_skill"].fn, catalog
+
+
+class TestFindAgentsBySkill:
+    """Test label lookups in the catalog and the find_agents_by_skill tool."""
+
+    def test_select_any_and_all(self) -> None:
+        """Test that select unions or intersects label keys."""
+        catalog = AgentCatalog()
+        catalog.replace(list(AGENTS), "1")
+
+        any_names = [
+            a["metadata"]["name"]
+            for a in catalog.select(["skill-python", "skill-fairness"])
+        ]
+        all_names = [
+            a["metadata"]["name"]
+            for a in catalog.select(
+                ["skill-ai-ethics", "skill-fairness"], match_all=True
+            )
+        ]
+
+        assert any_names == ["ethics-tutor", "python-tutor"]
+        assert all_names == ["ethics-tutor"]
+        assert catalog.select(["skill-python", "skill-fairness"], match_all=True) == []
+
+    def test_modified_labels_are_reindexed(self) -> None:
+        """Test that a skill removed by an update no longer matches."""
+        catalog = AgentCatalog()
+        catalog.replace(list(AGENTS), "1")
+
+        catalog.apply_event(
+            "MODIFIED", make_agent("python-tutor", "Teaches Rust.", ["rust"])
+        )
+
+        assert catalog.select(["skill-python"]) == []
+        rust_names = [a["metadata"]["name"] for a in catalog.select(["skill-rust"])]
+        assert rust_names == ["python-tutor"]
+
+    @pytest.mark.asyncio
+    async def test_normalizes_skill_names(self, find_by_skill) -> None:
+        """Test that skills are matched after label normalization."""
+        tool, _ = find_by_skill
+        results = json.loads(await tool(["AI Ethics", "Fairness"], match="all"))
+
+        assert [agent["name"] for agent in results] == ["ethics-tutor"]
+
+    @pytest.mark.asyncio
+    async def test_stale_catalog_uses_label_selectors(self, find_by_skill) -> None:
+        """Test that the caller's namespace gets one selector per skill for "any"."""
+        tool, catalog = find_by_skill
+        catalog._synced = False
+        module = sys.modules["tools.find_agents_by_skill"]
+        custom_api = MagicMock()
+        custom_api.list_namespaced_custom_object = AsyncMock(
+            return_value={"items": [AGENTS[3]]}
+        )
+        kube = MagicMock()
+        kube.custom_objects = AsyncMock(return_value=custom_api)
+
+        with patch.object(module, "get_kube_client", return_value=kube):
+            results = json.loads(await tool(["python", "asyncio"]))
+            await tool(["python", "asyncio"], match="all")
+
+        calls = custom_api.list_namespaced_custom_object.call_args_list
+        selectors = [call.kwargs["label_selector"] for call in calls]
+        assert [agent["name"] for agent in results] == ["python-tutor"]
+        assert selectors == [
+            "skill-python",
+            "skill-asyncio",
+            "skill-python,skill-asyncio",
+        ]
+        assert {call.kwargs["namespace"] for call in calls} == {"kagent"}
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_arguments(self, find_by_skill) -> None:
+        """Test validation of match and skills."""
+        tool, _ = find_by_skill
+        assert (await tool(["python"], match="some")).startswith("Error:")
+        assert (await tool([])).startswith("Error:")
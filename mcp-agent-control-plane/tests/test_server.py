@@ -1,5 +1,6 @@
 """Tests for mcp-agent-control-plane MCP server core functionality."""
 
+import os
 import sys
 from pathlib import Path
 from unittest.mock import mock_open, patch, MagicMock
@@ -9,7 +10,12 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from core.server import DynamicMCPServer  # noqa: E402
-from core.utils import get_tool_config, load_config  # noqa: E402
+from core.utils import (  # noqa: E402
+    ConfigService,
+    get_config_service,
+    get_tool_config,
+    load_config,
+)
 
 
 class TestDynamicMCPServer:
@@ -53,6 +59,8 @@ class TestDynamicMCPServer:
                     "weather": {"api_key_env": "WEATHER_API_KEY"}
                 }
             }
+            # Lookups read the cached snapshot, so pick up the patched loader
+            get_config_service().reload()
 
             echo_config = get_tool_config("echo")
             assert echo_config["prefix"] == "[TEST] "
@@ -63,6 +71,7 @@ class TestDynamicMCPServer:
             # Test non-existent tool
             empty_config = get_tool_config("nonexistent")
             assert empty_config == {}
+        get_config_service().reload()
 
     def test_run_method_default_mode(self) -> None:
         """Test that run method defaults to stdio mode."""
@@ -117,3 +126,183 @@ class TestToolLoading:
 
         # Verify that echo tool specifically was loaded
         assert "echo" in server.loaded_tools
+
+
+class TestKubeClient:
+    """Test the shared Kubernetes client accessor."""
+
+    def test_get_kube_client_is_shared(self) -> None:
+        """Test that every caller gets the same client instance."""
+        from core.utils import get_kube_client
+
+        assert get_kube_client() is get_kube_client()
+
+    @pytest.mark.asyncio
+    async def test_config_loaded_once(self) -> None:
+        """Test that credentials are loaded only on the first connect."""
+        from core.kube import KubeClient
+
+        kube = KubeClient(pool_maxsize=7)
+        with patch("core.kube.config.load_incluster_config") as mock_load:
+            first = await kube.connect()
+            second = await kube.api_client()
+
+        assert first is second
+        assert mock_load.call_count == 1
+        assert first.configuration.connection_pool_maxsize == 7
+        await kube.close()
+        assert not kube.connected
+
+
+class TestConfigService:
+    """Test the cached, change-aware configuration service."""
+
+    def _write(self, path: Path, max_bytes: int) -> None:
+        path.write_text(
+            f"tools:\n  list_available_agents:\n    max_response_bytes: {max_bytes}\n"
+        )
+
+    def _max_bytes(self, service: ConfigService) -> int:
+        return service.snapshot.tool("list_available_agents")["max_response_bytes"]
+
+    def test_lookups_do_not_reparse(self, tmp_path: Path) -> None:
+        """Test that the file is parsed once however often it is read."""
+        path = tmp_path / "kmcp.yaml"
+        self._write(path, 100)
+        service = ConfigService(str(path))
+
+        for _ in range(100):
+            assert self._max_bytes(service) == 100
+
+        assert service.load_count == 1
+        assert not service.refresh()
+        assert service.load_count == 1
+
+    def test_refresh_reloads_changed_file_and_notifies(self, tmp_path: Path) -> None:
+        """Test that a changed file is reloaded and subscribers see both snapshots."""
+        path = tmp_path / "kmcp.yaml"
+        self._write(path, 100)
+        service = ConfigService(str(path))
+        changes = []
+        unsubscribe = service.subscribe(lambda old, new: changes.append((old, new)))
+        first = service.snapshot
+
+        self._write(path, 2000)
+        assert service.refresh()
+
+        assert self._max_bytes(service) == 2000
+        assert service.snapshot.generation == first.generation + 1
+        assert changes == [(first, service.snapshot)]
+
+        unsubscribe()
+        self._write(path, 30000)
+        assert service.refresh()
+        assert len(changes) == 1
+
+    def test_invalid_file_keeps_last_good_snapshot(self, tmp_path: Path) -> None:
+        """Test that a malformed edit neither replaces nor announces the snapshot."""
+        path = tmp_path / "kmcp.yaml"
+        self._write(path, 100)
+        service = ConfigService(str(path))
+        changes = []
+        service.subscribe(lambda old, new: changes.append((old, new)))
+        good = service.snapshot
+
+        for broken in ("tools: [unclosed\n", "- just\n- a list\n", "tools: 3\n"):
+            path.write_text(broken)
+            assert not service.refresh()
+            assert service.snapshot is good
+            # The broken file is not parsed again until it changes
+            assert not service.refresh()
+
+        self._write(path, 2000)
+        assert service.refresh()
+        assert self._max_bytes(service) == 2000
+        assert changes == [(good, service.snapshot)]
+
+    def test_snapshot_is_read_only(self, tmp_path: Path) -> None:
+        """Test that callers cannot mutate the shared snapshot."""
+        path = tmp_path / "kmcp.yaml"
+        self._write(path, 100)
+        service = ConfigService(str(path))
+
+        with pytest.raises(TypeError):
+            service.snapshot.tool("list_available_agents")["max_response_bytes"] = 1
+        assert service.snapshot.tool("missing") == {}
+
+    @pytest.mark.asyncio
+    async def test_background_check_reloads(self, tmp_path: Path) -> None:
+        """Test that the background task picks up changes while running."""
+        import asyncio
+
+        path = tmp_path / "kmcp.yaml"
+        self._write(path, 100)
+        service = ConfigService(str(path), check_interval=0.01)
+        await service.start()
+        try:
+            self._write(path, 12345)
+            for _ in range(100):
+                if self._max_bytes(service) == 12345:
+                    break
+                await asyncio.sleep(0.01)
+            assert self._max_bytes(service) == 12345
+        finally:
+            await service.stop()
+        assert not service.running
+
+
+class TestMultiWorkerHttp:
+    """Test multi-worker, stateless HTTP serving."""
+
+    def test_json_response_and_drain_timeout(self) -> None:
+        """Test that single-worker options are passed to FastMCP."""
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+
+        with patch.object(server.mcp, "run") as mock_run:
+            server.run(
+                transport_mode="http", port=3000, json_response=True, drain_timeout=5
+            )
+
+        kwargs = mock_run.call_args.kwargs
+        assert kwargs["json_response"] is True
+        assert kwargs["uvicorn_config"] == {"timeout_graceful_shutdown": 5}
+
+    def test_workers_start_uvicorn_with_factory(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that several workers are started from the worker app factory."""
+        for key in (
+            "MCP_SERVER_NAME",
+            "MCP_TOOLS_DIR",
+            "MCP_LAZY_TOOLS",
+            "MCP_JSON_RESPONSE",
+        ):
+            monkeypatch.delenv(key, raising=False)
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+        server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+
+        with patch("uvicorn.run") as mock_run:
+            server.run(transport_mode="http", port=3000, workers=4, drain_timeout=5)
+
+        args, kwargs = mock_run.call_args
+        assert args == ("core.server:create_worker_app",)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 4
+        assert kwargs["timeout_graceful_shutdown"] == 5
+        assert os.environ["MCP_TOOLS_DIR"] == str(Path("src/tools").resolve())
+
+    def test_worker_app_is_stateless(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a worker loads the tools and serves stateless HTTP."""
+        from core.server import create_worker_app
+
+        monkeypatch.setenv("MCP_TOOLS_DIR", "src/tools")
+        monkeypatch.setenv("MCP_LAZY_TOOLS", "false")
+        monkeypatch.setenv("MCP_JSON_RESPONSE", "true")
+
+        app = create_worker_app()
+        routes = {route.path: route for route in app.routes}
+        session_manager = routes["/mcp"].endpoint.session_manager
+
+        assert session_manager.stateless
+        assert session_manager.json_response
+        assert "/metrics" in routes
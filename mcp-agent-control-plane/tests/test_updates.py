@@ -0,0 +1,292 @@
+"""Tests for coalescing agent updates."""
+
+import asyncio
+import copy
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, Mock, patch
+
+import pytest
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import updates  # noqa: E402
+from core.catalog import AgentCatalog  # noqa: E402
+from core.manifests import render_agent_manifest  # noqa: E402
+from core.server import DynamicMCPServer  # noqa: E402
+from core.updates import UpdateQueue, merge_skills, plan_patch  # noqa: E402
+
+
+class Recorder:
+    """Write function that records every merged update it applies."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.writes: list[tuple[str, list[str]]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(
+        self, description: str, skills: list[str]
+    ) -> tuple[str, list[dict]]:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            self.writes.append((description, skills))
+            return str(len(self.writes)), [{"field": "spec.description"}]
+        finally:
+            self.active -= 1
+
+
+class TestMergeSkills:
+    """Test the skills merge policies."""
+
+    def test_policies(self) -> None:
+        """Test replace and union, and that unknown policies are rejected."""
+        assert merge_skills(["a", "b"], ["c"], "replace") == ["c"]
+        assert merge_skills(["a", "b"], ["b", "c"], "union") == ["a", "b", "c"]
+        with pytest.raises(ValueError):
+            merge_skills([], [], "append")
+
+
+class TestUpdateQueue:
+    """Test debouncing and merging of updates per agent."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_share_one_write(self) -> None:
+        """Test that updates in the window share one write with the last description."""
+        queue = UpdateQueue(window=0.05, policy="union")
+        write = Recorder()
+
+        results = await asyncio.gather(
+            queue.submit("kagent", "tutor", "v1", ["math"], write),
+            queue.submit("kagent", "tutor", "v2", ["physics"], write),
+            queue.submit("kagent", "tutor", "v3", ["math", "chemistry"], write),
+        )
+
+        assert write.writes == [("v3", ["math", "physics", "chemistry"])]
+        assert {result.merged for result in results} == {3}
+        assert {result.resource_version for result in results} == {"1"}
+        assert (queue.submitted, queue.writes) == (3, 1)
+
+    @pytest.mark.asyncio
+    async def test_agents_are_written_independently(self) -> None:
+        """Test that updates to different agents are not merged."""
+        queue = UpdateQueue(window=0.01)
+        write = Recorder()
+
+        await asyncio.gather(
+            queue.submit("kagent", "a", "A", ["x"], write),
+            queue.submit("kagent", "b", "B", ["y"], write),
+        )
+
+        assert sorted(write.writes) == [("A", ["x"]), ("B", ["y"])]
+
+    @pytest.mark.asyncio
+    async def test_writes_of_one_agent_do_not_overlap(self) -> None:
+        """Test that an update arriving during a write waits for it to finish."""
+        queue = UpdateQueue(window=0.0)
+        write = Recorder(delay=0.05)
+
+        first = asyncio.create_task(queue.submit("kagent", "tutor", "v1", [], write))
+        await asyncio.sleep(0.01)
+        second = await queue.submit("kagent", "tutor", "v2", [], write)
+        await first
+
+        assert write.max_active == 1
+        assert [description for description, _ in write.writes] == ["v1", "v2"]
+        assert second.resource_version == "2"
+        assert queue._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_caller(self) -> None:
+        """Test that a failed write fails all merged updates."""
+        queue = UpdateQueue(window=0.01)
+        write = Recorder(error=RuntimeError("conflict"))
+
+        results = await asyncio.gather(
+            queue.submit("kagent", "tutor", "v1", [], write),
+            queue.submit("kagent", "tutor", "v2", [], write),
+            return_exceptions=True,
+        )
+
+        assert [str(result) for result in results] == ["conflict", "conflict"]
+
+
+class TestPlanPatch:
+    """Test the diff between an agent and its rendered manifest."""
+
+    def test_only_differences_are_patched(self) -> None:
+        """Test that unchanged fields are left out of the patch."""
+        current = render_agent_manifest("tutor", "Old", ["math"])
+        current["metadata"]["resourceVersion"] = "7"
+
+        patch_body, changes = plan_patch(
+            current, render_agent_manifest("tutor", "New", ["math"])
+        )
+
+        assert patch_body == {"spec": {"description": "New"}}
+        assert changes == [{"field": "spec.description", "from": "Old", "to": "New"}]
+
+    def test_no_changes(self) -> None:
+        """Test that an identical manifest yields an empty patch."""
+        current = render_agent_manifest("tutor", "Same", ["math"])
+
+        assert plan_patch(
+            current, render_agent_manifest("tutor", "Same", ["math"])
+        ) == (
+            {},
+            [],
+        )
+
+    def test_dropped_skills_are_removed(self) -> None:
+        """Test that skill labels missing from the new list are deleted."""
+        current = render_agent_manifest("tutor", "Tutor", ["math", "physics"])
+        current["metadata"]["labels"]["team"] = "platform"
+
+        patch_body, changes = plan_patch(
+            current, render_agent_manifest("tutor", "Tutor", ["math"])
+        )
+
+        assert patch_body == {"metadata": {"labels": {"skill-physics": None}}}
+        assert changes[0]["field"] == "metadata.labels.skill-physics"
+
+
+class FakeDynamic:
+    """Dynamic client holding one Agent in memory."""
+
+    def __init__(self, agent: dict) -> None:
+        self.agent = agent
+        self.gets = 0
+        self.patches: list[dict] = []
+        self.resources = SimpleNamespace(get=self._resource)
+
+    async def _resource(self, **kwargs: object) -> str:
+        return "Agent"
+
+    async def get(self, **kwargs: object) -> SimpleNamespace:
+        self.gets += 1
+        return SimpleNamespace(to_dict=lambda: copy.deepcopy(self.agent))
+
+    async def patch(self, body: dict, **kwargs: object) -> SimpleNamespace:
+        self.patches.append(body)
+        self.agent = merge_patch(self.agent, body)
+        version = str(int(self.agent["metadata"]["resourceVersion"]) + 1)
+        self.agent["metadata"]["resourceVersion"] = version
+        return SimpleNamespace(metadata=SimpleNamespace(resourceVersion=version))
+
+
+def merge_patch(target: dict, patch_body: dict) -> dict:
+    result = copy.deepcopy(target)
+    for key, value in patch_body.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge_patch(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+@pytest.fixture
+def update_tool():
+    """Load update_agent_config against a FakeDynamic holding a tutor agent."""
+    server = DynamicMCPServer(name="Test Server", tools_dir="src/tools")
+    server.load_tools()
+    module = sys.modules["tools.update_agent_config"]
+    agent = render_agent_manifest("tutor", "Old", ["math"])
+    agent["metadata"].update(namespace="kagent", resourceVersion="1")
+    dynamic = FakeDynamic(agent)
+    kube = SimpleNamespace(dynamic=AsyncMock(return_value=dynamic))
+    catalog = AgentCatalog()
+    catalog.replace([copy.deepcopy(agent)], "1")
+
+    with (
+        patch.object(module, "get_kube_client", return_value=kube),
+        patch.object(module, "get_update_queue", return_value=UpdateQueue()),
+        patch.object(
+            module,
+            "get_tool_config",
+            return_value={"coalesce_window": 0.05, "skills_merge": "replace"},
+        ),
+        patch.object(updates, "get_agent_catalog", return_value=catalog),
+        patch.dict(updates._seen_versions, clear=True),
+    ):
+        yield server.get_tools_sync()["update_agent_config"].fn, dynamic
+
+
+class TestUpdateAgentConfigTool:
+    """Test update_agent_config through the update queue."""
+
+    @pytest.mark.asyncio
+    async def test_reports_merged_updates(self, update_tool) -> None:
+        """Test that concurrent calls for one agent share a single patch."""
+        tool, dynamic = update_tool
+
+        results = await asyncio.gather(
+            tool("tutor", "Older", ["math"]), tool("tutor", "New", ["physics"])
+        )
+
+        assert len(dynamic.patches) == 1
+        assert dynamic.patches[0]["spec"] == {"description": "New"}
+        assert dynamic.agent["metadata"]["labels"] == {"skill-physics": "physics"}
+        assert all("Merged with 1 concurrent update(s)." in r for r in results)
+        assert '"field": "spec.description"' in results[0]
+
+    @pytest.mark.asyncio
+    async def test_skips_unchanged_agent(self, update_tool) -> None:
+        """Test that an update matching the catalog copy is not written."""
+        tool, dynamic = update_tool
+
+        result = await tool("tutor", "Old", ["math"])
+
+        assert dynamic.patches == []
+        assert dynamic.gets == 0
+        assert "already up to date" in result
+
+    @pytest.mark.asyncio
+    async def test_rereads_after_own_write(self, update_tool) -> None:
+        """Test that a lagging catalog is not used to diff the next update."""
+        tool, dynamic = update_tool
+
+        await tool("tutor", "New", ["math"])
+        result = await tool("tutor", "Old", ["math"])
+
+        assert dynamic.gets == 1
+        assert len(dynamic.patches) == 2
+        assert "updated successfully" in result
+
+    @pytest.mark.asyncio
+    async def test_missing_template(self, update_tool) -> None:
+        """Test that a missing agent template is reported like deploy_new_agent does."""
+        tool, dynamic = update_tool
+        module = sys.modules["tools.update_agent_config"]
+
+        with patch.object(
+            module, "render_agent_manifest", side_effect=FileNotFoundError
+        ):
+            result = await tool("tutor", "New", ["math"])
+
+        assert result == "Error: agent-template.yaml not found."
+        assert dynamic.patches == []
+
+    @pytest.mark.asyncio
+    async def test_update_counts_as_use(self, update_tool) -> None:
+        """Test that updating an agent records a use for the idle reconciler."""
+        tool, _ = update_tool
+        reconciler = SimpleNamespace(touch=Mock())
+
+        with patch.object(
+            sys.modules["tools.update_agent_config"],
+            "get_idle_reconciler",
+            return_value=reconciler,
+        ):
+            await tool("tutor", "New", ["math"])
+
+        reconciler.touch.assert_called_once_with(ANY, "tutor")